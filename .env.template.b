@@ -11,6 +11,22 @@ EXTERNAL_SERVICE_HOST=127.0.0.1
 EXTERNAL_SERVICE_PORT=80
 SENTRY_DSN=""
 APP_RELEASE=0.0.1
+SKIP_RESPONSE_VALIDATION=True
+# server: development (reload) or production (workers, uvloop)
+SERVER_MODE=development
+SERVER_WORKERS=1
+SERVER_GRACEFUL_TIMEOUT=30
+# webhooks
+WEBHOOK_URLS=[]
+WEBHOOK_SECRET=""
+# tracing: off, jsonl or otlp
+TRACING_EXPORTER=off
+TRACING_FILE_PATH=/tmp/service_b_spans.jsonl
+TRACING_OTLP_ENDPOINT=http://127.0.0.1:4318
+TRACING_SAMPLE_RATIO=1.0
+# sampling profiler, off unless enabled with a token
+PROFILER_ENABLED=False
+PROFILER_TOKEN=""
 # email
 MAIL_USERNAME="username"
 MAIL_PASSWORD=12345
@@ -26,3 +42,14 @@ POSTGRES_PORT=5432
 POSTGRES_USER=admin
 POSTGRES_PASSWORD=password
 POSTGRES_DB=db
+# slow query log: threshold in seconds, share of other statements logged
+SLOW_QUERY_THRESHOLD=0.2
+QUERY_LOG_SAMPLE_RATIO=0.0
+# connections of all workers together, split into per-worker pools
+DB_CONNECTION_BUDGET=120
+DB_POOL_OVERFLOW_SHARE=0.2
+DB_POOL_RECYCLE=1800
+DB_POOL_PRE_PING=False
+DB_STATEMENT_CACHE_SIZE=100
+# True if POSTGRES_HOST is PgBouncer in transaction pooling mode
+DB_PGBOUNCER=False
@@ -1,20 +1,52 @@
 import logging
+from typing import Any
 
 from sqladmin.authentication import login_required
 from starlette.requests import Request
+from starlette.routing import Route
 from starlette.exceptions import HTTPException
 from starlette.responses import Response, RedirectResponse
 from sqladmin.models import BaseView, ModelView
 from sqladmin import Admin
+from sqladmin.templating import Jinja2Templates
+
+from configs.config import app_settings
+from utilities.timing import get_server_timing, timed
 
 logger = logging.getLogger(__name__)
 
 
+class TimedJinja2Templates(Jinja2Templates):
+    """Templates adding rendering time to the render Server-Timing span"""
+
+    async def TemplateResponse(  # noqa: N802
+        self, *args: Any, **kwargs: Any
+    ) -> Response:
+        with timed("render"):
+            return await super().TemplateResponse(*args, **kwargs)
+
+
 class CustomAdmin(Admin):
     """Overriden sqladmin.Admin class to handle APIBaseViews with the
     same routes as basic ModelViews.
     """
 
+    def init_templating_engine(self) -> Jinja2Templates:
+        templates = super().init_templating_engine()
+        timed_templates = TimedJinja2Templates("templates")
+        timed_templates.env = templates.env
+        # Spans so far for the debug footer (server_timing.html)
+        timed_templates.env.globals["server_timing"] = (
+            get_server_timing if app_settings.DEBUG else lambda: None
+        )
+        return timed_templates
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.admin.router.routes.append(
+            Route("/{identity}/data", endpoint=self.data, name="data")
+        )
+
     @login_required
     async def list(self, request: Request) -> Response:
         """List route to display paginated Model instances."""
@@ -39,6 +71,21 @@ class CustomAdmin(Admin):
                 return await view.list(request)
         raise HTTPException(status_code=404)
 
+    @login_required
+    async def data(self, request: Request) -> Response:
+        """JSON list rows route of APIBaseViews."""
+
+        await self._list(request)
+        identity = request.path_params["identity"]
+        for view in self._views:
+            if (
+                view.identity == identity
+                and isinstance(view, BaseView)
+                and hasattr(view, "data")
+            ):
+                return await view.data(request)
+        raise HTTPException(status_code=404)
+
     @login_required
     async def details(self, request: Request) -> Response:
         """Details route."""
@@ -2,19 +2,35 @@ from abc import abstractmethod, ABC
 from copy import deepcopy
 import io
 from typing import Optional, Union, NamedTuple, Type, Any, List, Tuple
+from typing import Sequence
 import logging
+import re
+import time
+from functools import lru_cache
 
 import httpx
+import msgpack
 from urllib.parse import urlencode
 from sqladmin import BaseView, expose
 from starlette import status
 from starlette.requests import Request
-from starlette.responses import HTMLResponse, RedirectResponse, Response
+from starlette.responses import (
+    HTMLResponse,
+    JSONResponse,
+    RedirectResponse,
+    Response,
+)
 from starlette.datastructures import URL, FormData, UploadFile
 from sqladmin.pagination import Pagination
 from wtforms import Form
 
-from constants.admin import RequestMethod, AdminFormType
+from constants.admin import (
+    DATA_MAX_WINDOW_SIZE,
+    RequestMethod,
+    AdminFormType,
+)
+from constants.prefetch import PREFETCH_MAX_AGE
+from constants.tracing import TRACEPARENT_HEADER
 from utilities.admin.form import create_form
 from utilities.admin.openapi import (
     get_schema_for_form_from_api,
@@ -24,7 +40,49 @@ from utilities.admin.path import (
     insert_params_to_path,
     get_url_for_related_object,
 )
+from utilities.admin.cache import CachedResponse, list_tag, object_tag
+from utilities.admin.cache_backends import get_response_cache
+from utilities.admin.mirror import (
+    MirrorSync,
+    get_mirror_sync,
+    get_mirrored_object,
+    get_mirrored_page,
+)
+from utilities.admin.log_limiter import RateLimitedLog
 from utilities.admin.misc import get_related_object_title
+from utilities.admin.prefetch import page_prefetcher
+from utilities.metrics import registry
+from utilities.timing import add_span, parse_server_timing, timed
+from utilities.tracing import tracer
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+upstream_log = RateLimitedLog(logging.getLogger(__name__))
+""" Failed requests to third-party APIs, counted by method and status"""
+
+upstream_duration = registry.histogram(
+    "upstream_request_duration_seconds",
+    "Requests of admin views to third-party APIs",
+    ("method", "path", "status"),
+)
+
+
+def is_not_found(ex: httpx.HTTPError) -> bool:
+    return (
+        isinstance(ex, httpx.HTTPStatusError)
+        and ex.response.status_code == status.HTTP_404_NOT_FOUND
+    )
+
+
+def log_api_error(method: str, url: str, ex: httpx.HTTPError) -> None:
+    """Rate-limited warning about a failed request to third-party API"""
+    if isinstance(ex, httpx.HTTPStatusError):
+        reason = ex.response.status_code
+    else:
+        reason = type(ex).__name__
+    upstream_log.warning(
+        f"{method} {reason}", "%s %s: %s", method, url, reason
+    )
 
 
 class ApiUrls(NamedTuple):
@@ -36,6 +94,33 @@ class ApiUrls(NamedTuple):
     delete_path: str
     openapi_path: str
     admin_login_path: str
+    bulk_delete_path: Optional[str] = None
+    changes_path: Optional[str] = None
+
+
+@lru_cache
+def get_url_patterns(urls: ApiUrls) -> list[tuple[re.Pattern, str]]:
+    """Regular expressions matching full urls of urls paths"""
+    patterns = []
+    for name, path in urls._asdict().items():
+        if not name.endswith("_path") or name == "admin_login_path":
+            continue
+        if not path:
+            continue
+        regex = re.escape(urls.base_url + path)
+        # Escaped {param} placeholders
+        regex = re.sub(r"\\\{\w+\\\}", "[^/]+", regex)
+        patterns.append((re.compile(regex), path))
+    return patterns
+
+
+def get_url_template(urls: ApiUrls, url: str) -> str:
+    """Path template of urls the url was made of, "other" if none"""
+    url = url.split("?")[0]
+    for pattern, path in get_url_patterns(urls):
+        if pattern.fullmatch(url):
+            return path
+    return "other"
 
 
 class APIBaseView(BaseView, ABC):
@@ -80,6 +165,12 @@ class APIBaseView(BaseView, ABC):
     column_detail_labels = {}
     column_sortable_list = []
 
+    column_list_from_response = False
+    column_detail_list_from_response = False
+    """ Set when column_list (column_detail_list) was filled from keys of a
+    response, which may include embedded relations the API doesn't accept
+    in `fields`, so it is not sent as sparse fields"""
+
     urls = ApiUrls(
         base_url="http://localhost/",
         list_path="api/list/",
@@ -128,6 +219,56 @@ class APIBaseView(BaseView, ABC):
     use_token = True
     """ If API isn't required authentification, set up use_token = False"""
 
+    use_sparse_fields = True
+    """ Send column_list (column_detail_list) as `fields` query parameter,
+    so third-party API returns only columns to display"""
+
+    use_msgpack = True
+    """ Ask third-party API for MessagePack instead of JSON in read
+    requests. JSON responses are still accepted"""
+
+    expand_related = []
+    """ Relations the API can embed into detail response (`expand` query
+    parameter), for example ["author"]. Embedded objects are used instead
+    of separate requests for related objects"""
+
+    bulk_batch_size = 100
+    """ Max number of ids sent in one request to urls.bulk_delete_path"""
+
+    use_conditional_requests = True
+    """ Keep ETags of GET responses and revalidate them with
+    If-None-Match, so unchanged data isn't downloaded again"""
+
+    response_cache = get_response_cache()
+    """ Responses with validators, shared by all views (and by workers
+    if a shared backend is set in CacheSettings). Entries are
+    dropped on writes made through the admin and on change events from
+    the third-party API (see api/v1/endpoints/webhooks.py)"""
+
+    cache_max_age = 0
+    """ Seconds a cached response is used without revalidation. Keep 0
+    unless the third-party API sends change webhooks"""
+
+    negative_cache_ttl = 30
+    """ Seconds a 404 response is remembered, so requests for deleted
+    objects (for example related ones) don't go to the API every time.
+    Dropped on writes through the admin"""
+
+    prefetch_next_page = False
+    """ After a list page is served, fetch the next one into
+    response_cache in background (see utilities.admin.prefetch). Needs
+    use_conditional_requests"""
+
+    data_window_size = 200
+    """ Rows per request of the virtual scrolling list template
+    (list_template = "custom_virtual_list.html"), which loads rows from
+    the data route while the user scrolls"""
+
+    mirror_mode = False
+    """ Keep a copy of all objects in the local database, synced from
+    urls.changes_path in background (see utilities.admin.mirror), and
+    serve list and detail pages from it. Writes still go to the API"""
+
     @abstractmethod
     @expose("/identity/list/", methods=["GET"], identity="identity")
     async def list(self, request: Request) -> HTMLResponse:
@@ -177,14 +318,22 @@ class APIBaseView(BaseView, ABC):
                 str(request.url_for("admin:list", identity=self.identity))
             )
         data = await self.get_object_for_details(
-            request=request, params={f"{self.identity}_id": obj_id}
+            request=request,
+            params={f"{self.identity}_id": obj_id},
+            fields=(
+                None
+                if self.column_detail_list_from_response
+                else self.column_detail_list
+            ),
+            expand=self.expand_related,
         )
-        data = await self.add_related_objects(request, data)
         context = {}
         if data is None:
             context["service_unavailable"] = True
         else:
             context["service_unavailable"] = False
+            with timed("related"):
+                data = await self.add_related_objects(request, data)
             data = await self.filter_data_by_column_list(data)
         context.update(
             {
@@ -235,6 +384,7 @@ class APIBaseView(BaseView, ABC):
                     status_code=status.HTTP_400_BAD_REQUEST,
                 )
             token = await self.get_token(request)
+            page_prefetcher.cancel(self.get_prefetch_user(request, token))
             result = await self.send_request_to_api(
                 url=(self.urls.base_url + self.urls.create_path),
                 method=RequestMethod.post,
@@ -243,6 +393,7 @@ class APIBaseView(BaseView, ABC):
             )
             if result and result.status_code == status.HTTP_201_CREATED:
                 pk = result.json().get("id")
+                await self.after_write([pk])
                 if pk:
                     url = self.url_for_details(
                         request=request, pk=pk, identity=identity
@@ -300,6 +451,7 @@ class APIBaseView(BaseView, ABC):
                     status_code=status.HTTP_400_BAD_REQUEST,
                 )
             token = await self.get_token(request)
+            page_prefetcher.cancel(self.get_prefetch_user(request, token))
             url = await insert_params_to_path(
                 (self.urls.base_url + self.urls.update_path),
                 {f"{identity}_id": pk},
@@ -312,6 +464,7 @@ class APIBaseView(BaseView, ABC):
             )
             if result and result.status_code == status.HTTP_200_OK:
                 pk = result.json().get("id")
+                await self.after_write([pk])
                 if pk:
                     url = self.url_for_details(
                         request=request, pk=pk, identity=identity
@@ -336,6 +489,14 @@ class APIBaseView(BaseView, ABC):
 
     async def delete(self, request: Request, pks: List[int]) -> Response:
         token = await self.get_token(request)
+        page_prefetcher.cancel(self.get_prefetch_user(request, token))
+        if self.urls.bulk_delete_path:
+            await self.delete_in_batches(pks=pks, token=token)
+            await self.after_write(pks)
+            request.path_params["identity"] = self.identity
+            return Response(
+                str(request.url_for("admin:list", identity=self.identity))
+            )
         for pk in pks:
             url = await insert_params_to_path(
                 (self.urls.base_url + self.urls.delete_path),
@@ -348,11 +509,54 @@ class APIBaseView(BaseView, ABC):
             )
             if not (r and r.status_code == status.HTTP_204_NO_CONTENT):
                 logging.exception(r.json())
+        await self.after_write(pks)
         request.path_params["identity"] = self.identity
         return Response(
             str(request.url_for("admin:list", identity=self.identity))
         )
 
+    async def after_write(self, pks: List[Any]) -> None:
+        """Drop cached responses with written objects and wake the mirror
+        sync, which pulls the changes in background.
+        """
+        await self.response_cache.invalidate(self.identity, pks)
+        if mirror := self.get_mirror():
+            mirror.wake()
+
+    def get_mirror(self) -> Optional[MirrorSync]:
+        """Mirror to read from, if mirror_mode is on and it is loaded"""
+        if not self.mirror_mode:
+            return None
+        mirror = get_mirror_sync(self.identity)
+        return mirror if mirror and mirror.ready else None
+
+    async def delete_in_batches(
+        self, pks: List[int], token: Optional[str] = None
+    ) -> None:
+        """Delete objects with one request to urls.bulk_delete_path per
+        bulk_batch_size ids instead of one request per object.
+
+        Args:
+            - pks (List[int]): ids of objects to delete
+            - token (Optional[str], optional): Token Bearer if third-party
+            API is private. Defaults to None.
+        """
+        url = self.urls.base_url + self.urls.bulk_delete_path
+        for start in range(0, len(pks), self.bulk_batch_size):
+            batch = pks[start : start + self.bulk_batch_size]
+            r = await self.send_request_to_api(
+                url=url,
+                method=RequestMethod.delete,
+                token=token,
+                params={"ids": batch},
+            )
+            if not (r and r.status_code == status.HTTP_200_OK):
+                logging.error("Bulk delete of %s failed: %s", batch, r)
+                continue
+            for result in r.json().get("results", []):
+                if result.get("status") != "deleted":
+                    logging.warning("Bulk delete: %s", result)
+
     async def get_token(self, request: Request) -> Union[str, None]:
         """Method to get token from session in case third-party API is private.
         Override this method for your circumstances
@@ -381,6 +585,8 @@ class APIBaseView(BaseView, ABC):
         method: RequestMethod,
         token: Optional[str] = None,
         params: Optional[dict] = None,
+        cache_tags: Sequence[str] = (),
+        max_age: float = 0,
     ) -> Union[dict, list, None]:
         """Simple method to make request using httpx library
         to third-party API by urls (self.urls) and get json response
@@ -392,25 +598,134 @@ class APIBaseView(BaseView, ABC):
             API is private. Defaults to None.
             params (dict, optional): Parameters for request such as order_by,
             skip and limit etc. Defaults to None.
+            cache_tags (Sequence[str], optional): tags of the cached
+            response, see utilities.admin.cache. Defaults to ().
+            max_age (float, optional): seconds a cached response is used
+            without revalidation if more than cache_max_age.
+            Defaults to 0.
 
         Returns:
             Union[dict, list, None]: List of objects or objects itself
         """
-        if not params:
-            params = {}
-        headers = {}
+        params = params or {}
+        headers = self.get_accept_headers()
+        cache_key = None
+        cached = None
+        if method == RequestMethod.get:
+            cache_key = self.response_cache.make_key(url, params, token)
+            cached = await self.get_cached_response(cache_key)
+        if cached:
+            if cached.data is None:
+                return None
+            age = time.time() - cached.stored_at
+            if age < max(self.cache_max_age, max_age):
+                return deepcopy(cached.data)
+            headers["If-None-Match"] = cached.etag
         async with httpx.AsyncClient() as client:
             if token:
                 headers.update({"Authorization": f"Bearer {token}"})
             try:
-                r = await client.request(
-                    method=method, url=url, headers=headers, params=params
+                r = await self.request_api(
+                    client, method, url, headers=headers, params=params
                 )
+                if cached and r.status_code == status.HTTP_304_NOT_MODIFIED:
+                    self.response_cache.refresh(cache_key, cached)
+                    return deepcopy(cached.data)
                 r.raise_for_status()
             except httpx.HTTPError as ex:
-                logging.exception(ex)  # noqa: TRY401
+                if cache_key and is_not_found(ex):
+                    self.response_cache.set_missing(cache_key, cache_tags)
+                log_api_error(method, url, ex)
                 return None
-            return r.json()
+            data = await self.decode_response(r)
+            if (
+                cache_key
+                and self.use_conditional_requests
+                and (etag := r.headers.get("etag"))
+            ):
+                await self.response_cache.set(
+                    cache_key, etag, deepcopy(data), cache_tags
+                )
+            return data
+
+    async def request_api(
+        self,
+        client: httpx.AsyncClient,
+        method: RequestMethod,
+        url: str,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """client.request() observed in the upstream_request_duration_seconds
+        histogram by urls path template and status, in the upstream
+        Server-Timing span and in a client span of the current trace,
+        which is continued by the API through the traceparent header.
+        """
+        start = time.perf_counter()
+        status_code = "error"
+        path = get_url_template(self.urls, url)
+        span = tracer.start_span(
+            f"{method} {path}",
+            kind="client",
+            attributes={"http.method": method, "http.url": url},
+            child_only=True,
+        )
+        if span is not None:
+            kwargs["headers"] = {
+                **(kwargs.get("headers") or {}),
+                TRACEPARENT_HEADER: span.traceparent,
+            }
+        try:
+            r = await client.request(method=method, url=url, **kwargs)
+            status_code = str(r.status_code)
+            # Database time of the third-party API, if it reports one
+            durations = parse_server_timing(r.headers.get("server-timing", ""))
+            if "db" in durations:
+                add_span("upstream-db", durations["db"] / 1000)
+            return r
+        finally:
+            duration = time.perf_counter() - start
+            add_span("upstream", duration)
+            upstream_duration.observe(duration, method, path, status_code)
+            if span is not None:
+                span.attributes["http.status_code"] = status_code
+                tracer.end_span(span)
+
+    def get_accept_headers(self) -> dict:
+        if self.use_msgpack:
+            return {
+                "Accept": f"{MSGPACK_MEDIA_TYPES[0]}, application/json;q=0.9"
+            }
+        return {}
+
+    async def get_cached_response(
+        self, cache_key: str
+    ) -> Optional[CachedResponse]:
+        """Cached response usable for a GET request: a 404 younger than
+        negative_cache_ttl, or data to return or revalidate if
+        use_conditional_requests is set. Without it only the memory tier
+        is read, 404s are never stored in the shared backend.
+        """
+        if self.use_conditional_requests:
+            cached = await self.response_cache.get(cache_key)
+        else:
+            cached = self.response_cache.memory.get(cache_key)
+        if cached is None:
+            return None
+        if cached.data is None:
+            age = time.time() - cached.stored_at
+            return cached if age < self.negative_cache_ttl else None
+        return cached if self.use_conditional_requests else None
+
+    async def decode_response(
+        self, response: httpx.Response
+    ) -> Union[dict, list, None]:
+        """Decode MessagePack or JSON body depending on response
+        Content-Type. Compressed bodies are decoded by httpx.
+        """
+        content_type = response.headers.get("content-type", "")
+        if content_type.split(";")[0].strip() in MSGPACK_MEDIA_TYPES:
+            return msgpack.unpackb(response.content)
+        return response.json()
 
     async def send_request_to_api(
         self,
@@ -444,19 +759,20 @@ class APIBaseView(BaseView, ABC):
             if token:
                 headers.update({"Authorization": f"Bearer {token}"})
             try:
-                r = await client.request(
-                    method=method,
-                    url=url,
+                r = await self.request_api(
+                    client,
+                    method,
+                    url,
                     headers=headers,
                     params=params,
                     json=json,
                 )
                 r.raise_for_status()
             except httpx.RequestError as ex:
-                logging.exception(ex)  # noqa: TRY401
+                log_api_error(method, url, ex)
                 return None
             except httpx.HTTPStatusError as ex:
-                logging.exception(ex)  # noqa: TRY401
+                log_api_error(method, url, ex)
             return r
 
     async def filter_data_by_column_list(
@@ -480,6 +796,7 @@ class APIBaseView(BaseView, ABC):
                         elem.pop(key, None)
             else:
                 self.column_list = data[0].keys()
+                self.column_list_from_response = True
         elif data and isinstance(data, dict):
             if self.column_detail_list:
                 keys_to_remove = set(self.column_detail_list) - set(
@@ -489,6 +806,7 @@ class APIBaseView(BaseView, ABC):
                     data.pop(key, None)
             else:
                 self.column_detail_list = data.keys()
+                self.column_detail_list_from_response = True
         return data
 
     async def get_paginated_data(self, request: Request) -> Pagination:
@@ -506,6 +824,80 @@ class APIBaseView(BaseView, ABC):
         page_size = min(
             page_size or self.page_size, max(self.page_size_options)
         )
+        params = self.get_list_params(request)
+        token = await self.get_token(request)
+        params.update({"skip": (page - 1) * page_size, "limit": page_size})
+        data = await self.get_list_data(
+            token, params, self.get_prefetch_user(request, token)
+        )
+        return await self.make_pagination(
+            page=page, page_size=page_size, data=data
+        )
+
+    async def data(self, request: Request) -> Response:
+        """JSON window of list rows for the virtual scrolling list
+        template (custom_virtual_list.html). Rows are arrays with values
+        in columns order.
+
+        Query parameters: start (offset of the first row), limit
+        (defaults to data_window_size, clamped to 1..DATA_MAX_WINDOW_SIZE),
+        sortBy and sort like in list. Non-integer start or limit get 400.
+
+        Args:
+            request (Request): Starlette Request
+
+        Returns:
+            Response: {"columns": [...], "rows": [[...], ...],
+            "total_count": int, "start": int, "limit": int,
+            "next_start": int or null}
+        """
+        try:
+            start = max(int(request.query_params.get("start", 0)), 0)
+            limit = int(request.query_params.get("limit", 0))
+        except ValueError:
+            return JSONResponse(
+                {"detail": "start and limit must be integers"},
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = max(
+            min(limit or self.data_window_size, DATA_MAX_WINDOW_SIZE), 1
+        )
+        params = self.get_list_params(request)
+        token = await self.get_token(request)
+        if isinstance(token, Response):
+            return token
+        params.update({"skip": start, "limit": limit})
+        data = await self.get_list_data(
+            token, params, self.get_prefetch_user(request, token)
+        )
+        if data is None:
+            return JSONResponse(
+                {"detail": "Service is unavailable"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        pagination = await self.make_pagination(
+            page=start // limit + 1, page_size=limit, data=data
+        )
+        rows = await self.filter_data_by_column_list(pagination.rows)
+        columns = list(self.column_list)
+        if "id" not in columns:
+            columns.insert(0, "id")
+        end = start + len(rows)
+        return JSONResponse(
+            {
+                "columns": columns,
+                "rows": [[row.get(name) for name in columns] for row in rows],
+                "total_count": pagination.count,
+                "start": start,
+                "limit": limit,
+                "next_start": end if end < pagination.count else None,
+            }
+        )
+
+    def get_list_params(self, request: Request) -> dict:
+        """order_by and fields parameters of a list request from sortBy
+        and sort query parameters of request.
+        """
         sort_by_filter = request.query_params.get("sortBy", None)
         sort_filter = request.query_params.get("sort", None)
         params = {}
@@ -521,16 +913,101 @@ class APIBaseView(BaseView, ABC):
                 logging.exception(ex.args)
         else:
             params["order_by"] = "id"
-        token = await self.get_token(request)
-        params.update({"skip": (page - 1) * page_size, "limit": page_size})
-        data = await self.get_data_from_api(
-            url=(self.urls.base_url + self.urls.list_path),
-            method=RequestMethod.get,
-            token=token,
-            params=params,
-        )
-        return await self.make_pagination(
-            page=page, page_size=page_size, data=data
+        if (
+            self.use_sparse_fields
+            and self.column_list
+            and not self.column_list_from_response
+        ):
+            params["fields"] = ",".join(self.column_list)
+        return params
+
+    async def get_list_data(
+        self, token: Optional[str], params: dict, user: str = ""
+    ) -> Union[dict, list, None]:
+        """Page of objects from the mirror or the third-party API.
+
+        Args:
+            - token (Optional[str]): Token Bearer
+            - params (dict): order_by, skip, limit and optional fields
+            - user (str): owner of prefetches, see get_prefetch_user
+
+        Returns:
+            - Union[dict, list, None]: response data, None if the API
+            is unavailable
+        """
+        if self.get_mirror():
+            data = await get_mirrored_page(
+                identity=self.identity,
+                order_by=params.get("order_by"),
+                skip=params["skip"],
+                limit=params["limit"],
+            )
+        else:
+            url = self.urls.base_url + self.urls.list_path
+            prefetched = await page_prefetcher.claim(
+                user,
+                self.get_prefetch_scope(params),
+                self.response_cache.make_key(url, params, token),
+            )
+            data = await self.get_data_from_api(
+                url=url,
+                method=RequestMethod.get,
+                token=token,
+                params=params,
+                cache_tags=[list_tag(self.identity)],
+                max_age=PREFETCH_MAX_AGE if prefetched else 0,
+            )
+            if self.prefetch_next_page and self.use_conditional_requests:
+                self.prefetch_next(url, token, user, params, data)
+        return data
+
+    def get_prefetch_user(
+        self, request: Request, token: Union[str, Response, None]
+    ) -> str:
+        """Admin user whose pages request prefetches: the API token or,
+        without one, the client address and browser. Override this
+        method if users are identified otherwise.
+        """
+        if isinstance(token, str) and token:
+            return token
+        host = request.client.host if request.client else ""
+        return f"{host} {request.headers.get('user-agent', '')}"
+
+    def get_prefetch_scope(self, params: dict) -> str:
+        """Prefetch scope of list params: the view with sort, page size
+        and fields
+        """
+        scope = {key: value for key, value in params.items() if key != "skip"}
+        return f"{self.identity}?{urlencode(sorted(scope.items()))}"
+
+    def prefetch_next(
+        self,
+        url: str,
+        token: Optional[str],
+        user: str,
+        params: dict,
+        data: Union[dict, list, None],
+    ) -> None:
+        """Start fetching the page after the one in data with the same
+        sort and page size, if there is one.
+        """
+        next_params = {**params, "skip": params["skip"] + params["limit"]}
+        if not (
+            isinstance(data, dict)
+            and next_params["skip"] < data.get("total_count", 0)
+        ):
+            return
+        page_prefetcher.schedule(
+            user,
+            self.get_prefetch_scope(params),
+            self.response_cache.make_key(url, next_params, token),
+            lambda: self.get_data_from_api(
+                url=url,
+                method=RequestMethod.get,
+                token=token,
+                params=next_params,
+                cache_tags=[list_tag(self.identity)],
+            ),
         )
 
     async def make_pagination(
@@ -560,7 +1037,12 @@ class APIBaseView(BaseView, ABC):
         )
 
     async def get_object_for_details(
-        self, request: Request, params: dict, url: Optional[str] = None
+        self,
+        request: Request,
+        params: dict,
+        url: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        expand: Optional[List[str]] = None,
     ) -> dict:
         """Method to get object info from third-party API
 
@@ -569,19 +1051,43 @@ class APIBaseView(BaseView, ABC):
             params (dict): paramaters to insert into url.
             For example
             {"object_id": 1} for `http://localhost/book/{object_id}/`
+            fields (List[str], optional): fields to request if
+            use_sparse_fields is set. Defaults to None (all fields).
+            expand (List[str], optional): relations to embed.
+            Defaults to None.
 
         Returns:
             dict: object from third-party response
         """
+        if not url and self.get_mirror():
+            obj_id = params[f"{self.identity}_id"]
+            if data := await get_mirrored_object(
+                self.identity, obj_id, expand
+            ):
+                return data
         token = await self.get_token(request)
+        page_prefetcher.cancel(self.get_prefetch_user(request, token))
         if not url:
             url = await insert_params_to_path(
                 (self.urls.base_url + self.urls.detail_path), params
             )
+        query_params = {}
+        if self.use_sparse_fields and fields:
+            query_params["fields"] = ",".join(fields)
+        if expand:
+            query_params["expand"] = ",".join(expand)
+        # params are like {"book_id": 1}, embedded objects may be any
+        cache_tags = [
+            object_tag(key.removesuffix("_id"), value)
+            for key, value in params.items()
+        ]
+        cache_tags.extend(list_tag(relation) for relation in expand or [])
         return await self.get_data_from_api(
             url=url,
             method=RequestMethod.get,
             token=token,
+            params=query_params,
+            cache_tags=cache_tags,
         )
 
     async def add_related_objects(self, request: Request, data: dict) -> dict:
@@ -589,7 +1095,8 @@ class APIBaseView(BaseView, ABC):
         Method finds keys in data like "related_object_id", checks whether
         this key is located in urls of any APIBaseView child class.
         If it's there method makes request to third-party API to get
-        "related_object" data.
+        "related_object" data, unless the object is already embedded in
+        data under "related_object" key (see expand_related).
 
         Args:
             request (Request): FastAPI request
@@ -602,6 +1109,16 @@ class APIBaseView(BaseView, ABC):
             new_data = deepcopy(data)
             for key, value in data.items():
                 if key.endswith("_id"):
+                    relation = key.removesuffix("_id")
+                    if isinstance(data.get(relation), dict):
+                        new_data.pop(key)
+                        new_data[relation] = {
+                            "id": str(value),
+                            "value": await get_related_object_title(
+                                data[relation]
+                            ),
+                        }
+                        continue
                     found_path = await get_url_for_related_object(
                         APIBaseView, key
                     )
@@ -673,24 +1190,25 @@ class APIBaseView(BaseView, ABC):
         Returns:
             Type[Form]: class of wtforms.Form
         """
-        if form_type == AdminFormType.create:
-            if self.create_form is not None:
-                return self.create_form
-            form = await create_form(
-                form_name=f"{self.identity}{AdminFormType.create}",
-                form_schema=self.create_form_schema,
-                openapi_schema=self.openapi_schema,
-            )
-            self.create_form = form
-        elif form_type == AdminFormType.update:
-            if self.update_form is not None:
-                return self.update_form
-            form = await create_form(
-                form_name=f"{self.identity}{AdminFormType.update}",
-                form_schema=self.update_form_schema,
-                openapi_schema=self.openapi_schema,
-            )
-        return form
+        with timed("form"):
+            if form_type == AdminFormType.create:
+                if self.create_form is not None:
+                    return self.create_form
+                form = await create_form(
+                    form_name=f"{self.identity}{AdminFormType.create}",
+                    form_schema=self.create_form_schema,
+                    openapi_schema=self.openapi_schema,
+                )
+                self.create_form = form
+            elif form_type == AdminFormType.update:
+                if self.update_form is not None:
+                    return self.update_form
+                form = await create_form(
+                    form_name=f"{self.identity}{AdminFormType.update}",
+                    form_schema=self.update_form_schema,
+                    openapi_schema=self.openapi_schema,
+                )
+            return form
 
     async def handle_form_data(
         self, request: Request, obj: Any = None
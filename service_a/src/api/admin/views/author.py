@@ -15,6 +15,8 @@ urls = ApiUrls(
     delete_path=("/service-b/v1/author/{author_id}/"),
     openapi_path="/service-b/openapi.json/",
     admin_login_path="admin",
+    bulk_delete_path=("/service-b/v1/author/bulk/"),
+    changes_path="/service-b/v1/changes/",
 )
 
 
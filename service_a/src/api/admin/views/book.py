@@ -15,6 +15,8 @@ urls = ApiUrls(
     delete_path=("/service-b/v1/book/{book_id}/"),
     openapi_path="/service-b/openapi.json/",
     admin_login_path="admin",
+    bulk_delete_path=("/service-b/v1/book/bulk/"),
+    changes_path="/service-b/v1/changes/",
 )
 
 
@@ -32,6 +34,7 @@ class BookAdmin(APIBaseView):
     column_detail_list = []
     column_detail_labels = {}
     column_sortable_list = ["id", "title"]
+    expand_related = ["author"]
     use_token = False
 
     @expose("/book/list", methods=["GET"], identity="book")
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from starlette.responses import PlainTextResponse
+
+from configs.config import profiler_settings
+from utilities.profiler import (
+    SamplingProfiler,
+    get_profile_response,
+    is_profiler_token,
+)
+
+
+async def verify_profiler_token(
+    authorization: Optional[str] = Header(default=None),
+) -> None:
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not is_profiler_token(token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid profiler token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(
+    prefix="/debug",
+    include_in_schema=False,
+    dependencies=[Depends(verify_profiler_token)],
+)
+
+
+@router.get("/profile/")
+async def profile(
+    seconds: float = Query(
+        default=10, gt=0, le=profiler_settings.PROFILER_MAX_SECONDS
+    ),
+    all_threads: bool = False,
+) -> PlainTextResponse:
+    """Sample the event loop thread (or all threads) of this worker
+    process for seconds and return collapsed stacks.
+    """
+    profiler = SamplingProfiler(
+        thread_ids=None if all_threads else {threading.get_ident()}
+    )
+    if not profiler.start():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another profile is being taken",
+        )
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+    return get_profile_response(profiler)
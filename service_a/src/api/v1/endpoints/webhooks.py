@@ -0,0 +1,58 @@
+import hashlib
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+from api.admin.custom_baseview import APIBaseView
+from configs.config import app_settings
+from constants.webhooks import WEBHOOK_SIGNATURE_HEADER
+from schemas.webhooks import WebhookPayload, WebhookResponse
+from utilities.admin.mirror import get_mirror_sync
+
+router = APIRouter()
+
+
+def verify_signature(body: bytes, signature: str) -> bool:
+    expected = hmac.new(
+        app_settings.WEBHOOK_SECRET.encode(), body, hashlib.sha256
+    ).hexdigest()
+    return hmac.compare_digest(f"sha256={expected}", signature)
+
+
+@router.post("/service-b/", response_model=WebhookResponse)
+async def receive_service_b_events(request: Request):
+    """Drop cached API responses with objects changed in service B and
+    wake mirror syncs of changed entities. Entity names of events are
+    identities of APIBaseView views.
+
+    Only the memory tier of the worker that received the event and the
+    shared cache backend are invalidated. Events are refused unless
+    WEBHOOK_SECRET is set and they are signed with it.
+    """
+    if not app_settings.WEBHOOK_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Webhooks are disabled, WEBHOOK_SECRET is not set",
+        )
+    body = await request.body()
+    if not verify_signature(
+        body, request.headers.get(WEBHOOK_SIGNATURE_HEADER, "")
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid signature",
+        )
+    try:
+        payload = WebhookPayload.model_validate_json(body)
+    except ValidationError as ex:
+        raise RequestValidationError(ex.errors()) from ex
+    invalidated = 0
+    for event in payload.events:
+        invalidated += await APIBaseView.response_cache.invalidate(
+            event.entity, event.ids
+        )
+        if mirror := get_mirror_sync(event.entity):
+            mirror.wake()
+    return WebhookResponse(invalidated=invalidated)
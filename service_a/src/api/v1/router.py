@@ -1,3 +1,7 @@
 from fastapi import APIRouter
 
+from .endpoints.webhooks import router as webhooks_router
+
 router = APIRouter(prefix="/v1")
+
+router.include_router(webhooks_router, prefix="/webhooks", tags=["Webhooks"])
@@ -0,0 +1,245 @@
+"""Measure throughput and latency of admin pages of APIBaseView with
+service B replaced by FakeServiceB, in one process.
+
+Run from the repository root with service A settings in the environment:
+PYTHONPATH=service_a/src python -m benchmarks.admin --output run.json
+and compare two runs with --compare run.json.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import platform
+import statistics
+import time
+from datetime import UTC, datetime
+from typing import Awaitable, Callable, Iterator, Optional
+
+import httpx
+
+from benchmarks.fake_service_b import BOOK_GENRES, FakeServiceB
+
+ADMIN_URL = "/service-a/admin"
+
+Scenario = Callable[[httpx.AsyncClient, int, argparse.Namespace], Awaitable]
+
+
+async def list_page(
+    client: httpx.AsyncClient, i: int, args: argparse.Namespace
+) -> httpx.Response:
+    return await client.get(
+        f"{ADMIN_URL}/book/list", params={"page": i % args.pages + 1}
+    )
+
+
+async def details(
+    client: httpx.AsyncClient, i: int, args: argparse.Namespace
+) -> httpx.Response:
+    return await client.get(f"{ADMIN_URL}/book/details/{i % 1000 + 1}")
+
+
+async def create(
+    client: httpx.AsyncClient, i: int, args: argparse.Namespace
+) -> httpx.Response:
+    return await client.post(
+        f"{ADMIN_URL}/book/create",
+        data={
+            "title": f"Benchmark book {i}",
+            "genre": BOOK_GENRES[i % len(BOOK_GENRES)],
+            "author_id": str(i % 50 + 1),
+        },
+    )
+
+
+async def bulk_delete(
+    client: httpx.AsyncClient, i: int, args: argparse.Namespace
+) -> httpx.Response:
+    start = i * args.bulk_size + 1
+    pks = range(start, start + args.bulk_size)
+    return await client.delete(
+        f"{ADMIN_URL}/book/delete",
+        params={"pks": ",".join(map(str, pks))},
+    )
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "list": list_page,
+    "details": details,
+    "create": create,
+    "bulk_delete": bulk_delete,
+}
+
+
+@contextlib.contextmanager
+def fake_upstream(transport: httpx.AsyncBaseTransport) -> Iterator[type]:
+    """Make httpx.AsyncClient() of the admin send requests to transport.
+
+    Returns:
+        - type: the original httpx.AsyncClient
+    """
+    original = httpx.AsyncClient
+
+    class AsyncClient(original):
+        def __init__(self, *args, **kwargs) -> None:  # noqa: ANN002
+            kwargs.setdefault("transport", transport)
+            super().__init__(*args, **kwargs)
+
+    httpx.AsyncClient = AsyncClient
+    try:
+        yield original
+    finally:
+        httpx.AsyncClient = original
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    args: argparse.Namespace,
+    upstream: FakeServiceB,
+) -> dict:
+    """Send args.requests requests with args.concurrency workers after
+    args.warmup requests whose results are dropped.
+    """
+    counter = itertools.count()
+    latencies = []
+    errors = 0
+
+    async def worker(requests: int, record: bool) -> None:
+        nonlocal errors
+        while (i := next(counter)) < requests:
+            start = time.perf_counter()
+            r = await scenario(client, i, args)
+            if record:
+                latencies.append(time.perf_counter() - start)
+                errors += r.status_code >= 400  # noqa: PLR2004
+
+    await asyncio.gather(
+        *(worker(args.warmup, False) for _ in range(args.concurrency))
+    )
+    counter = itertools.count(args.warmup)
+    upstream.calls.clear()
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            worker(args.warmup + args.requests, True)
+            for _ in range(args.concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": percentiles[49] * 1000,
+        "p99_ms": percentiles[98] * 1000,
+        "upstream_calls_per_request": (
+            sum(upstream.calls.values()) / len(latencies)
+        ),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from main import app
+
+    upstream = FakeServiceB(
+        latency=args.latency,
+        row_bytes=args.row_bytes,
+        total_count=args.total_count,
+        etags=args.etags,
+    )
+    results = {}
+    with fake_upstream(upstream.transport) as AsyncClient:  # noqa: N806
+        async with AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://testserver",
+            timeout=None,
+        ) as client:
+            for name in args.scenarios:
+                results[name] = await run_scenario(
+                    client, SCENARIOS[name], args, upstream
+                )
+    return results
+
+
+def print_results(results: dict, baseline: Optional[dict] = None) -> None:
+    header = (
+        f"{'scenario':<14}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}"
+        f"{'errors':>8}{'upstream':>10}"
+    )
+    if baseline:
+        header += f"{'req/s vs base':>16}{'p99 vs base':>14}"
+    print(header)  # noqa: T201
+    for name, result in results.items():
+        line = (
+            f"{name:<14}{result['throughput']:>10.1f}"
+            f"{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+            f"{result['errors']:>8}"
+            f"{result['upstream_calls_per_request']:>10.2f}"
+        )
+        if baseline and (base := baseline.get(name)):
+            throughput = result["throughput"] / base["throughput"] - 1
+            p99 = result["p99_ms"] / base["p99_ms"] - 1
+            line += f"{throughput:>+16.1%}{p99:>+14.1%}"
+        print(line)  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: value.split(","),
+        default=list(SCENARIOS),
+        help="comma separated, of " + ", ".join(SCENARIOS),
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="of service B, seconds"
+    )
+    parser.add_argument("--row-bytes", type=int, default=100)
+    parser.add_argument("--total-count", type=int, default=10000)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--bulk-size", type=int, default=100)
+    parser.add_argument(
+        "--etags",
+        action="store_true",
+        help="service B sends ETags, so responses are revalidated",
+    )
+    parser.add_argument("--output", help="JSON file to save results to")
+    parser.add_argument("--compare", help="JSON file of an earlier run")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    # Upstream errors of the fake service are expected in some runs
+    logging.disable(logging.WARNING)
+    results = asyncio.run(run(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+    print_results(results, baseline)
+    if args.output:
+        report = {
+            "created_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "options": {
+                key: value
+                for key, value in vars(args).items()
+                if key not in ("output", "compare")
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
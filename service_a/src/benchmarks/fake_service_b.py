@@ -0,0 +1,210 @@
+import asyncio
+import hashlib
+import re
+from collections import Counter
+from typing import Optional
+
+import httpx
+import msgpack
+
+from api.admin.custom_baseview import MSGPACK_MEDIA_TYPES
+
+BOOK_GENRES = ["fiction", "mystery", "poetry", "history", "science"]
+
+ROUTES = [
+    ("openapi", "GET", re.compile(r"/service-b/openapi\.json/")),
+    ("list", "GET", re.compile(r"/service-b/v1/(book|author)/list/")),
+    (
+        "bulk_delete",
+        "DELETE",
+        re.compile(r"/service-b/v1/(book|author)/bulk/"),
+    ),
+    ("detail", "GET", re.compile(r"/service-b/v1/(book|author)/(\d+)/")),
+    ("create", "POST", re.compile(r"/service-b/v1/(book|author)/")),
+]
+
+
+def get_openapi_schema() -> dict:
+    """Request bodies of create endpoints, as much of service B's
+    openapi.json as the admin forms read.
+    """
+    genre_ref = {"$ref": "#/components/schemas/BookGenre"}
+    return {
+        "openapi": "3.1.0",
+        "paths": {
+            "/service-b/v1/book/": {
+                "post": {
+                    "requestBody": {
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "$ref": "#/components/schemas/BookCreateDB"
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            "/service-b/v1/author/": {
+                "post": {
+                    "requestBody": {
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "$ref": "#/components/schemas/"
+                                    "AuthorCreateDB"
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+        },
+        "components": {
+            "schemas": {
+                "BookGenre": {"enum": BOOK_GENRES, "type": "string"},
+                "BookCreateDB": {
+                    "properties": {
+                        "title": {"type": "string"},
+                        "genre": genre_ref,
+                        "extra_genre": {
+                            "anyOf": [genre_ref, {"type": "null"}]
+                        },
+                        "author_id": {"type": "integer"},
+                    },
+                    "type": "object",
+                },
+                "AuthorCreateDB": {
+                    "properties": {
+                        "first_name": {"type": "string"},
+                        "last_name": {"type": "string"},
+                    },
+                    "type": "object",
+                },
+            }
+        },
+    }
+
+
+class FakeServiceB:
+    """Stand-in for service B's book and author endpoints, served by
+    httpx.MockTransport in the benchmark process. Every response waits
+    latency seconds, objects carry a text field of row_bytes, so the
+    cost of the admin layer can be measured without the network and
+    the database.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        row_bytes: int = 100,
+        total_count: int = 10000,
+        etags: bool = False,
+    ) -> None:
+        """
+        Args:
+            - latency (float): seconds every response is delayed
+            - row_bytes (int): size of the description of objects
+            - total_count (int): objects in lists
+            - etags (bool): send ETags and answer If-None-Match with 304
+            like service B, so the admin response cache is used
+        """
+        self.latency = latency
+        self.row_bytes = row_bytes
+        self.total_count = total_count
+        self.etags = etags
+        self.calls: Counter[str] = Counter()
+        self.next_id = total_count + 1
+        self.openapi_schema = get_openapi_schema()
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def make_object(self, identity: str, obj_id: int) -> dict:
+        description = f"{identity} {obj_id} ".ljust(self.row_bytes, "x")
+        if identity == "author":
+            return {
+                "id": obj_id,
+                "first_name": f"First {obj_id}",
+                "last_name": f"Last {obj_id}",
+                "description": description,
+            }
+        return {
+            "id": obj_id,
+            "title": f"Book title {obj_id}",
+            "genre": BOOK_GENRES[obj_id % len(BOOK_GENRES)],
+            "extra_genre": None,
+            "author_id": obj_id % 50 + 1,
+            "description": description,
+        }
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls[f"{request.method} {request.url.path}"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        for name, method, pattern in ROUTES:
+            match = pattern.fullmatch(request.url.path)
+            if match and request.method == method:
+                return getattr(self, name)(request, *match.groups())
+        return httpx.Response(404, json={"detail": "Not Found"})
+
+    def respond(
+        self, request: httpx.Request, data: dict, status_code: int = 200
+    ) -> httpx.Response:
+        """JSON or MessagePack response, like service B's content
+        negotiation, with an ETag of the request if etags is set.
+        """
+        headers = {}
+        if self.etags and request.method == "GET":
+            digest = hashlib.sha256(str(request.url).encode()).hexdigest()
+            etag = f'"{digest[:16]}"'
+            if request.headers.get("if-none-match") == etag:
+                return httpx.Response(304, headers={"etag": etag})
+            headers["etag"] = etag
+        if MSGPACK_MEDIA_TYPES[0] in request.headers.get("accept", ""):
+            headers["content-type"] = MSGPACK_MEDIA_TYPES[0]
+            return httpx.Response(
+                status_code, headers=headers, content=msgpack.packb(data)
+            )
+        return httpx.Response(status_code, headers=headers, json=data)
+
+    def openapi(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=self.openapi_schema)
+
+    def list(self, request: httpx.Request, identity: str) -> httpx.Response:
+        skip = int(request.url.params.get("skip", 0))
+        limit = int(request.url.params.get("limit", 20))
+        ids = range(skip + 1, min(skip + limit, self.total_count) + 1)
+        return self.respond(
+            request,
+            {
+                "objects": [self.make_object(identity, i) for i in ids],
+                "total_count": self.total_count,
+            },
+        )
+
+    def detail(
+        self, request: httpx.Request, identity: str, obj_id: str
+    ) -> httpx.Response:
+        data = self.make_object(identity, int(obj_id))
+        expand: Optional[str] = request.url.params.get("expand")
+        if expand and "author" in expand.split(",") and "author_id" in data:
+            data["author"] = self.make_object("author", data["author_id"])
+        return self.respond(request, data)
+
+    def create(self, request: httpx.Request, identity: str) -> httpx.Response:
+        obj_id = self.next_id
+        self.next_id += 1
+        return self.respond(
+            request, self.make_object(identity, obj_id), status_code=201
+        )
+
+    def bulk_delete(
+        self, request: httpx.Request, identity: str
+    ) -> httpx.Response:
+        ids = request.url.params.get_list("ids")
+        return self.respond(
+            request,
+            {"results": [{"id": int(i), "status": "deleted"} for i in ids]},
+        )
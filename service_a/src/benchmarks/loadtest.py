@@ -0,0 +1,362 @@
+"""Load a running service A with a mix of admin page requests from
+concurrent virtual users and report throughput, latency and errors.
+Metrics of both services are scraped before and after the run to show
+how many upstream requests one admin request causes.
+
+Run from the repository root against running services:
+PYTHONPATH=service_a/src python -m benchmarks.loadtest \\
+    --url http://localhost:8000 --service-b-url http://localhost:8001 \\
+    --users 20 --duration 60 \\
+    --mix list=70,details=25,edit=5 --username admin --password secret
+
+Metrics are per worker process: run both services with one worker for
+exact upstream amplification.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import Counter, defaultdict
+from datetime import UTC, datetime
+from typing import Optional
+
+import httpx
+
+ADMIN_PATH = "/service-a/admin"
+PERCENTILES = (50, 90, 99)
+METRICS_ROUTE_LABEL = 'route="/metrics"'
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """ "list=70,details=30" -> {"list": 70.0, "details": 30.0}"""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in ROUTES:
+            msg = f"unknown route {name}"
+            raise argparse.ArgumentTypeError(msg)
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def parse_range(value: str) -> range:
+    """ "1-1000" -> range(1, 1001)"""
+    start, _, end = value.partition("-")
+    return range(int(start), int(end or start) + 1)
+
+
+def sum_metric(text: str, name: str) -> float:
+    """Sum of samples of a metric over all label values in Prometheus
+    text format, without requests of /metrics made by scrape().
+    """
+    total = 0.0
+    for line in text.splitlines():
+        if (
+            line.startswith(name)
+            and line[len(name)] in "{ "
+            and METRICS_ROUTE_LABEL not in line
+        ):
+            total += float(line.rsplit(" ", 1)[1])
+    return total
+
+
+class VirtualUser:
+    """Sends requests of args.mix one after another with think time in
+    between, with its own admin session.
+    """
+
+    def __init__(
+        self, args: argparse.Namespace, rng: random.Random, stats: dict
+    ) -> None:
+        self.args = args
+        self.rng = rng
+        self.stats = stats
+        self.deleted = 0
+        self.client = httpx.AsyncClient(
+            base_url=args.url + ADMIN_PATH, timeout=args.timeout
+        )
+
+    async def login(self) -> None:
+        r = await self.client.post(
+            "/login",
+            data={
+                "username": self.args.username,
+                "password": self.args.password,
+            },
+        )
+        if r.status_code != httpx.codes.FOUND:
+            msg = f"Login failed with status {r.status_code}"
+            raise RuntimeError(msg)
+
+    async def run(self, deadline: float) -> None:
+        if self.args.username:
+            await self.login()
+        names = list(self.args.mix)
+        weights = list(self.args.mix.values())
+        try:
+            while time.monotonic() < deadline:
+                name = self.rng.choices(names, weights)[0]
+                await self.send(name)
+                if self.args.think_time:
+                    await asyncio.sleep(
+                        self.rng.expovariate(1 / self.args.think_time)
+                    )
+        finally:
+            await self.client.aclose()
+
+    async def send(self, name: str) -> None:
+        method, path = ROUTES[name](self)
+        if path is None:
+            return
+        start = time.perf_counter()
+        try:
+            r = await self.client.request(method, path)
+            # Redirects to the login page mean the session expired
+            error = r.status_code >= 400 or (  # noqa: PLR2004
+                r.is_redirect and "/login" in r.headers.get("location", "")
+            )
+            status = str(r.status_code)
+        except httpx.HTTPError as ex:
+            error = True
+            status = type(ex).__name__
+        self.stats["latencies"][name].append(time.perf_counter() - start)
+        self.stats["statuses"][name][status] += 1
+        if error:
+            self.stats["errors"][name] += 1
+
+    def list_request(self) -> tuple[str, Optional[str]]:
+        page = self.rng.randint(1, self.args.pages)
+        return "GET", f"/{self.args.identity}/list?page={page}"
+
+    def details_request(self) -> tuple[str, Optional[str]]:
+        pk = self.rng.choice(self.args.pks)
+        return "GET", f"/{self.args.identity}/details/{pk}"
+
+    def edit_request(self) -> tuple[str, Optional[str]]:
+        pk = self.rng.choice(self.args.pks)
+        return "GET", f"/{self.args.identity}/edit/{pk}"
+
+    def delete_request(self) -> tuple[str, Optional[str]]:
+        """Each id of --delete-pks is deleted once, by one of users"""
+        delete_pks = self.args.delete_pks
+        if delete_pks is None or self.deleted >= len(delete_pks):
+            return "DELETE", None
+        index = self.args.user_index + self.deleted * self.args.users
+        self.deleted += 1
+        if index >= len(delete_pks):
+            return "DELETE", None
+        return (
+            "DELETE",
+            f"/{self.args.identity}/delete?pks={delete_pks[index]}",
+        )
+
+
+ROUTES = {
+    "list": VirtualUser.list_request,
+    "details": VirtualUser.details_request,
+    "edit": VirtualUser.edit_request,
+    "delete": VirtualUser.delete_request,
+}
+
+
+async def scrape(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return None
+    async with httpx.AsyncClient(timeout=10) as client:
+        try:
+            r = await client.get(url + "/metrics")
+            r.raise_for_status()
+        except httpx.HTTPError as ex:
+            print(f"Metrics of {url} unavailable: {ex!r}")  # noqa: T201
+            return None
+        return r.text
+
+
+def get_amplification(
+    before: tuple[Optional[str], Optional[str]],
+    after: tuple[Optional[str], Optional[str]],
+    requests: int,
+) -> dict:
+    """Upstream requests per admin request: counted by service A's
+    upstream histogram and by service B's request histogram.
+    """
+    result = {}
+    names = (
+        ("upstream_per_request", "upstream_request_duration_seconds_count"),
+        ("service_b_per_request", "http_request_duration_seconds_count"),
+    )
+    for (key, name), first, last in zip(names, before, after, strict=True):
+        if first is not None and last is not None and requests:
+            delta = sum_metric(last, name) - sum_metric(first, name)
+            result[key] = delta / requests
+    return result
+
+
+def get_route_stats(latencies: list[float], errors: int) -> dict:
+    stats = {
+        "requests": len(latencies),
+        "errors": errors,
+        "error_rate": errors / len(latencies),
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        for p in PERCENTILES:
+            stats[f"p{p}_ms"] = cuts[p - 1] * 1000
+    else:
+        for p in PERCENTILES:
+            stats[f"p{p}_ms"] = latencies[0] * 1000
+    return stats
+
+
+async def run(args: argparse.Namespace) -> dict:
+    stats = {
+        "latencies": defaultdict(list),
+        "statuses": defaultdict(Counter),
+        "errors": Counter(),
+    }
+    before = await asyncio.gather(scrape(args.url), scrape(args.service_b_url))
+    rng = random.Random(args.seed)  # noqa: S311
+    users = []
+    for index in range(args.users):
+        user_args = argparse.Namespace(**vars(args), user_index=index)
+        users.append(
+            VirtualUser(user_args, random.Random(rng.random()), stats)  # noqa: S311
+        )
+    started = time.monotonic()
+    deadline = started + args.duration
+    # Users start spread over the ramp up time
+    await asyncio.gather(
+        *(
+            start_user(user, index * args.ramp_up / args.users, deadline)
+            for index, user in enumerate(users)
+        )
+    )
+    elapsed = time.monotonic() - started
+    after = await asyncio.gather(scrape(args.url), scrape(args.service_b_url))
+    routes = {
+        name: {
+            **get_route_stats(latencies, stats["errors"][name]),
+            "statuses": dict(stats["statuses"][name]),
+        }
+        for name, latencies in stats["latencies"].items()
+    }
+    requests = sum(route["requests"] for route in routes.values())
+    errors = sum(route["errors"] for route in routes.values())
+    return {
+        "duration": elapsed,
+        "requests": requests,
+        "throughput": requests / elapsed,
+        "error_rate": errors / requests if requests else 0.0,
+        **get_amplification(before, after, requests),
+        "routes": routes,
+    }
+
+
+async def start_user(user: VirtualUser, delay: float, deadline: float) -> None:
+    await asyncio.sleep(delay)
+    await user.run(deadline)
+
+
+def print_report(report: dict) -> None:
+    print(  # noqa: T201
+        f"{report['requests']} requests in {report['duration']:.1f} s, "
+        f"{report['throughput']:.1f} req/s, "
+        f"{report['error_rate']:.2%} errors"
+    )
+    for key, label in (
+        ("upstream_per_request", "service A upstream calls"),
+        ("service_b_per_request", "service B requests"),
+    ):
+        if key in report:
+            print(f"{label} per admin request: {report[key]:.2f}")  # noqa: T201
+    print(  # noqa: T201
+        f"{'route':<10}{'requests':>10}{'errors':>8}{'p50 ms':>10}"
+        f"{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    )
+    for name, route in report["routes"].items():
+        print(  # noqa: T201
+            f"{name:<10}{route['requests']:>10}{route['errors']:>8}"
+            f"{route['p50_ms']:>10.1f}{route['p90_ms']:>10.1f}"
+            f"{route['p99_ms']:>10.1f}{route['max_ms']:>10.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument(
+        "--service-b-url", help="to scrape service B's /metrics"
+    )
+    parser.add_argument("--identity", default="book")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default="list=70,details=25,edit=5",
+        help="weights of routes: " + ", ".join(ROUTES),
+    )
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument(
+        "--ramp-up", type=float, default=0.0, help="seconds to start users"
+    )
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=1.0,
+        help="mean seconds between requests of a user, 0 for none",
+    )
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument(
+        "--pks",
+        type=parse_range,
+        default="1-1000",
+        help="ids for details and edit, like 1-1000",
+    )
+    parser.add_argument(
+        "--delete-pks",
+        type=parse_range,
+        help="ids the delete route may delete, like 5000-6000; "
+        "delete requests are skipped without it",
+    )
+    parser.add_argument("--username", help="admin login, if enabled")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON file to save the report to")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if not report["requests"]:
+        parser.exit(1, "No requests were sent\n")
+    print_report(report)
+    if args.output:
+        options = {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("output", "password")
+        }
+        options["pks"] = f"{args.pks.start}-{args.pks.stop - 1}"
+        if args.delete_pks is not None:
+            start, stop = args.delete_pks.start, args.delete_pks.stop
+            options["delete_pks"] = f"{start}-{stop - 1}"
+        with open(args.output, "w") as file:
+            json.dump(
+                {
+                    "created_at": datetime.now(UTC).isoformat(),
+                    "options": options,
+                    **report,
+                },
+                file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 import enum
 
+DATA_MAX_WINDOW_SIZE = 1000
+"""Max rows in one response of the APIBaseView data route"""
+
 
 class RequestMethod(enum.StrEnum):
     get = "GET"
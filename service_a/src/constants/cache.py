@@ -0,0 +1,12 @@
+from enum import StrEnum
+
+CACHE_EVICT_EVERY = 100
+"""Run TTL and size eviction of cache backends every N writes"""
+CACHE_LOOKUP_RESULTS = ("memory", "backend", "miss")
+"""Keys of TieredResponseCache.stats counted once per get()"""
+
+
+class CacheBackendType(StrEnum):
+    memory = "memory"
+    sqlite = "sqlite"
+    postgres = "postgres"
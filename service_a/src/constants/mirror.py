@@ -0,0 +1,8 @@
+MIRROR_SYNC_INTERVAL = 30.0
+"""Seconds between change feed polls, webhooks wake the sync earlier"""
+MIRROR_SYNC_BATCH = 1000
+MIRROR_SYNC_TIMEOUT = 10.0
+MIRROR_SYNC_OVERLAP = 300.0
+"""Seconds of the change feed read again on every pull: versions are
+taken when statements run, so a transaction committing later than this
+after its writes may be missed"""
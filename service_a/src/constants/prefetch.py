@@ -0,0 +1,4 @@
+PREFETCH_MAX_CONCURRENT = 4
+"""Bulkhead size: prefetches over the limit are skipped, not queued"""
+PREFETCH_MAX_AGE = 30.0
+"""Seconds a prefetched page is served without revalidation"""
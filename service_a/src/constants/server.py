@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class ServerMode(StrEnum):
+    development = "development"
+    production = "production"
@@ -0,0 +1 @@
+WEBHOOK_SIGNATURE_HEADER = "X-Webhook-Signature"
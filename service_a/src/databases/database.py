@@ -1,12 +1,19 @@
-from typing import AsyncGenerator
+import time
+from typing import Any, AsyncGenerator
+from uuid import uuid4
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
-from configs.config import db_settings
+from configs.config import db_settings, server_settings
+from constants.tracing import DB_STATEMENT_MAX_LENGTH
+from utilities.query_log import query_log
+from utilities.timing import add_span
+from utilities.tracing import tracer
 
 SQLALCHEMY_DATABASE_URL = (
     "postgresql+asyncpg://"
@@ -18,10 +25,96 @@ SQLALCHEMY_DATABASE_URL = (
 )
 
 
+def get_prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def get_connect_args(pgbouncer: bool) -> dict[str, Any]:
+    """asyncpg options of connections.
+
+    Behind PgBouncer in transaction pooling mode every transaction may
+    run on another server connection, where statements prepared before
+    don't exist and asyncpg's numbered names of other clients may be
+    taken. So statements are prepared again in each transaction under
+    unique names and never cached.
+
+    Args:
+        - pgbouncer (bool): connections go through transaction pooling
+    """
+    if not pgbouncer:
+        return {
+            "prepared_statement_cache_size": (
+                db_settings.DB_STATEMENT_CACHE_SIZE
+            )
+        }
+    return {
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": get_prepared_statement_name,
+        "statement_cache_size": 0,
+    }
+
+
+pool_size, max_overflow = db_settings.get_pool_limits(
+    server_settings.worker_count
+)
+
 async_engine = create_async_engine(
-    url=SQLALCHEMY_DATABASE_URL, pool_size=100, max_overflow=20, echo=True
+    url=SQLALCHEMY_DATABASE_URL,
+    echo=db_settings.DB_ECHO,
+    pool_size=pool_size,
+    max_overflow=max_overflow,
+    pool_timeout=db_settings.DB_POOL_TIMEOUT,
+    pool_recycle=db_settings.DB_POOL_RECYCLE,
+    pool_pre_ping=db_settings.DB_POOL_PRE_PING,
+    query_cache_size=db_settings.DB_QUERY_CACHE_SIZE,
+    connect_args=get_connect_args(db_settings.DB_PGBOUNCER),
 )
 
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def start_query_timer(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    context.query_start = time.perf_counter()
+    context.query_span = tracer.start_span(
+        "db.query",
+        kind="client",
+        attributes={
+            "db.system": "postgresql",
+            "db.statement": statement[:DB_STATEMENT_MAX_LENGTH],
+        },
+        child_only=True,
+    )
+
+
+@event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+def stop_query_timer(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    duration = time.perf_counter() - context.query_start
+    add_span("db", duration)
+    query_log.record(statement, duration, cursor.rowcount)
+    tracer.end_span(context.query_span)
+
+
+@event.listens_for(async_engine.sync_engine, "handle_error")
+def end_failed_query_span(exception_context: Any) -> None:
+    context = exception_context.execution_context
+    if span := getattr(context, "query_span", None):
+        span.error = repr(exception_context.original_exception)
+        tracer.end_span(span)
+
+
 async_session = async_sessionmaker(
     async_engine,
     class_=AsyncSession,
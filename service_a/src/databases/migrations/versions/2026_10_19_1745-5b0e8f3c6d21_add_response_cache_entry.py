@@ -0,0 +1,59 @@
+"""add_response_cache_entry
+
+Revision ID: 5b0e8f3c6d21
+Revises: c27d4e9b5a18
+Create Date: 2026-10-19 17:45:26.117402
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b0e8f3c6d21"
+down_revision: Union[str, None] = "c27d4e9b5a18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "response_cache_entry",
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("etag", sa.String(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("tags", postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column("stored_at", sa.Float(), nullable=False),
+        sa.Column("expires_at", sa.Float(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index(
+        op.f("ix_response_cache_entry_stored_at"),
+        "response_cache_entry",
+        ["stored_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_response_cache_entry_tags",
+        "response_cache_entry",
+        ["tags"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_response_cache_entry_tags", table_name="response_cache_entry"
+    )
+    op.drop_index(
+        op.f("ix_response_cache_entry_stored_at"),
+        table_name="response_cache_entry",
+    )
+    op.drop_table("response_cache_entry")
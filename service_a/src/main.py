@@ -1,20 +1,49 @@
-import uvicorn
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 
 from api.admin.admin import load_admin_site
+from api.admin.custom_baseview import upstream_log
+from api.debug.profiler import router as profiler_router
 from api.v1.router import router as v1_router
-from configs.config import app_settings
+from configs.config import app_settings, profiler_settings
 from databases.database import async_engine
 from schemas.service import ServiceInfo
 from api.admin.custom_admin import CustomAdmin
+from middlewares.metrics import MetricsMiddleware
+from middlewares.profiler import ProfilerMiddleware
+from middlewares.timing import ServerTimingMiddleware
+from middlewares.tracing import TracingMiddleware
+from utilities.admin.metrics import register_admin_metrics
+from utilities.admin.mirror import start_mirror_syncs
+from utilities.admin.prefetch import page_prefetcher
+from utilities.metrics import CONTENT_TYPE, register_pool_metrics, registry
+from utilities.server import run_server
+from utilities.tracing import tracer
 
 BACKEND_ENTRYPOINT = "service-a"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    syncs = start_mirror_syncs(admin.views)
+    yield
+    for sync in syncs:
+        await sync.stop()
+    await page_prefetcher.close()
+    await tracer.close()
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title="Service A",
     openapi_url=f"/{BACKEND_ENTRYPOINT}/openapi.json/",
     docs_url=f"/{BACKEND_ENTRYPOINT}/docs/",
+    lifespan=lifespan,
 )
 
 
@@ -26,6 +55,8 @@ admin = CustomAdmin(
     templates_dir="service_a/src/templates/sqladmin",
 )
 load_admin_site(admin)
+register_admin_metrics(admin.views, upstream_log)
+register_pool_metrics(async_engine.pool)
 
 app.add_middleware(
     CORSMiddleware,
@@ -35,8 +66,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+app.add_middleware(ServerTimingMiddleware)
+
+app.add_middleware(
+    MetricsMiddleware, identities=[view.identity for view in admin.views]
+)
+
+app.add_middleware(TracingMiddleware)
+
+if profiler_settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
 app.include_router(v1_router, prefix=f"/{BACKEND_ENTRYPOINT}")
 
+if profiler_settings.PROFILER_ENABLED:
+    app.include_router(profiler_router, prefix=f"/{BACKEND_ENTRYPOINT}")
+
 
 @app.get(f"/{BACKEND_ENTRYPOINT}/", response_model=ServiceInfo)
 async def root() -> ServiceInfo:
@@ -46,11 +93,10 @@ async def root() -> ServiceInfo:
     )
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",  # noqa: S104
-        port=app_settings.SERVICE_PORT,
-        reload=True,
-        forwarded_allow_ips="*",
-    )
+    run_server("main:app", port=app_settings.SERVICE_PORT)
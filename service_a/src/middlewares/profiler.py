@@ -0,0 +1,50 @@
+import threading
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from constants.profiler import PROFILE_HEADER, PROFILED_STATUS_HEADER
+from utilities.profiler import (
+    SamplingProfiler,
+    get_profile_response,
+    is_profiler_token,
+)
+
+
+class ProfilerMiddleware:
+    """Profile HTTP requests with the profiler token in the X-Profile
+    header and answer with collapsed stacks instead of their response.
+    The original status is sent in X-Profiled-Status. Added only if
+    PROFILER_ENABLED is set.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http" or not is_profiler_token(
+            Headers(scope=scope).get(PROFILE_HEADER)
+        ):
+            await self.app(scope, receive, send)
+            return
+        profiler = SamplingProfiler(thread_ids={threading.get_ident()})
+        if not profiler.start():
+            await self.app(scope, receive, send)
+            return
+        status_code = 500
+
+        async def discard(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+        response = get_profile_response(
+            profiler, {PROFILED_STATUS_HEADER: str(status_code)}
+        )
+        await response(scope, receive, send)
@@ -1,5 +1,13 @@
 from .base import Base
+from .cache import ResponseCacheEntry
 from .flowers import Flower
+from .mirror import MirrorCursor, MirroredObject
 
 
-__all__ = ["Base", "Flower"]
+__all__ = [
+    "Base",
+    "Flower",
+    "MirrorCursor",
+    "MirroredObject",
+    "ResponseCacheEntry",
+]
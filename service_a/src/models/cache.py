@@ -0,0 +1,29 @@
+from sqlalchemy import Float, Index, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+
+class ResponseCacheEntry(Base):
+    """Shared level of the APIBaseView response cache. The table is
+    unlogged: it is not replicated and is emptied after a crash.
+    """
+
+    __tablename__ = "response_cache_entry"
+    __table_args__ = (
+        Index(
+            "ix_response_cache_entry_tags",
+            "tags",
+            postgresql_using="gin",
+        ),
+        {"prefixes": ["UNLOGGED"]},
+    )
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    etag: Mapped[str]
+    data: Mapped[bytes] = mapped_column(LargeBinary)
+    tags: Mapped[list[str]] = mapped_column(ARRAY(String))
+    stored_at: Mapped[float] = mapped_column(Float, index=True)
+    expires_at: Mapped[float] = mapped_column(Float)
+    size: Mapped[int] = mapped_column(Integer)
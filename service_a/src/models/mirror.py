@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+
+class MirroredObject(Base):
+    """Copy of an object of a third-party API, as returned by its change
+    feed. seq is the feed sequence of the copied state.
+    """
+
+    __tablename__ = "mirrored_object"
+
+    identity: Mapped[str] = mapped_column(String, primary_key=True)
+    object_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    data: Mapped[dict] = mapped_column(JSONB)
+    seq: Mapped[int] = mapped_column(BigInteger)
+    synced_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class MirrorCursor(Base):
+    """Position of the mirror in a change feed"""
+
+    __tablename__ = "mirror_cursor"
+
+    feed_url: Mapped[str] = mapped_column(String, primary_key=True)
+    since: Mapped[int] = mapped_column(BigInteger)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class WebhookEvent(BaseModel):
+    entity: str
+    event: str
+    ids: Optional[list[int]] = None
+    """None if any object of the entity may have changed"""
+
+
+class WebhookPayload(BaseModel):
+    events: list[WebhookEvent]
+
+
+class WebhookResponse(BaseModel):
+    invalidated: int
@@ -0,0 +1,244 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import Counter, OrderedDict
+from typing import NamedTuple, Optional, Protocol, Sequence, Union
+
+import httpx
+
+from constants.cache import CACHE_LOOKUP_RESULTS
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    etag: str
+    data: Union[dict, list, None]
+    """None for a cached 404 response"""
+    tags: frozenset[str] = frozenset()
+    stored_at: float = 0.0
+    """Unix time, comparable between processes"""
+
+
+def object_tag(identity: str, obj_id: Union[int, str]) -> str:
+    """Tag of responses with one object"""
+    return f"{identity}:{obj_id}"
+
+
+def list_tag(identity: str) -> str:
+    """Tag of responses depending on any object of identity (lists,
+    objects with embedded related objects)
+    """
+    return f"{identity}:list"
+
+
+def identity_tag(identity: str) -> str:
+    return f"{identity}:*"
+
+
+def get_invalidated_tags(
+    identity: str, ids: Optional[Sequence[Union[int, str]]] = None
+) -> list[str]:
+    """Tags of responses to drop when objects of identity change: lists
+    and the given objects, or everything of identity if ids is None.
+    """
+    if ids is None:
+        return [identity_tag(identity)]
+    return [
+        list_tag(identity),
+        *(object_tag(identity, obj_id) for obj_id in ids),
+    ]
+
+
+class ResponseCache:
+    """In-memory LRU of decoded third-party API responses with their
+    ETags, used to revalidate instead of downloading unchanged data.
+    Entries are tagged with identities and ids of objects they contain,
+    so they can be dropped when those objects change.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(
+        url: str, params: Optional[dict] = None, token: Optional[str] = None
+    ) -> str:
+        """Key of a GET request. Token is hashed, so responses of one
+        user are never returned to another one.
+        """
+        key = str(httpx.URL(url, params=params or {}))
+        if token:
+            key += "#" + hashlib.sha256(token.encode()).hexdigest()[:16]
+        return key
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(
+        self,
+        key: str,
+        etag: str,
+        data: Union[dict, list],
+        tags: Sequence[str] = (),
+    ) -> CachedResponse:
+        tags = frozenset(
+            (*tags, *(identity_tag(tag.split(":")[0]) for tag in tags))
+        )
+        entry = CachedResponse(etag, data, tags, time.time())
+        self.put(key, entry)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        self.delete(key)
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self.delete(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def invalidate_tags(self, tags: Sequence[str]) -> int:
+        """Drop entries with any of tags.
+
+        Returns:
+            - int: number of dropped entries
+        """
+        keys = set().union(*(self._keys_by_tag.get(tag, ()) for tag in tags))
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+    def invalidate(
+        self, identity: str, ids: Optional[Sequence[Union[int, str]]] = None
+    ) -> int:
+        return self.invalidate_tags(get_invalidated_tags(identity, ids))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+
+class CacheBackend(Protocol):
+    """Second level cache shared by worker processes"""
+
+    async def get(self, key: str) -> Optional[CachedResponse]: ...
+
+    async def set(self, key: str, entry: CachedResponse) -> None: ...
+
+    async def invalidate_tags(self, tags: Sequence[str]) -> int: ...
+
+    async def clear(self) -> None: ...
+
+
+class TieredResponseCache:
+    """ResponseCache of the process in front of an optional shared
+    CacheBackend. Entries found in the backend are copied to memory,
+    new entries are written to the backend in background, so requests
+    never wait for it. Backend errors are logged and treated as misses.
+
+    Invalidation reaches memory of the current process and the backend
+    only. Memory entries of other workers are still revalidated with
+    their ETags, unless views use cache_max_age.
+    """
+
+    make_key = staticmethod(ResponseCache.make_key)
+
+    def __init__(
+        self,
+        memory: Optional[ResponseCache] = None,
+        backend: Optional[CacheBackend] = None,
+    ) -> None:
+        self.memory = memory or ResponseCache()
+        self.backend = backend
+        self.stats: Counter[str] = Counter()
+        """Lookups by result (memory, backend, miss), revalidated entries"""
+        self._writes: set[asyncio.Task] = set()
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = sum(self.stats[result] for result in CACHE_LOOKUP_RESULTS)
+        if not lookups:
+            return 0.0
+        return (self.stats["memory"] + self.stats["backend"]) / lookups
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        if entry := self.memory.get(key):
+            self.stats["memory"] += 1
+            return entry
+        if self.backend is None:
+            self.stats["miss"] += 1
+            return None
+        try:
+            entry = await self.backend.get(key)
+        except Exception as ex:
+            logger.warning("Cache backend get failed: %r", ex)
+            entry = None
+        if entry is not None:
+            self.memory.put(key, entry)
+        self.stats["miss" if entry is None else "backend"] += 1
+        return entry
+
+    async def set(
+        self,
+        key: str,
+        etag: str,
+        data: Union[dict, list],
+        tags: Sequence[str] = (),
+    ) -> None:
+        entry = self.memory.set(key, etag, data, tags)
+        if self.backend is not None:
+            task = asyncio.create_task(self._write(key, entry))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+    def set_missing(self, key: str, tags: Sequence[str] = ()) -> None:
+        """Remember a 404 response, in memory only"""
+        self.memory.set(key, "", None, tags)
+
+    def refresh(self, key: str, entry: CachedResponse) -> None:
+        """Mark a revalidated entry as fresh in memory"""
+        self.stats["revalidated"] += 1
+        self.memory.put(key, entry._replace(stored_at=time.time()))
+
+    async def invalidate(
+        self, identity: str, ids: Optional[Sequence[Union[int, str]]] = None
+    ) -> int:
+        tags = get_invalidated_tags(identity, ids)
+        invalidated = self.memory.invalidate_tags(tags)
+        if self.backend is not None:
+            try:
+                invalidated += await self.backend.invalidate_tags(tags)
+            except Exception as ex:
+                logger.warning("Cache backend invalidation failed: %r", ex)
+        return invalidated
+
+    async def clear(self) -> None:
+        self.memory.clear()
+        if self.backend is not None:
+            await self.backend.clear()
+
+    async def _write(self, key: str, entry: CachedResponse) -> None:
+        try:
+            await self.backend.set(key, entry)
+        except Exception as ex:
+            logger.warning("Cache backend set failed: %r", ex)
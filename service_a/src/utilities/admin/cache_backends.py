@@ -0,0 +1,272 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Optional, Sequence
+
+import msgpack
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from configs.config import cache_settings
+from constants.cache import CACHE_EVICT_EVERY, CacheBackendType
+from databases.database import async_session
+from models import ResponseCacheEntry
+from utilities.admin.cache import (
+    CacheBackend,
+    CachedResponse,
+    ResponseCache,
+    TieredResponseCache,
+)
+
+
+def pack_entry(entry: CachedResponse) -> bytes:
+    return msgpack.packb(entry.data)
+
+
+def unpack_entry(
+    etag: str, data: bytes, tags: Sequence[str], stored_at: float
+) -> CachedResponse:
+    return CachedResponse(
+        etag, msgpack.unpackb(data), frozenset(tags), stored_at
+    )
+
+
+class SQLiteCacheBackend:
+    """Cache in a SQLite file shared by worker processes on one host.
+    Queries run in a thread; WAL mode lets readers work while another
+    process writes. Every evict_every writes expired entries are deleted,
+    then the oldest ones until the data fits into max_bytes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: int,
+        max_bytes: int,
+        evict_every: int = CACHE_EVICT_EVERY,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, entry: CachedResponse) -> None:
+        await asyncio.to_thread(self._set, key, entry)
+
+    async def invalidate_tags(self, tags: Sequence[str]) -> int:
+        return await asyncio.to_thread(self._invalidate_tags, tags)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM entry")
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5, check_same_thread=False
+            )
+            connection.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA foreign_keys=ON;
+                CREATE TABLE IF NOT EXISTS entry (
+                    key TEXT PRIMARY KEY,
+                    etag TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    tags BLOB NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entry_stored_at
+                    ON entry (stored_at);
+                CREATE TABLE IF NOT EXISTS entry_tag (
+                    tag TEXT NOT NULL,
+                    key TEXT NOT NULL
+                        REFERENCES entry (key) ON DELETE CASCADE,
+                    PRIMARY KEY (tag, key)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS entry_tag_key ON entry_tag (key);
+                """
+            )
+            self._connection = connection
+        return self._connection
+
+    def _execute(self, sql: str, parameters: Sequence = ()) -> int:
+        with self._lock, self._connect() as connection:
+            return connection.execute(sql, parameters).rowcount
+
+    def _get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT etag, data, tags, stored_at FROM entry "
+                    "WHERE key = ? AND expires_at > ?",
+                    (key, time.time()),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return None
+        etag, data, tags, stored_at = row
+        return unpack_entry(etag, data, msgpack.unpackb(tags), stored_at)
+
+    def _set(self, key: str, entry: CachedResponse) -> None:
+        data = pack_entry(entry)
+        with self._lock, self._connect() as connection:
+            # Deletes tags of the old entry too
+            connection.execute("DELETE FROM entry WHERE key = ?", (key,))
+            connection.execute(
+                "INSERT INTO entry VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.etag,
+                    data,
+                    msgpack.packb(sorted(entry.tags)),
+                    entry.stored_at,
+                    entry.stored_at + self.ttl,
+                    len(data),
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO entry_tag VALUES (?, ?)",
+                [(tag, key) for tag in entry.tags],
+            )
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        connection.execute(
+            "DELETE FROM entry WHERE expires_at <= ?", (time.time(),)
+        )
+        connection.execute(
+            "DELETE FROM entry WHERE key IN (SELECT key FROM ("
+            "SELECT key, sum(size) OVER (ORDER BY stored_at DESC) AS total "
+            "FROM entry) WHERE total > ?)",
+            (self.max_bytes,),
+        )
+
+    def _invalidate_tags(self, tags: Sequence[str]) -> int:
+        placeholders = ", ".join("?" * len(tags))
+        sql = (
+            "DELETE FROM entry WHERE key IN (SELECT key FROM entry_tag "  # noqa: S608
+            f"WHERE tag IN ({placeholders}))"
+        )
+        return self._execute(sql, tags)
+
+
+class PostgresCacheBackend:
+    """Cache in the unlogged response_cache_entry table of service A's
+    database, shared by all workers and hosts. Eviction works like in
+    SQLiteCacheBackend.
+    """
+
+    def __init__(
+        self, ttl: int, max_bytes: int, evict_every: int = CACHE_EVICT_EVERY
+    ) -> None:
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self._writes = 0
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        stmt = select(
+            ResponseCacheEntry.etag,
+            ResponseCacheEntry.data,
+            ResponseCacheEntry.tags,
+            ResponseCacheEntry.stored_at,
+        ).where(
+            ResponseCacheEntry.key == key,
+            ResponseCacheEntry.expires_at > time.time(),
+        )
+        async with async_session() as db:
+            row = (await db.execute(stmt)).first()
+        return unpack_entry(*row) if row else None
+
+    async def set(self, key: str, entry: CachedResponse) -> None:
+        data = pack_entry(entry)
+        values = {
+            "etag": entry.etag,
+            "data": data,
+            "tags": sorted(entry.tags),
+            "stored_at": entry.stored_at,
+            "expires_at": entry.stored_at + self.ttl,
+            "size": len(data),
+        }
+        stmt = insert(ResponseCacheEntry).values(key=key, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ResponseCacheEntry.key], set_=values
+        )
+        async with async_session() as db:
+            await db.execute(stmt)
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                await self._evict(db)
+            await db.commit()
+
+    async def invalidate_tags(self, tags: Sequence[str]) -> int:
+        stmt = delete(ResponseCacheEntry).where(
+            ResponseCacheEntry.tags.overlap(list(tags))
+        )
+        async with async_session() as db:
+            res = await db.execute(stmt)
+            await db.commit()
+        return res.rowcount
+
+    async def clear(self) -> None:
+        async with async_session() as db:
+            await db.execute(delete(ResponseCacheEntry))
+            await db.commit()
+
+    async def _evict(self, db) -> None:  # noqa: ANN001
+        await db.execute(
+            delete(ResponseCacheEntry).where(
+                ResponseCacheEntry.expires_at <= time.time()
+            )
+        )
+        totals = select(
+            ResponseCacheEntry.key,
+            func.sum(ResponseCacheEntry.size)
+            .over(order_by=ResponseCacheEntry.stored_at.desc())
+            .label("total"),
+        ).subquery()
+        await db.execute(
+            delete(ResponseCacheEntry).where(
+                ResponseCacheEntry.key.in_(
+                    select(totals.c.key).where(totals.c.total > self.max_bytes)
+                )
+            )
+        )
+
+
+def get_cache_backend() -> Optional[CacheBackend]:
+    backend = cache_settings.RESPONSE_CACHE_BACKEND
+    if backend == CacheBackendType.sqlite:
+        return SQLiteCacheBackend(
+            path=cache_settings.RESPONSE_CACHE_PATH,
+            ttl=cache_settings.RESPONSE_CACHE_TTL,
+            max_bytes=cache_settings.RESPONSE_CACHE_MAX_BYTES,
+        )
+    if backend == CacheBackendType.postgres:
+        return PostgresCacheBackend(
+            ttl=cache_settings.RESPONSE_CACHE_TTL,
+            max_bytes=cache_settings.RESPONSE_CACHE_MAX_BYTES,
+        )
+    return None
+
+
+def get_response_cache() -> TieredResponseCache:
+    """Response cache configured by CacheSettings"""
+    return TieredResponseCache(
+        memory=ResponseCache(cache_settings.RESPONSE_CACHE_MEMORY_SIZE),
+        backend=get_cache_backend(),
+    )
@@ -0,0 +1,31 @@
+import logging
+import time
+from collections import Counter
+
+
+class RateLimitedLog:
+    """Count repeated problems by kind and log each kind at most once per
+    interval, with the number of occurrences since the previous message,
+    instead of one traceback per occurrence.
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = 60.0) -> None:
+        self.logger = logger
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+        """Occurrences of each kind since start"""
+        self._pending: Counter[str] = Counter()
+        self._logged_at: dict[str, float] = {}
+
+    def warning(self, kind: str, msg: str, *args: object) -> None:
+        self.counts[kind] += 1
+        self._pending[kind] += 1
+        now = time.monotonic()
+        logged_at = self._logged_at.get(kind)
+        if logged_at is not None and now - logged_at < self.interval:
+            return
+        self._logged_at[kind] = now
+        occurrences = self._pending.pop(kind)
+        self.logger.warning(
+            "%s (%s times since last report)", msg % args, occurrences
+        )
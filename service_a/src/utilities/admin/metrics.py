@@ -0,0 +1,84 @@
+from typing import Any, Sequence
+
+from constants.cache import CACHE_LOOKUP_RESULTS
+from utilities.admin.log_limiter import RateLimitedLog
+from utilities.admin.prefetch import page_prefetcher
+from utilities.metrics import registry
+
+
+def register_admin_metrics(
+    views: Sequence[Any], upstream_log: RateLimitedLog
+) -> None:
+    """Response cache, prefetch and upstream error metrics of views,
+    read on scrape from stats the objects already keep.
+    """
+    caches = {
+        id(view.response_cache): view.response_cache
+        for view in views
+        if hasattr(view, "response_cache")
+    }
+    registry.callback(
+        "response_cache_lookups_total",
+        "Response cache lookups by result: memory, backend, miss",
+        ("cache", "result"),
+        lambda: [
+            ((str(index), result), count)
+            for index, cache in enumerate(caches.values())
+            for result in CACHE_LOOKUP_RESULTS
+            if (count := cache.stats[result])
+        ],
+        type="counter",
+    )
+    registry.callback(
+        "response_cache_revalidations_total",
+        "Cached responses confirmed by 304 Not Modified",
+        ("cache",),
+        lambda: [
+            ((str(index),), cache.stats["revalidated"])
+            for index, cache in enumerate(caches.values())
+        ],
+        type="counter",
+    )
+    registry.callback(
+        "response_cache_hit_ratio",
+        "Share of response cache lookups found in memory or backend",
+        ("cache",),
+        lambda: [
+            ((str(index),), cache.hit_ratio)
+            for index, cache in enumerate(caches.values())
+        ],
+    )
+    registry.callback(
+        "response_cache_memory_entries",
+        "Entries in memory of this process",
+        ("cache",),
+        lambda: [
+            ((str(index),), len(cache.memory))
+            for index, cache in enumerate(caches.values())
+        ],
+    )
+    registry.callback(
+        "prefetch_total",
+        "Next page prefetches by outcome",
+        ("outcome",),
+        lambda: [
+            ((outcome,), count)
+            for outcome, count in page_prefetcher.stats.items()
+        ],
+        type="counter",
+    )
+    registry.callback(
+        "prefetch_hit_ratio",
+        "Share of started prefetches whose page was requested",
+        (),
+        lambda: [((), page_prefetcher.hit_rate)],
+    )
+    registry.callback(
+        "upstream_errors_total",
+        "Failed requests to third-party APIs by method and status",
+        ("kind",),
+        lambda: [
+            ((kind,), count) for kind, count in upstream_log.counts.items()
+        ],
+        type="counter",
+    )
@@ -0,0 +1,282 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from typing import Any, Iterable, Optional, Sequence
+
+import httpx
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from constants.mirror import (
+    MIRROR_SYNC_BATCH,
+    MIRROR_SYNC_INTERVAL,
+    MIRROR_SYNC_OVERLAP,
+    MIRROR_SYNC_TIMEOUT,
+)
+from databases.database import async_session
+from models import MirrorCursor, MirroredObject
+
+logger = logging.getLogger(__name__)
+
+mirror_syncs: dict[str, "MirrorSync"] = {}
+"""Running syncs by mirrored identity"""
+
+
+class MirrorSync:
+    """Keep MirroredObject rows of identities in sync with a change feed
+    (GET changes_url?since=&limit= returning upserts and tombstones in
+    seq order). Pages are applied in one transaction each together with
+    the cursor.
+
+    The feed's seq is taken when a write runs, not at commit, so a
+    change may show up behind the position already read. Every pull
+    starts again from the position reached overlap seconds ago, and the
+    stored cursor is that position too, so a restart re-reads the same
+    window. Upserts only replace rows with a lower seq, so changes read
+    twice are applied once.
+    """
+
+    def __init__(
+        self,
+        changes_url: str,
+        identities: Iterable[str],
+        interval: float = MIRROR_SYNC_INTERVAL,
+        batch_size: int = MIRROR_SYNC_BATCH,
+        overlap: float = MIRROR_SYNC_OVERLAP,
+    ) -> None:
+        self.changes_url = changes_url
+        self.identities = set(identities)
+        self.interval = interval
+        self.batch_size = batch_size
+        self.overlap = overlap
+        self.since = 0
+        """seq of the latest change read"""
+        self._checkpoints: deque[tuple[float, int]] = deque()
+        """(monotonic time, since) at the start of pulls within overlap"""
+        self.ready = False
+        """Mirror finished the initial load at least once"""
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        for identity in self.identities:
+            mirror_syncs[identity] = self
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        for identity in self.identities:
+            mirror_syncs.pop(identity, None)
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def wake(self) -> None:
+        """Pull changes now instead of waiting for the next interval"""
+        self._wake.set()
+
+    def _get_replay_since(self) -> int:
+        """Position reached overlap seconds ago, or the oldest known"""
+        now = time.monotonic()
+        self._checkpoints.append((now, self.since))
+        while (
+            len(self._checkpoints) > 1
+            and self._checkpoints[1][0] <= now - self.overlap
+        ):
+            self._checkpoints.popleft()
+        return self._checkpoints[0][1]
+
+    async def pull(self) -> int:
+        """Apply all changes after the cursor, re-reading the overlap.
+
+        Returns:
+            - int: number of mirrored rows changed
+        """
+        async with self._lock:
+            applied = 0
+            cursor = since = self._get_replay_since()
+            async with httpx.AsyncClient(
+                timeout=MIRROR_SYNC_TIMEOUT
+            ) as client:
+                while True:
+                    r = await client.get(
+                        self.changes_url,
+                        params={"since": since, "limit": self.batch_size},
+                    )
+                    r.raise_for_status()
+                    page = r.json()
+                    applied += await self._apply(page, cursor)
+                    since = page["next_since"]
+                    self.since = max(self.since, since)
+                    if not page["has_more"]:
+                        break
+            self.ready = True
+            return applied
+
+    async def _run(self) -> None:
+        try:
+            self.since = await self._load_cursor()
+        except SQLAlchemyError as ex:
+            logger.warning("Mirror cursor of %s: %r", self.changes_url, ex)
+        self.ready = self.since > 0
+        while True:
+            try:
+                if applied := await self.pull():
+                    logger.info(
+                        "Mirror %s: %s changes applied, since=%s",
+                        self.changes_url,
+                        applied,
+                        self.since,
+                    )
+            except (httpx.HTTPError, SQLAlchemyError, KeyError) as ex:
+                logger.warning("Mirror %s: %r", self.changes_url, ex)
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            self._wake.clear()
+
+    async def _load_cursor(self) -> int:
+        async with async_session() as db:
+            since = await db.scalar(
+                select(MirrorCursor.since).where(
+                    MirrorCursor.feed_url == self.changes_url
+                )
+            )
+        return since or 0
+
+    async def _apply(self, page: dict, cursor: int) -> int:
+        upserts = {}
+        deletes = set()
+        for change in page["changes"]:
+            if change["entity"] not in self.identities:
+                continue
+            key = (change["entity"], change["id"])
+            if change["op"] == "delete":
+                upserts.pop(key, None)
+                deletes.add(key)
+            else:
+                deletes.discard(key)
+                upserts[key] = {
+                    "identity": change["entity"],
+                    "object_id": change["id"],
+                    "data": change["data"],
+                    "seq": change["seq"],
+                }
+        changed = 0
+        async with async_session() as db:
+            if upserts:
+                stmt = insert(MirroredObject).values(list(upserts.values()))
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[
+                        MirroredObject.identity,
+                        MirroredObject.object_id,
+                    ],
+                    set_={
+                        "data": stmt.excluded.data,
+                        "seq": stmt.excluded.seq,
+                        "synced_at": func.now(),
+                    },
+                    where=MirroredObject.seq < stmt.excluded.seq,
+                )
+                changed += (await db.execute(stmt)).rowcount
+            if deletes:
+                result = await db.execute(
+                    delete(MirroredObject).where(
+                        tuple_(
+                            MirroredObject.identity, MirroredObject.object_id
+                        ).in_(deletes)
+                    )
+                )
+                changed += result.rowcount
+            stmt = insert(MirrorCursor).values(
+                feed_url=self.changes_url, since=cursor
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[MirrorCursor.feed_url],
+                set_={"since": stmt.excluded.since, "updated_at": func.now()},
+            )
+            await db.execute(stmt)
+            await db.commit()
+        return changed
+
+
+def get_mirror_sync(identity: str) -> Optional[MirrorSync]:
+    return mirror_syncs.get(identity)
+
+
+def start_mirror_syncs(views: Sequence[Any]) -> list[MirrorSync]:
+    """Start one sync per change feed of views with mirror_mode set"""
+    identities_by_url: dict[str, set[str]] = {}
+    for view in views:
+        if getattr(view, "mirror_mode", False) and view.urls.changes_path:
+            url = view.urls.base_url + view.urls.changes_path
+            identities_by_url.setdefault(url, set()).add(view.identity)
+    syncs = [
+        MirrorSync(url, identities)
+        for url, identities in identities_by_url.items()
+    ]
+    for sync in syncs:
+        sync.start()
+    return syncs
+
+
+async def get_mirrored_page(
+    identity: str, order_by: Optional[str], skip: int, limit: int
+) -> dict:
+    """Page of mirrored objects in the paginated API response format.
+    order_by is a field name, with "-" prefix for descending order.
+    """
+    order_by = order_by or "id"
+    field = order_by.removeprefix("-")
+    if field == "id":
+        column = MirroredObject.object_id
+    else:
+        column = MirroredObject.data[field]
+    if order_by.startswith("-"):
+        column = column.desc()
+    stmt = (
+        select(MirroredObject.data, func.count().over())
+        .where(MirroredObject.identity == identity)
+        .order_by(column, MirroredObject.object_id)
+        .offset(skip)
+        .limit(limit)
+    )
+    async with async_session() as db:
+        rows = (await db.execute(stmt)).all()
+    return {
+        "objects": [row[0] for row in rows],
+        "total_count": rows[0][1] if rows else 0,
+    }
+
+
+async def get_mirrored_object(
+    identity: str, obj_id: Any, expand: Optional[Sequence[str]] = None
+) -> Optional[dict]:
+    """Mirrored object with expanded related objects embedded, if they
+    are mirrored too. None if the object isn't mirrored (yet).
+    """
+    async with async_session() as db:
+        data = await db.scalar(
+            select(MirroredObject.data).where(
+                MirroredObject.identity == identity,
+                MirroredObject.object_id == int(obj_id),
+            )
+        )
+        if data is None:
+            return None
+        for relation in expand or []:
+            related_id = data.get(f"{relation}_id")
+            if related_id is None or not get_mirror_sync(relation):
+                continue
+            if related := await db.scalar(
+                select(MirroredObject.data).where(
+                    MirroredObject.identity == relation,
+                    MirroredObject.object_id == related_id,
+                )
+            ):
+                data[relation] = related
+    return data
@@ -4,6 +4,7 @@ import logging
 import httpx
 
 from constants.admin import RequestMethod
+from utilities.timing import timed
 
 
 async def get_schema_for_form_from_api(
@@ -20,18 +21,20 @@ async def get_schema_for_form_from_api(
         - Union[list[dict], None]: request body schema
         for target endpoint
     """
-    return await get_body_schema(openapi_schema, target_path, method)
+    with timed("form"):
+        return await get_body_schema(openapi_schema, target_path, method)
 
 
 async def get_open_api_json(openapi_url: str) -> Union[dict, None]:
-    async with httpx.AsyncClient() as client:
-        try:
-            r = await client.get(url=openapi_url)
-            r.raise_for_status()
-        except httpx.HTTPError as ex:
-            logging.exception(ex)  # noqa: TRY401
-            return None
-    return r.json()
+    with timed("openapi"):
+        async with httpx.AsyncClient() as client:
+            try:
+                r = await client.get(url=openapi_url)
+                r.raise_for_status()
+            except httpx.HTTPError as ex:
+                logging.exception(ex)  # noqa: TRY401
+                return None
+        return r.json()
 
 
 async def get_body_schema(
@@ -0,0 +1,121 @@
+import asyncio
+from collections import Counter
+from typing import Awaitable, Callable, Optional
+
+from constants.prefetch import PREFETCH_MAX_CONCURRENT
+
+
+class PagePrefetcher:
+    """Fetch pages users are likely to open next into the response cache
+    in background.
+
+    At most max_concurrent prefetches run at once. It is a bulkhead:
+    prefetches over the limit are skipped instead of waiting, so they
+    never pile up in front of requests users are waiting for.
+
+    Every user has one prefetch per scope (a list with its sort, page
+    size and fields) at most. Asking for the prefetched page with claim()
+    waits for the prefetch if it is still running, navigating anywhere
+    else in the scope cancels it. Users are identified by views, see
+    APIBaseView.get_prefetch_user.
+    """
+
+    def __init__(self, max_concurrent: int = PREFETCH_MAX_CONCURRENT) -> None:
+        self.max_concurrent = max_concurrent
+        self.stats: Counter[str] = Counter()
+        """started, skipped, cancelled, hits and misses"""
+        self._tasks: dict[tuple[str, str], tuple[str, asyncio.Task]] = {}
+        self._running = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of started prefetches whose page was then requested"""
+        started = self.stats["started"]
+        return self.stats["hits"] / started if started else 0.0
+
+    def schedule(
+        self,
+        user: str,
+        scope: str,
+        key: str,
+        fetch: Callable[[], Awaitable[object]],
+    ) -> bool:
+        """Replace the prefetch of user in scope with fetch() of the page
+        with cache key. fetch should return None if the page wasn't
+        fetched.
+
+        Returns:
+            - bool: False if the bulkhead is full and nothing was started
+        """
+        self.cancel(user, scope)
+        if self._running >= self.max_concurrent:
+            self.stats["skipped"] += 1
+            return False
+        self._running += 1
+        task = asyncio.create_task(fetch())
+        task.add_done_callback(self._release)
+        self._tasks[(user, scope)] = (key, task)
+        self.stats["started"] += 1
+        return True
+
+    async def claim(self, user: str, scope: str, key: str) -> bool:
+        """Take the prefetch of user in scope if it is for the page with
+        key, cancel it otherwise.
+
+        Returns:
+            - bool: the page was prefetched into the cache
+        """
+        key_and_task = self._tasks.get((user, scope))
+        if key_and_task is None:
+            return False
+        if key_and_task[0] != key:
+            self.cancel(user, scope)
+            return False
+        task = self._tasks.pop((user, scope))[1]
+        # Not awaiting the task itself, so a cancelled request doesn't
+        # cancel the prefetch
+        await asyncio.wait([task])
+        hit = (
+            not task.cancelled()
+            and task.exception() is None
+            and task.result() is not None
+        )
+        self.stats["hits" if hit else "misses"] += 1
+        return hit
+
+    def cancel(self, user: str, scope: Optional[str] = None) -> None:
+        """Drop the prefetch of user in scope, or all prefetches of user
+        without scope, for example after the user opened another page.
+        """
+        owners = (
+            [(user, scope)]
+            if scope is not None
+            else [owner for owner in self._tasks if owner[0] == user]
+        )
+        for owner in owners:
+            key_and_task = self._tasks.pop(owner, None)
+            if key_and_task is None:
+                continue
+            task = key_and_task[1]
+            if task.done():
+                self.stats["misses"] += 1
+            else:
+                task.cancel()
+                self.stats["cancelled"] += 1
+
+    async def close(self) -> None:
+        tasks = [task for _, task in self._tasks.values()]
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _release(self, task: asyncio.Task) -> None:
+        self._running -= 1
+        if not task.cancelled():
+            # Retrieve the exception, so it isn't logged as never retrieved
+            task.exception()
+
+
+page_prefetcher = PagePrefetcher()
+"""Prefetcher shared by all views, so the bulkhead limits them together"""
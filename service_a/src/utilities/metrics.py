@@ -0,0 +1,229 @@
+from bisect import bisect_left
+from typing import Any, Callable, Iterable, Sequence
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+"""Latency buckets in seconds"""
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Samples = Iterable[tuple[tuple[str, ...], float]]
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value)
+            .replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n"),
+        )
+        for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for labelvalues, value in self.samples():
+            labels = format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}{labels} {value}")
+        return lines
+
+    def samples(self) -> Samples:
+        return ()
+
+
+class Counter(Metric):
+    """Counter with label values given positionally, so inc() is one dict
+    lookup. Updates aren't locked: the event loop runs one at a time.
+    """
+
+    type = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self) -> Samples:
+        return list(self._values.items())
+
+
+class CallbackMetric(Metric):
+    """Gauge or counter read from callback when metrics are scraped, for
+    values other code already keeps (pool state, cache stats).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Callable[[], Samples] = lambda: (),
+        type: str = "gauge",  # noqa: A002
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.type = type
+
+    def samples(self) -> Samples:
+        return self.callback()
+
+
+class Histogram(Metric):
+    """Histogram with fixed buckets. observe() finds the bucket with
+    bisect and increments one counter, cumulative counts are computed on
+    scrape only.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        """Label values -> per bucket counts, +Inf count, sum"""
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        bucket_names = (*self.labelnames, "le")
+        bounds = [*(str(bound) for bound in self.buckets), "+Inf"]
+        for labelvalues, series in list(self._series.items()):
+            count = 0
+            for bound, bucket_count in zip(bounds, series, strict=False):
+                count += bucket_count
+                labels = format_labels(bucket_names, (*labelvalues, bound))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {series[-1]}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics of the process in Prometheus text exposition format"""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> None:
+        self._metrics[metric.name] = metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        callback: Callable[[], Samples],
+        type: str = "gauge",  # noqa: A002
+    ) -> CallbackMetric:
+        metric = CallbackMetric(
+            name, documentation, labelnames, callback, type
+        )
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def register_pool_metrics(pool: Any) -> None:
+    """Gauges of a SQLAlchemy QueuePool: connections checked out, opened
+    over pool_size, idle in the pool and pool_size.
+    """
+    if not hasattr(pool, "overflow"):
+        return
+    registry.callback(
+        "db_pool_checked_out",
+        "Connections in use",
+        (),
+        lambda: [((), pool.checkedout())],
+    )
+    # overflow() starts at -pool_size
+    registry.callback(
+        "db_pool_overflow",
+        "Connections opened over pool_size",
+        (),
+        lambda: [((), max(pool.overflow(), 0))],
+    )
+    registry.callback(
+        "db_pool_checked_in",
+        "Idle connections in the pool",
+        (),
+        lambda: [((), pool.checkedin())],
+    )
+    registry.callback(
+        "db_pool_size", "Configured pool_size", (), lambda: [((), pool.size())]
+    )
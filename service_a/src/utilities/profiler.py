@@ -0,0 +1,135 @@
+import hmac
+import os
+import sys
+import threading
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Optional
+
+from starlette.responses import PlainTextResponse
+
+from configs.config import profiler_settings
+from constants.profiler import PROFILE_FILENAME
+
+profiler_lock = threading.Lock()
+"""Held while a profile is taken, so one runs per process at a time"""
+
+
+def is_profiler_token(token: Optional[str]) -> bool:
+    """Profiling is refused while PROFILER_TOKEN is empty"""
+    expected = profiler_settings.PROFILER_TOKEN
+    return bool(expected and token) and hmac.compare_digest(
+        token.encode(), expected.encode()
+    )
+
+
+PATH_PREFIXES = sorted(
+    (os.path.join(path, "") for path in sys.path if path),
+    key=len,
+    reverse=True,
+)
+
+
+def get_frame_label(code: CodeType) -> str:
+    filename = code.co_filename
+    for prefix in PATH_PREFIXES:
+        if filename.startswith(prefix):
+            filename = filename[len(prefix) :]
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(
+        ";", ":"
+    )
+
+
+class SamplingProfiler:
+    """Sample stacks of threads from a background thread every interval
+    seconds with sys._current_frames(), without tracing hooks, so the
+    profiled code runs at full speed apart from the GIL the sampler
+    takes briefly. Stacks are counted in the collapsed format of
+    flamegraph.pl and speedscope: "root;...;leaf count" per line.
+
+    Profiling the event loop thread includes every task it runs, not
+    only the request of interest, and time waiting in the selector.
+    """
+
+    def __init__(
+        self,
+        interval: float = profiler_settings.PROFILER_INTERVAL,
+        thread_ids: Optional[set[int]] = None,
+    ) -> None:
+        """
+        Args:
+            - interval (float): seconds between samples
+            - thread_ids (set[int] | None): threads to sample, all other
+              than the sampler if None
+        """
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._labels: dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        """Start sampling, False if another profile is being taken"""
+        if not profiler_lock.acquire(blocking=False):
+            return False
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        profiler_lock.release()
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()  # noqa: SLF001
+            for thread_id, frame in frames.items():
+                if thread_id == own_id or (
+                    self.thread_ids is not None
+                    and thread_id not in self.thread_ids
+                ):
+                    continue
+                self.stacks[self._collapse(frame)] += 1
+            self.samples += 1
+            del frames
+
+    def _collapse(self, frame: Optional[FrameType]) -> str:
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = get_frame_label(code)
+            labels.append(label)
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+
+def get_profile_response(
+    profiler: SamplingProfiler, headers: Optional[dict] = None
+) -> PlainTextResponse:
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{PROFILE_FILENAME}"'
+            ),
+            "X-Profile-Samples": str(profiler.samples),
+            **(headers or {}),
+        },
+    )
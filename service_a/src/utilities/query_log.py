@@ -0,0 +1,112 @@
+import logging
+import random
+import re
+from functools import lru_cache
+from typing import Optional
+
+from configs.config import db_settings
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_RE = re.compile(r"\$\d+|%\(\w+\)s")
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+IN_LIST_RE = re.compile(r"\bIN \(\?(?:::\w+)?(?:, \?(?:::\w+)?)*\)")
+VALUES_RE = re.compile(r"(VALUES \([^()]*\))(?:, \([^()]*\))+")
+WHITESPACE_RE = re.compile(r"\s+")
+
+OTHER_STATEMENTS = "(other)"
+"""Fingerprint counting statements over max_statements"""
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Statement with literals and placeholders replaced by ?, IN lists
+    and multi-row VALUES collapsed, so executions of one query with any
+    parameters have the same fingerprint.
+    """
+    text = WHITESPACE_RE.sub(" ", statement).strip()
+    text = STRING_RE.sub("?", text)
+    text = PLACEHOLDER_RE.sub("?", text)
+    text = NUMBER_RE.sub("?", text)
+    text = IN_LIST_RE.sub("IN (...)", text)
+    return VALUES_RE.sub(r"\1, ...", text)
+
+
+class StatementStats:
+    __slots__ = ("calls", "total", "max", "rows")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+
+
+class QueryLog:
+    """Durations and row counts of SQL statements by fingerprint. Logs
+    statements slower than slow_threshold seconds with a warning and a
+    sample_ratio share of the others with info. At most max_statements
+    fingerprints are kept, later ones are counted as OTHER_STATEMENTS.
+    """
+
+    def __init__(
+        self,
+        slow_threshold: float,
+        sample_ratio: float = 0.0,
+        max_statements: int = 500,
+    ) -> None:
+        self.slow_threshold = slow_threshold
+        self.sample_ratio = sample_ratio
+        self.max_statements = max_statements
+        self.stats: dict[str, StatementStats] = {}
+
+    def record(self, statement: str, duration: float, rows: int) -> None:
+        key = fingerprint(statement)
+        stats = self.stats.get(key)
+        if stats is None:
+            if len(self.stats) >= self.max_statements:
+                key = OTHER_STATEMENTS
+            stats = self.stats.setdefault(key, StatementStats())
+        stats.calls += 1
+        stats.total += duration
+        stats.max = max(stats.max, duration)
+        stats.rows += max(rows, 0)
+        if duration >= self.slow_threshold:
+            logger.warning(
+                "Slow query %.1f ms, %d rows: %s",
+                duration * 1000,
+                rows,
+                statement,
+            )
+        elif self.sample_ratio and random.random() < self.sample_ratio:  # noqa: S311
+            logger.info(
+                "Query %.1f ms, %d rows: %s", duration * 1000, rows, statement
+            )
+
+    def top(self, limit: Optional[int] = 20) -> list[dict]:
+        """Statements by total time, slowest first"""
+        items = sorted(
+            self.stats.items(), key=lambda item: item[1].total, reverse=True
+        )
+        return [
+            {
+                "fingerprint": key,
+                "calls": stats.calls,
+                "total_seconds": stats.total,
+                "mean_seconds": stats.total / stats.calls,
+                "max_seconds": stats.max,
+                "rows": stats.rows,
+            }
+            for key, stats in items[:limit]
+        ]
+
+    def reset(self) -> None:
+        self.stats.clear()
+
+
+query_log = QueryLog(
+    db_settings.SLOW_QUERY_THRESHOLD,
+    db_settings.QUERY_LOG_SAMPLE_RATIO,
+    db_settings.QUERY_STATS_MAX_STATEMENTS,
+)
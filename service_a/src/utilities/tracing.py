@@ -0,0 +1,356 @@
+import asyncio
+import contextlib
+import json
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional, Protocol, Sequence, TextIO
+
+import httpx
+
+from configs.config import app_settings, tracing_settings
+from constants.tracing import TracingExporterType
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """Finished or running operation of a trace, ids are lowercase hex
+    as in W3C Trace Context.
+    """
+
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+        "sampled",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+        kind: str = "internal",
+        attributes: Optional[dict] = None,
+        sampled: bool = True,
+    ) -> None:
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+        self.sampled = sampled
+
+    @property
+    def traceparent(self) -> str:
+        flags = "01" if self.sampled else "00"
+        return f"00-{self.trace_id}-{self.span_id}-{flags}"
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+def parse_traceparent(
+    value: Optional[str],
+) -> Optional[tuple[str, str, bool]]:
+    """Trace id, parent span id and sampled flag of a traceparent header,
+    None if it is missing or malformed.
+    """
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:  # noqa: PLR2004
+        return None
+    version, trace_id, parent_id, flags = parts[:4]
+    try:
+        sampled = bool(int(flags, 16) & 1)
+        int(trace_id, 16)
+        int(parent_id, 16)
+    except ValueError:
+        return None
+    if version == "ff" or trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, sampled
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None:
+        """Called for every finished sampled span, must not block"""
+
+    async def close(self) -> None: ...
+
+
+class JsonLinesExporter:
+    """Append spans as JSON lines to a file, for tests and local runs"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._file: Optional[TextIO] = None
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", buffering=1)  # noqa: SIM115
+            self._file.write(line)
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class OTLPExporter:
+    """Send spans in batches to an OpenTelemetry collector with OTLP/HTTP
+    JSON (POST {endpoint}/v1/traces). Spans are queued without blocking
+    and dropped if the queue is full or the collector is unavailable.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str,
+        batch_size: int = 512,
+        flush_interval: float = 1.0,
+        queue_size: int = 10000,
+        timeout: float = 5.0,
+    ) -> None:
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self._queue: asyncio.Queue[Span] = asyncio.Queue(queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    def export(self, span: Span) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        try:
+            self._queue.put_nowait(span)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        while not self._queue.empty():
+            await self._send(self._drain(self.batch_size))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            while not self._queue.empty():
+                await self._send(self._drain(self.batch_size))
+
+    def _drain(self, limit: int) -> list[Span]:
+        spans = []
+        while not self._queue.empty() and len(spans) < limit:
+            spans.append(self._queue.get_nowait())
+        return spans
+
+    async def _send(self, spans: Sequence[Span]) -> None:
+        if not spans:
+            return
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                r = await client.post(self.url, json=self.encode(spans))
+                r.raise_for_status()
+        except httpx.HTTPError as ex:
+            self.dropped += len(spans)
+            logger.warning("Trace export to %s failed: %r", self.url, ex)
+
+    def encode(self, spans: Sequence[Span]) -> dict:
+        resource = {
+            "attributes": [otlp_attribute("service.name", self.service_name)]
+        }
+        return {
+            "resourceSpans": [
+                {
+                    "resource": resource,
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+OTLP_SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+OTLP_STATUS_OK = 1
+OTLP_STATUS_ERROR = 2
+
+
+def otlp_span(span: Span) -> dict:
+    return {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "parentSpanId": span.parent_id or "",
+        "name": span.name,
+        "kind": OTLP_SPAN_KINDS.get(span.kind, 1),
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [
+            otlp_attribute(key, value)
+            for key, value in span.attributes.items()
+        ],
+        "status": {
+            "code": OTLP_STATUS_ERROR if span.error else OTLP_STATUS_OK,
+            "message": span.error or "",
+        },
+    }
+
+
+def otlp_attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar(
+    "current_span", default=None
+)
+
+
+class Tracer:
+    """Create spans as children of the current one. Without an exporter
+    spans aren't created at all, so disabled tracing costs one attribute
+    check per span. Unsampled traces are propagated but not exported.
+    """
+
+    def __init__(
+        self,
+        exporter: Optional[SpanExporter] = None,
+        sample_ratio: float = 1.0,
+    ) -> None:
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+
+    def start_span(
+        self,
+        name: str,
+        kind: str = "internal",
+        attributes: Optional[dict] = None,
+        traceparent: Optional[str] = None,
+        child_only: bool = False,
+    ) -> Optional[Span]:
+        """Span with the current span or traceparent header as parent,
+        a new trace if there is neither. None if tracing is disabled, or
+        if child_only is set and there is no current span.
+        """
+        if self.exporter is None:
+            return None
+        parent = current_span.get()
+        if parent is None and child_only:
+            return None
+        if parent is not None:
+            return Span(
+                name,
+                parent.trace_id,
+                parent.span_id,
+                kind,
+                attributes,
+                parent.sampled,
+            )
+        if remote := parse_traceparent(traceparent):
+            trace_id, parent_id, sampled = remote
+            return Span(name, trace_id, parent_id, kind, attributes, sampled)
+        return Span(
+            name,
+            f"{random.getrandbits(128):032x}",
+            None,
+            kind,
+            attributes,
+            random.random() < self.sample_ratio,  # noqa: S311
+        )
+
+    def end_span(self, span: Optional[Span]) -> None:
+        if span is None:
+            return
+        span.end_ns = time.time_ns()
+        if span.sampled:
+            try:
+                self.exporter.export(span)
+            except Exception as ex:
+                logger.warning("Span export failed: %r", ex)
+
+    @contextlib.contextmanager
+    def span(
+        self,
+        name: str,
+        kind: str = "internal",
+        attributes: Optional[dict] = None,
+        traceparent: Optional[str] = None,
+    ) -> Iterator[Optional[Span]]:
+        """Run the block in a span that is the current span meanwhile"""
+        span = self.start_span(name, kind, attributes, traceparent)
+        if span is None:
+            yield None
+            return
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as ex:
+            span.error = repr(ex)
+            raise
+        finally:
+            current_span.reset(token)
+            self.end_span(span)
+
+    async def close(self) -> None:
+        if self.exporter is not None:
+            await self.exporter.close()
+
+
+def get_exporter(service_name: str) -> Optional[SpanExporter]:
+    """Exporter configured by TracingSettings, None if tracing is off"""
+    exporter = tracing_settings.TRACING_EXPORTER
+    if exporter == TracingExporterType.jsonl:
+        return JsonLinesExporter(tracing_settings.TRACING_FILE_PATH)
+    if exporter == TracingExporterType.otlp:
+        return OTLPExporter(
+            tracing_settings.TRACING_OTLP_ENDPOINT, service_name
+        )
+    return None
+
+
+tracer = Tracer(
+    get_exporter(app_settings.SERVICE_NAME),
+    tracing_settings.TRACING_SAMPLE_RATIO,
+)
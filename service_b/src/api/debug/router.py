@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Query, status
+
+from utilities.query_log import query_log
+
+router = APIRouter(prefix="/debug", include_in_schema=False)
+
+
+@router.get("/queries/")
+async def read_query_stats(limit: int = Query(default=20, ge=1)) -> dict:
+    """SQL statements of this worker process by total time"""
+    return {
+        "slow_threshold": query_log.slow_threshold,
+        "statements": query_log.top(limit),
+    }
+
+
+@router.delete("/queries/", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_query_stats() -> None:
+    query_log.reset()
@@ -0,0 +1,23 @@
+from typing import Sequence
+
+from fastapi import HTTPException, Query, status
+
+from constants.bulk import BULK_MAX_ITEMS
+
+
+def check_bulk_size(items: Sequence) -> None:
+    if not items:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Bulk operations require at least one item",
+        )
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Bulk operations accept at most {BULK_MAX_ITEMS} items",
+        )
+
+
+async def get_bulk_ids(ids: list[int] = Query()) -> list[int]:
+    check_bulk_size(ids)
+    return ids
@@ -0,0 +1,54 @@
+from typing import Any, Optional, Type
+
+from fastapi import Depends, HTTPException, Query, status
+from pydantic import BaseModel
+
+
+def FieldsDepends(schema: Type[BaseModel]) -> Any:  # noqa: N802
+    """Dependency for the `fields` query parameter: a comma separated
+    subset of schema fields to return. `id` is always returned.
+    """
+
+    async def get_fields(
+        fields: Optional[str] = Query(
+            default=None,
+            description="Comma separated fields to return, e.g. id,title",
+        ),
+    ) -> Optional[list[str]]:
+        if not fields:
+            return None
+        requested = {field.strip() for field in fields.split(",")} - {""}
+        if unknown := requested - set(schema.model_fields):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+        requested.add("id")
+        return [field for field in schema.model_fields if field in requested]
+
+    return Depends(get_fields)
+
+
+def ExpandDepends(*relations: str) -> Any:  # noqa: N802
+    """Dependency for the `expand` query parameter: a comma separated
+    list of relations to embed into the response.
+    """
+
+    async def get_expand(
+        expand: Optional[str] = Query(
+            default=None,
+            description=f"Relations to embed: {', '.join(relations)}",
+        ),
+    ) -> Optional[list[str]]:
+        if not expand:
+            return None
+        requested = {relation.strip() for relation in expand.split(",")}
+        requested -= {""}
+        if unknown := requested - set(relations):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unknown relations: {', '.join(sorted(unknown))}",
+            )
+        return [relation for relation in relations if relation in requested]
+
+    return Depends(get_expand)
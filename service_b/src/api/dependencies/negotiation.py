@@ -0,0 +1,28 @@
+from typing import Optional
+
+from fastapi import Header
+
+from constants.media_types import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPES,
+)
+from utilities.negotiation import parse_quality_values
+
+
+async def get_media_type(accept: Optional[str] = Header(default=None)) -> str:
+    """Media type of the response: MessagePack if the client prefers it
+    in Accept header, JSON otherwise.
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+    weights = parse_quality_values(accept)
+    msgpack = max(weights.get(media, 0) for media in MSGPACK_MEDIA_TYPES)
+    json = max(
+        weights.get(JSON_MEDIA_TYPE, 0),
+        weights.get("application/*", 0),
+        weights.get("*/*", 0),
+    )
+    if msgpack > 0 and msgpack >= json:
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
@@ -1,18 +1,34 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi_filter import FilterDepends
 
+from api.dependencies.bulk import check_bulk_size, get_bulk_ids
 from api.dependencies.database import get_async_db
+from api.dependencies.negotiation import get_media_type
+from api.dependencies.fields import FieldsDepends
+from constants.media_types import NDJSON_MEDIA_TYPE
 from crud.author import crud_author
+from schemas.bulk import BulkDeleteResponse
 from schemas.author import (
+    AuthorBulkResponse,
+    AuthorBulkUpdateDB,
     AuthorCreateDB,
     AuthorUpdateDB,
     AuthorResponse,
     AuthorPaginatedResponse,
 )
 from api.filters.author import AuthorFilter
+from utilities.caching import (
+    add_validators,
+    get_list_validators,
+    get_not_modified_response,
+    get_object_validators,
+)
+from utilities.ndjson import stream_ndjson
+from utilities.serialization import serialize_response
 
 
 router = APIRouter()
@@ -24,12 +40,81 @@ async def read_authors(
     skip: int = 0,
     limit: int = 20,
     filters: AuthorFilter = FilterDepends(AuthorFilter),
+    fields: Optional[list[str]] = FieldsDepends(AuthorResponse),
+    media_type: str = Depends(get_media_type),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    variant = (skip, limit, filters.model_dump(), fields, media_type)
+    if if_none_match:
+        list_version = await crud_author.get_list_version(
+            db=db, filters=filters
+        )
+        validators = get_list_validators(list_version, *variant)
+        if response := get_not_modified_response(if_none_match, validators):
+            return response
+    data = await crud_author.get_multi_with_total(
+        db=db, filters=filters, skip=skip, limit=limit, fields=fields
+    )
+    response = serialize_response(
+        data,
+        AuthorResponse,
+        fields,
+        paginated=True,
+        media_type=media_type,
+    )
+    if data["list_version"] is None:
+        return response
+    validators = get_list_validators(data["list_version"], *variant)
+    return add_validators(response, validators)
+
+
+@router.get(
+    "/stream/",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def stream_authors(
+    filters: AuthorFilter = FilterDepends(AuthorFilter),
 ):
-    return await crud_author.get_multi_with_total(
-        db=db, filters=filters, skip=skip, limit=limit
+    """All authors as NDJSON, one AuthorResponse per line."""
+    return StreamingResponse(
+        stream_ndjson(
+            crud=crud_author, schema=AuthorResponse, filters=filters
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
     )
 
 
+@router.post(
+    "/bulk/",
+    response_model=AuthorBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_authors_bulk(
+    create_data: list[AuthorCreateDB],
+    db: AsyncSession = Depends(get_async_db),
+):
+    check_bulk_size(create_data)
+    return await crud_author.create_bulk(db=db, create_schemas=create_data)
+
+
+@router.patch("/bulk/", response_model=AuthorBulkResponse)
+async def update_authors_bulk(
+    update_data: list[AuthorBulkUpdateDB],
+    db: AsyncSession = Depends(get_async_db),
+):
+    check_bulk_size(update_data)
+    return await crud_author.update_bulk(db=db, update_schemas=update_data)
+
+
+@router.delete("/bulk/", response_model=BulkDeleteResponse)
+async def delete_authors_bulk(
+    ids: list[int] = Depends(get_bulk_ids),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await crud_author.remove_bulk(db=db, obj_ids=ids)
+
+
 @router.get(
     "/{author_id}/",
     response_model=Optional[AuthorResponse],
@@ -37,9 +122,22 @@ async def read_authors(
 async def read_author(
     author_id: int,
     db: AsyncSession = Depends(get_async_db),
+    fields: Optional[list[str]] = FieldsDepends(AuthorResponse),
+    media_type: str = Depends(get_media_type),
+    if_none_match: Optional[str] = Header(default=None),
 ):
-    if found_book := await crud_author.get_by_id(db=db, obj_id=author_id):
-        return found_book
+    if found_book := await crud_author.get_by_id(
+        db=db, obj_id=author_id, fields=fields
+    ):
+        validators = get_object_validators(
+            found_book, None, fields, media_type
+        )
+        if response := get_not_modified_response(if_none_match, validators):
+            return response
+        response = serialize_response(
+            found_book, AuthorResponse, fields, media_type=media_type
+        )
+        return add_validators(response, validators)
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail=f"Author with id={author_id} not found",
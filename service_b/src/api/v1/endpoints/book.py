@@ -1,18 +1,44 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Request,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi_filter import FilterDepends
 
+from api.dependencies.bulk import check_bulk_size, get_bulk_ids
 from api.dependencies.database import get_async_db
+from api.dependencies.negotiation import get_media_type
+from api.dependencies.fields import ExpandDepends, FieldsDepends
+from constants.bulk import IMPORT_CONTENT_TYPES
+from constants.media_types import NDJSON_MEDIA_TYPE
 from crud.book import crud_book
+from schemas.bulk import BulkDeleteResponse, ImportResponse
 from schemas.book import (
+    BookBulkResponse,
+    BookBulkUpdateDB,
     BookCreateDB,
+    BookExpandedResponse,
     BookUpdateDB,
     BookResponse,
     BookPaginatedResponse,
 )
 from api.filters.book import BookFilter
+from utilities.caching import (
+    add_validators,
+    get_list_validators,
+    get_not_modified_response,
+    get_object_validators,
+)
+from utilities.importer import iter_validated_chunks
+from utilities.ndjson import stream_ndjson
+from utilities.serialization import serialize_response
 
 
 router = APIRouter()
@@ -24,10 +50,120 @@ async def read_books(
     skip: int = 0,
     limit: int = 20,
     filters: BookFilter = FilterDepends(BookFilter),
+    fields: Optional[list[str]] = FieldsDepends(BookResponse),
+    expand: Optional[list[str]] = ExpandDepends("author"),
+    media_type: str = Depends(get_media_type),
+    if_none_match: Optional[str] = Header(default=None),
 ):
-    return await crud_book.get_multi_with_total(
-        db=db, filters=filters, skip=skip, limit=limit
+    variant = (skip, limit, filters.model_dump(), fields, expand, media_type)
+    if if_none_match:
+        list_version = await crud_book.get_list_version(
+            db=db, filters=filters, expand=expand
+        )
+        validators = get_list_validators(list_version, *variant)
+        if response := get_not_modified_response(if_none_match, validators):
+            return response
+    data = await crud_book.get_multi_with_total(
+        db=db,
+        filters=filters,
+        skip=skip,
+        limit=limit,
+        fields=fields,
+        expand=expand,
     )
+    schema = BookExpandedResponse if expand else BookResponse
+    if fields and expand:
+        fields = [*fields, *expand]
+    response = serialize_response(
+        data, schema, fields, paginated=True, media_type=media_type
+    )
+    if data["list_version"] is None:
+        return response
+    validators = get_list_validators(data["list_version"], *variant)
+    return add_validators(response, validators)
+
+
+@router.get(
+    "/stream/",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def stream_books(
+    filters: BookFilter = FilterDepends(BookFilter),
+):
+    """All books as NDJSON, one BookResponse per line."""
+    return StreamingResponse(
+        stream_ndjson(crud=crud_book, schema=BookResponse, filters=filters),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+@router.post(
+    "/bulk/",
+    response_model=BookBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_books_bulk(
+    create_data: list[BookCreateDB],
+    db: AsyncSession = Depends(get_async_db),
+):
+    check_bulk_size(create_data)
+    return await crud_book.create_bulk(db=db, create_schemas=create_data)
+
+
+@router.patch("/bulk/", response_model=BookBulkResponse)
+async def update_books_bulk(
+    update_data: list[BookBulkUpdateDB],
+    db: AsyncSession = Depends(get_async_db),
+):
+    check_bulk_size(update_data)
+    return await crud_book.update_bulk(db=db, update_schemas=update_data)
+
+
+@router.delete("/bulk/", response_model=BulkDeleteResponse)
+async def delete_books_bulk(
+    ids: list[int] = Depends(get_bulk_ids),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await crud_book.remove_bulk(db=db, obj_ids=ids)
+
+
+@router.post(
+    "/import/",
+    response_model=ImportResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                content_type: {"schema": {"type": "string"}}
+                for content_type in IMPORT_CONTENT_TYPES
+            },
+        }
+    },
+)
+async def import_books(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Stream CSV (with a header line) or NDJSON rows of BookCreateDB
+    into the book table using COPY.
+    """
+    content_type = request.headers.get("content-type", "")
+    import_format = IMPORT_CONTENT_TYPES.get(content_type.split(";")[0])
+    if not import_format:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Supported content types: "
+            + ", ".join(IMPORT_CONTENT_TYPES),
+        )
+    columns = list(BookCreateDB.model_fields)
+    chunks = iter_validated_chunks(
+        stream=request.stream(),
+        import_format=import_format,
+        schema=BookCreateDB,
+        columns=columns,
+    )
+    return await crud_book.import_chunks(db=db, chunks=chunks, columns=columns)
 
 
 @router.get(
@@ -37,9 +173,26 @@ async def read_books(
 async def read_book(
     book_id: int,
     db: AsyncSession = Depends(get_async_db),
+    fields: Optional[list[str]] = FieldsDepends(BookResponse),
+    expand: Optional[list[str]] = ExpandDepends("author"),
+    media_type: str = Depends(get_media_type),
+    if_none_match: Optional[str] = Header(default=None),
 ):
-    if found_book := await crud_book.get_by_id(db=db, obj_id=book_id):
-        return found_book
+    if found_book := await crud_book.get_by_id(
+        db=db, obj_id=book_id, fields=fields, expand=expand
+    ):
+        validators = get_object_validators(
+            found_book, expand, fields, media_type
+        )
+        if response := get_not_modified_response(if_none_match, validators):
+            return response
+        schema = BookExpandedResponse if expand else BookResponse
+        if fields and expand:
+            fields = [*fields, *expand]
+        response = serialize_response(
+            found_book, schema, fields, media_type=media_type
+        )
+        return add_validators(response, validators)
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail=f"Book with id={book_id} not found",
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.dependencies.database import get_async_db
+from configs.config import app_settings
+from constants.changes import CHANGES_DEFAULT_LIMIT, CHANGES_MAX_LIMIT
+from crud.changes import crud_changes
+from schemas.author import AuthorResponse
+from schemas.book import BookResponse
+from schemas.changes import ChangesResponse
+from utilities.serialization import build_row, get_row_plan
+
+router = APIRouter()
+
+CHANGE_SCHEMAS = {"author": AuthorResponse, "book": BookResponse}
+
+
+@router.get("/", response_model=ChangesResponse)
+async def read_changes(
+    since: int = Query(default=0, ge=0),
+    limit: int = Query(
+        default=CHANGES_DEFAULT_LIMIT, gt=0, le=CHANGES_MAX_LIMIT
+    ),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Upserts and tombstones of books and authors after since, in seq
+    order. Pass next_since of the response as since of the next request
+    until has_more is false.
+    """
+    data = await crud_changes.get_changes(db=db, since=since, limit=limit)
+    changes = []
+    for change in data["changes"]:
+        obj = change.pop("object")
+        if obj is not None:
+            schema = CHANGE_SCHEMAS[change["entity"]]
+            plan = get_row_plan(schema, tuple(schema.model_fields))
+            change["data"] = build_row(obj, plan)
+        changes.append(change)
+    content = {
+        "changes": changes,
+        "next_since": changes[-1]["seq"] if changes else since,
+        "has_more": data["has_more"],
+    }
+    if app_settings.SKIP_RESPONSE_VALIDATION:
+        return ORJSONResponse(content)
+    return content
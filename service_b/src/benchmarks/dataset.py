@@ -0,0 +1,169 @@
+"""Fill service B's database with generated authors and books for the
+benchmarks.queries runner. Rows are written with COPY in batches; the
+same --seed gives the same data.
+
+Run from service_b/src against a local, migrated database:
+python -m benchmarks.dataset --authors 1000000 --books 10000000 --truncate
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Iterator
+
+from sqlalchemy import text
+
+from constants.book import BookGenre
+from databases.database import async_engine
+
+FIRST_NAMES = (
+    "Anna Boris Clara Dmitry Elena Fyodor Galina Ivan Katya Leo Maria "
+    "Nikolai Olga Pavel Sofia Yuri"
+).split()
+LAST_NAMES = (
+    "Akhmatova Bulgakov Chekhov Dostoevsky Gogol Gorky Nabokov Pasternak "
+    "Pushkin Tolstoy Turgenev Tsvetaeva"
+).split()
+TITLE_WORDS = (
+    "night day river house winter garden letter war peace road city "
+    "summer stranger mirror island silence storm secret last first"
+).split()
+
+
+def get_genre_weights(skew: float) -> list[float]:
+    """Zipf weights of BookGenre members: the first genre is the most
+    frequent, skew=0 makes all equally frequent.
+    """
+    return [1 / (rank**skew) for rank in range(1, len(BookGenre) + 1)]
+
+
+def generate_authors(
+    rng: random.Random, start: int, count: int
+) -> Iterator[tuple]:
+    for author_id in range(start, start + count):
+        yield (
+            author_id,
+            rng.choice(FIRST_NAMES),
+            f"{rng.choice(LAST_NAMES)} {author_id}",
+        )
+
+
+def generate_books(
+    rng: random.Random,
+    start: int,
+    count: int,
+    authors: int,
+    genre_weights: list[float],
+    author_skew: float,
+) -> Iterator[tuple]:
+    """Books of authors drawn with a power law, so a few authors have
+    many books like in real catalogues, and genres drawn with
+    genre_weights. A third of books have an extra genre.
+    """
+    genres = [genre.value for genre in BookGenre]
+    picked = rng.choices(genres, genre_weights, k=count)
+    for offset, book_id in enumerate(range(start, start + count)):
+        title = " ".join(rng.choices(TITLE_WORDS, k=rng.randint(1, 4)))
+        yield (
+            book_id,
+            f"{title.capitalize()} {book_id}",
+            picked[offset],
+            rng.choice(genres) if rng.random() < 1 / 3 else None,
+            int(authors * rng.random() ** author_skew) + 1,
+        )
+
+
+async def copy_rows(
+    table: str, columns: tuple[str, ...], rows: Iterator[tuple]
+) -> None:
+    async with async_engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table, records=rows, columns=columns
+        )
+        await conn.commit()
+
+
+async def load(
+    table: str,
+    columns: tuple[str, ...],
+    total: int,
+    batch_size: int,
+    make_rows,  # noqa: ANN001
+) -> None:
+    started = time.perf_counter()
+    for start in range(1, total + 1, batch_size):
+        count = min(batch_size, total - start + 1)
+        await copy_rows(table, columns, list(make_rows(start, count)))
+        done = start + count - 1
+        rate = done / (time.perf_counter() - started)
+        print(f"{table}: {done:,}/{total:,} rows, {rate:,.0f} rows/s")  # noqa: T201
+
+
+async def run(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)  # noqa: S311
+    genre_weights = get_genre_weights(args.genre_skew)
+    if args.truncate:
+        async with async_engine.begin() as conn:
+            await conn.execute(text("TRUNCATE book, author, tombstone"))
+    await load(
+        "author",
+        ("id", "first_name", "last_name"),
+        args.authors,
+        args.batch_size,
+        lambda start, count: generate_authors(rng, start, count),
+    )
+    await load(
+        "book",
+        ("id", "title", "genre", "extra_genre", "author_id"),
+        args.books,
+        args.batch_size,
+        lambda start, count: generate_books(
+            rng, start, count, args.authors, genre_weights, args.author_skew
+        ),
+    )
+    async with async_engine.begin() as conn:
+        # ids were given explicitly, later inserts continue after them
+        for table in ("author", "book"):
+            await conn.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "  # noqa: S608
+                    f"(SELECT coalesce(max(id), 1) FROM {table}))"
+                )
+            )
+    async with async_engine.connect() as conn:
+        autocommit = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await autocommit.execute(text("VACUUM ANALYZE author, book"))
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--authors", type=int, default=100_000)
+    parser.add_argument("--books", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--genre-skew",
+        type=float,
+        default=1.5,
+        help="Zipf exponent of genre frequencies, 0 for uniform",
+    )
+    parser.add_argument(
+        "--author-skew",
+        type=float,
+        default=3.0,
+        help="power law exponent of books per author, 1 for uniform",
+    )
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="delete all books, authors and tombstones first",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Compare throughput of service B's read queries on direct connections
+and through PgBouncer in transaction pooling mode (DB_PGBOUNCER).
+
+Targets:
+- direct: POSTGRES_HOST with the prepared statement cache
+- direct_uncached: POSTGRES_HOST with the DB_PGBOUNCER options, the
+  cost of preparing every statement again
+- pgbouncer: --pgbouncer-host with the DB_PGBOUNCER options
+- pgbouncer_cached: --pgbouncer-host with the prepared statement cache,
+  to show the errors DB_PGBOUNCER avoids (not run by default)
+
+Start a local PgBouncer next to the database with
+docker compose -f docker/docker-compose-service-a.yml \\
+    -f docker/docker-compose-pgbouncer.yml up
+and run from service_b/src, with a dataset from benchmarks.dataset:
+python -m benchmarks.pgbouncer --concurrency 200 --output pgbouncer.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import time
+from collections import Counter
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from api.filters.book import BookFilter
+from benchmarks.queries import get_table_sizes
+from crud.book import crud_book
+from databases.database import (
+    SQLALCHEMY_DATABASE_URL,
+    async_engine,
+    get_connect_args,
+)
+
+PAGE_SIZE = 50
+PERCENTILES = (50, 90, 99)
+
+TARGETS = {
+    # name: (through PgBouncer, DB_PGBOUNCER options)
+    "direct": (False, False),
+    "direct_uncached": (False, True),
+    "pgbouncer": (True, True),
+    "pgbouncer_cached": (True, False),
+}
+
+
+def make_engine(target: str, args: argparse.Namespace) -> AsyncEngine:
+    through_pgbouncer, pgbouncer_options = TARGETS[target]
+    url = make_url(SQLALCHEMY_DATABASE_URL)
+    pool_size = args.direct_pool_size
+    if through_pgbouncer:
+        url = url.set(host=args.pgbouncer_host, port=args.pgbouncer_port)
+        # PgBouncer multiplexes many client connections onto its pool
+        pool_size = args.concurrency
+    return create_async_engine(
+        url,
+        pool_size=pool_size,
+        max_overflow=0,
+        connect_args=get_connect_args(pgbouncer_options),
+    )
+
+
+async def request(db: AsyncSession, rng: random.Random, books: int) -> Any:
+    """A detail or a list page read, like admin pages cause"""
+    if rng.random() < 0.5:  # noqa: PLR2004
+        return await crud_book.get_by_id(
+            db, obj_id=rng.randint(1, max(books, 1)), expand=["author"]
+        )
+    return await crud_book.get_multi_with_total(
+        db,
+        skip=rng.randint(0, 1000) * PAGE_SIZE,
+        limit=PAGE_SIZE,
+        filters=BookFilter(order_by=["id"]),
+    )
+
+
+async def run_target(
+    target: str, args: argparse.Namespace, books: int
+) -> dict:
+    """args.concurrency workers send requests, each in a new session,
+    for args.duration seconds after args.warmup seconds.
+    """
+    engine = make_engine(target, args)
+    session = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    latencies: list[float] = []
+    errors: Counter[str] = Counter()
+    record = False
+
+    async def worker(rng: random.Random, deadline: float) -> None:
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                async with session() as db:
+                    await request(db, rng, books)
+            except Exception as ex:
+                if record:
+                    errors[type(ex).__name__] += 1
+                continue
+            if record:
+                latencies.append(time.perf_counter() - start)
+
+    rng = random.Random(args.seed)  # noqa: S311
+    rngs = [random.Random(rng.random()) for _ in range(args.concurrency)]  # noqa: S311
+    deadline = time.monotonic() + args.warmup
+    await asyncio.gather(*(worker(r, deadline) for r in rngs))
+    record = True
+    started = time.monotonic()
+    deadline = started + args.duration
+    await asyncio.gather(*(worker(r, deadline) for r in rngs))
+    elapsed = time.monotonic() - started
+    await engine.dispose()
+
+    result: dict[str, Any] = {
+        "requests": len(latencies),
+        "throughput": len(latencies) / elapsed,
+        "errors": dict(errors),
+    }
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        for p in PERCENTILES:
+            result[f"p{p}_ms"] = cuts[p - 1] * 1000
+    return result
+
+
+async def run(args: argparse.Namespace) -> dict:
+    books, _ = await get_table_sizes()
+    await async_engine.dispose()
+    results = {}
+    for target in args.targets:
+        results[target] = await run_target(target, args, books)
+        print_result(target, results[target])
+    return results
+
+
+def print_result(target: str, result: dict) -> None:
+    latencies = "".join(
+        f"{result.get(f'p{p}_ms', 0.0):>10.2f}" for p in PERCENTILES
+    )
+    errors = sum(result["errors"].values())
+    print(  # noqa: T201
+        f"{target:<18}{result['throughput']:>10.1f}{latencies}{errors:>8}"
+    )
+    for name, count in result["errors"].items():
+        print(f"{'':<18}{name}: {count}")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--targets",
+        type=lambda value: value.split(","),
+        default=["direct", "direct_uncached", "pgbouncer"],
+        help="comma separated, of " + ", ".join(TARGETS),
+    )
+    parser.add_argument("--pgbouncer-host", default="127.0.0.1")
+    parser.add_argument("--pgbouncer-port", type=int, default=6432)
+    parser.add_argument(
+        "--direct-pool-size",
+        type=int,
+        default=20,
+        help="connections of direct targets, like PgBouncer's pool size",
+    )
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON file to save results to")
+    args = parser.parse_args()
+    unknown = set(args.targets) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+
+    # pgbouncer_cached fails on purpose
+    logging.disable(logging.WARNING)
+    print(  # noqa: T201
+        f"{'target':<18}{'req/s':>10}{'p50 ms':>10}{'p90 ms':>10}"
+        f"{'p99 ms':>10}{'errors':>8}"
+    )
+    results = asyncio.run(run(args))
+    if args.output:
+        report = {
+            "created_at": datetime.now(UTC).isoformat(),
+            "options": {
+                key: value
+                for key, value in vars(args).items()
+                if key != "output"
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Measure latency of service B's CRUD queries on a large dataset (see
+benchmarks.dataset) and capture EXPLAIN ANALYZE of every statement
+they run.
+
+Run from service_b/src against a local database:
+python -m benchmarks.queries --iterations 50 --output queries.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import random
+import statistics
+import time
+from datetime import UTC, datetime
+from typing import Any, Awaitable, Callable, Iterator
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.filters.book import BookFilter
+from constants.book import BookGenre
+from crud.book import crud_book
+from databases.database import async_engine, async_session
+from models import Book
+from schemas.book import BookCreateDB
+
+PAGE_SIZE = 50
+PERCENTILES = (50, 75, 90, 95, 99)
+
+
+class Context:
+    """State shared by scenarios of a run"""
+
+    def __init__(self, rng: random.Random, books: int, authors: int) -> None:
+        self.rng = rng
+        self.books = books
+        self.authors = authors
+        self.created_ids: list[int] = []
+
+    def book_id(self) -> int:
+        return self.rng.randint(1, max(self.books, 1))
+
+
+Scenario = Callable[[AsyncSession, Context], Awaitable[Any]]
+
+
+def list_page(offset: int, order_by: str) -> Scenario:
+    async def scenario(db: AsyncSession, ctx: Context) -> Any:
+        return await crud_book.get_multi_with_total(
+            db,
+            skip=offset,
+            limit=PAGE_SIZE,
+            filters=BookFilter(order_by=[order_by]),
+        )
+
+    return scenario
+
+
+async def count(db: AsyncSession, ctx: Context) -> Any:
+    """List validators: count and max(version) of all books"""
+    return await crud_book.get_list_version(
+        db, filters=BookFilter(order_by=["id"]), expand=["author"]
+    )
+
+
+async def detail(db: AsyncSession, ctx: Context) -> Any:
+    return await crud_book.get_by_id(
+        db, obj_id=ctx.book_id(), expand=["author"]
+    )
+
+
+async def create(db: AsyncSession, ctx: Context) -> Any:
+    genres = list(BookGenre)
+    obj = await crud_book.create(
+        db,
+        create_schema=BookCreateDB(
+            title=f"Benchmark {ctx.rng.random()}",
+            genre=ctx.rng.choice(genres),
+            author_id=ctx.rng.randint(1, max(ctx.authors, 1)),
+        ),
+    )
+    ctx.created_ids.append(obj.id)
+    return obj
+
+
+async def update(db: AsyncSession, ctx: Context) -> Any:
+    return await crud_book.update(
+        db,
+        db_obj=Book(id=ctx.book_id()),
+        update_data={"title": f"Updated {ctx.rng.random()}"},
+    )
+
+
+async def delete(db: AsyncSession, ctx: Context) -> Any:
+    """Deletes books made by create, if it ran before"""
+    if ctx.created_ids:
+        return await crud_book.remove(db, obj_id=ctx.created_ids.pop())
+    return None
+
+
+def get_scenarios(offsets: list[int]) -> dict[str, Scenario]:
+    scenarios = {
+        f"list_offset_{offset}": list_page(offset, "id") for offset in offsets
+    }
+    scenarios["list_by_title"] = list_page(0, "title")
+    scenarios["list_by_title_desc_deep"] = list_page(offsets[-1], "-title")
+    scenarios["count"] = count
+    scenarios["detail"] = detail
+    scenarios["create"] = create
+    scenarios["update"] = update
+    scenarios["delete"] = delete
+    return scenarios
+
+
+@contextlib.contextmanager
+def capture_statements() -> Iterator[list[tuple[str, Any]]]:
+    """Statements and parameters sent to the database meanwhile"""
+    statements = []
+
+    def before_cursor_execute(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        if not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(
+        async_engine.sync_engine,
+        "before_cursor_execute",
+        before_cursor_execute,
+    )
+    try:
+        yield statements
+    finally:
+        event.remove(
+            async_engine.sync_engine,
+            "before_cursor_execute",
+            before_cursor_execute,
+        )
+
+
+async def explain(statement: str, parameters: Any) -> str:
+    """EXPLAIN ANALYZE output of statement. It runs in a transaction
+    that is rolled back, so writes are undone.
+    """
+    async with async_engine.connect() as conn:
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (ANALYZE, BUFFERS) {statement}",
+            tuple(parameters) if isinstance(parameters, list) else parameters,
+        )
+        plan = "\n".join(row[0] for row in result)
+        await conn.rollback()
+    return plan
+
+
+def get_distribution(latencies: list[float]) -> dict:
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "iterations": len(latencies),
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "min_ms": min(latencies) * 1000,
+        **{f"p{p}_ms": cuts[p - 1] * 1000 for p in PERCENTILES},
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+async def run_scenario(
+    scenario: Scenario, ctx: Context, args: argparse.Namespace
+) -> dict:
+    """Time args.iterations runs, each in a new session like a request,
+    after args.warmup runs. Then run it once more to capture statements.
+    """
+    latencies = []
+    for iteration in range(args.warmup + args.iterations):
+        async with async_session() as db:
+            start = time.perf_counter()
+            await scenario(db, ctx)
+            if iteration >= args.warmup:
+                latencies.append(time.perf_counter() - start)
+    with capture_statements() as statements:
+        async with async_session() as db:
+            await scenario(db, ctx)
+    result = get_distribution(latencies)
+    result["explain"] = [
+        {"statement": statement, "plan": await explain(statement, params)}
+        for statement, params in statements
+    ]
+    return result
+
+
+async def get_table_sizes() -> tuple[int, int]:
+    """Estimated rows of book and author, as of the last ANALYZE"""
+    async with async_engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT relname, greatest(reltuples, 0)::bigint "
+                "FROM pg_class WHERE relname IN ('book', 'author')"
+            )
+        )
+        sizes = dict(result.all())
+    return sizes.get("book", 0), sizes.get("author", 0)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    books, authors = await get_table_sizes()
+    offsets = [offset for offset in args.offsets if offset < books] or [0]
+    scenarios = get_scenarios(offsets)
+    ctx = Context(random.Random(args.seed), books, authors)  # noqa: S311
+    results = {}
+    for name, scenario in scenarios.items():
+        if args.scenarios and name not in args.scenarios:
+            continue
+        results[name] = await run_scenario(scenario, ctx, args)
+        print_result(name, results[name], args.plans)
+    # Books made by create and not deleted
+    if ctx.created_ids:
+        async with async_session() as db:
+            await crud_book.remove_bulk(db, obj_ids=ctx.created_ids)
+    await async_engine.dispose()
+    return {"books": books, "authors": authors, "results": results}
+
+
+def print_result(name: str, result: dict, plans: bool) -> None:
+    print(  # noqa: T201
+        f"{name:<28}{result['mean_ms']:>10.2f}{result['p50_ms']:>10.2f}"
+        f"{result['p99_ms']:>10.2f}{result['max_ms']:>10.2f}"
+    )
+    if plans:
+        for item in result["explain"]:
+            print(f"\n{item['statement']}\n{item['plan']}\n")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--offsets",
+        type=lambda value: sorted(int(offset) for offset in value.split(",")),
+        default=[0, 10_000, 100_000, 1_000_000],
+        help="comma separated offsets of list_offset_* scenarios",
+    )
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: value.split(","),
+        help="comma separated names, all if not set",
+    )
+    parser.add_argument(
+        "--plans", action="store_true", help="print EXPLAIN ANALYZE output"
+    )
+    parser.add_argument("--output", help="JSON file to save results to")
+    args = parser.parse_args()
+
+    # Deep offsets are slow on purpose
+    logging.disable(logging.WARNING)
+    print(  # noqa: T201
+        f"{'scenario':<28}{'mean ms':>10}{'p50 ms':>10}"
+        f"{'p99 ms':>10}{'max ms':>10}"
+    )
+    report = asyncio.run(run(args))
+    if args.output:
+        report = {
+            "created_at": datetime.now(UTC).isoformat(),
+            "options": {
+                key: value
+                for key, value in vars(args).items()
+                if key not in ("output", "plans")
+            },
+            **report,
+        }
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
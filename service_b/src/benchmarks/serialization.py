@@ -0,0 +1,107 @@
+"""Compare rows/second of response serialization paths for a book page.
+
+Run from service_b/src: python -m benchmarks.serialization --rows 1000
+"""
+
+import argparse
+import json
+import time
+from typing import Callable
+
+from pydantic import TypeAdapter
+
+from constants.book import BookGenre
+from models import Author, Book
+from schemas.book import (
+    BookExpandedResponse,
+    BookPaginatedResponse,
+    BookResponse,
+)
+from utilities.serialization import serialize_response
+
+
+def make_page(rows: int) -> dict:
+    genres = list(BookGenre)
+    authors = [
+        Author(id=i, first_name=f"First {i}", last_name=f"Last {i}")
+        for i in range(1, 51)
+    ]
+    objects = []
+    for i in range(1, rows + 1):
+        book = Book(
+            id=i,
+            title=f"Book title {i}",
+            genre=genres[i % len(genres)],
+            extra_genre=genres[(i + 1) % len(genres)] if i % 3 else None,
+            author_id=authors[i % len(authors)].id,
+        )
+        book.author = authors[i % len(authors)]
+        objects.append(book)
+    return {"objects": objects, "total_count": rows}
+
+
+def fastapi_default(page: dict) -> bytes:
+    """What FastAPI does for response_model: validate, dump to python
+    in json mode and encode with the stdlib encoder.
+    """
+    adapter = TypeAdapter(BookPaginatedResponse)
+    value = adapter.validate_python(page)
+    content = adapter.dump_python(value, mode="json")
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def validated(page: dict) -> bytes:
+    return serialize_response(
+        page, BookResponse, paginated=True, validate=True
+    ).body
+
+
+def trusted(page: dict) -> bytes:
+    return serialize_response(
+        page, BookResponse, paginated=True, validate=False
+    ).body
+
+
+def trusted_expanded(page: dict) -> bytes:
+    return serialize_response(
+        page, BookExpandedResponse, paginated=True, validate=False
+    ).body
+
+
+def measure(func: Callable[[dict], bytes], page: dict, seconds: float) -> dict:
+    func(page)
+    calls = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < seconds:
+        func(page)
+        calls += 1
+        elapsed = time.perf_counter() - started
+    rows = calls * len(page["objects"])
+    return {"calls": calls, "rows_per_second": round(rows / elapsed)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    page = make_page(args.rows)
+    results = {
+        func.__name__: measure(func, page, args.seconds)
+        for func in (fastapi_default, validated, trusted, trusted_expanded)
+    }
+    baseline = results["fastapi_default"]["rows_per_second"]
+    for name, result in results.items():
+        speedup = result["rows_per_second"] / baseline
+        print(  # noqa: T201
+            f"{name:<18} {result['rows_per_second']:>12,} rows/s "
+            f"x{speedup:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
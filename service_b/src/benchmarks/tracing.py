@@ -0,0 +1,109 @@
+"""Compare per-request overhead of TracingMiddleware: disabled, with a
+no-op exporter and with the JSON lines exporter, for a request running
+--queries SQL statements (simulated db.query spans).
+
+Run from service_b/src: python -m benchmarks.tracing --queries 5
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Optional
+
+from starlette.types import Receive, Scope, Send
+
+from middlewares.tracing import TracingMiddleware
+from utilities.tracing import JsonLinesExporter, Span, Tracer
+
+TRACEPARENT = b"00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+class NullExporter:
+    def export(self, span: Span) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+def make_app(tracer: Tracer, queries: int):  # noqa: ANN201
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        for _ in range(queries):
+            span = tracer.start_span(
+                "db.query",
+                kind="client",
+                attributes={"db.system": "postgresql"},
+                child_only=True,
+            )
+            tracer.end_span(span)
+        await send({"type": "http.response.start", "status": 200})
+        await send({"type": "http.response.body", "body": b""})
+
+    return app
+
+
+def make_scope() -> Scope:
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/books/1",
+        "headers": [(b"traceparent", TRACEPARENT)],
+    }
+
+
+async def receive() -> dict:
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message: dict) -> None:
+    pass
+
+
+async def run(app, requests: int) -> float:  # noqa: ANN001
+    """Average seconds per request"""
+    await app(make_scope(), receive, send)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(make_scope(), receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=5)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    tracers: dict[str, Optional[Tracer]] = {
+        "no middleware": None,
+        "tracing off": Tracer(None),
+        "null exporter": Tracer(NullExporter()),
+        "jsonl exporter": Tracer(JsonLinesExporter(path)),
+    }
+    print(f"{'setup':<18}{'us/request':>12}{'overhead us':>14}")  # noqa: T201
+    baseline = None
+    try:
+        for name, tracer in tracers.items():
+            if tracer is None:
+                app = make_app(Tracer(None), args.queries)
+            else:
+                app = TracingMiddleware(
+                    make_app(tracer, args.queries), tracer=tracer
+                )
+            seconds = asyncio.run(run(app, args.requests)) * 1e6
+            if baseline is None:
+                baseline = seconds
+            print(  # noqa: T201
+                f"{name:<18}{seconds:>12.2f}{seconds - baseline:>14.2f}"
+            )
+    finally:
+        asyncio.run(tracers["jsonl exporter"].close())
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
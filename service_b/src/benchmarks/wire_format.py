@@ -0,0 +1,105 @@
+"""Compare size and client-side decode time of a book page in JSON and
+MessagePack, uncompressed, gzip and brotli.
+
+Run from service_b/src: python -m benchmarks.wire_format --rows 1000
+"""
+
+import argparse
+import gzip
+import json
+import time
+from typing import Callable
+
+import brotli
+import msgpack
+
+from benchmarks.serialization import make_page
+from constants.media_types import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE
+from middlewares.compression import (
+    BrotliCompressor,
+    Compressor,
+    GZipCompressor,
+)
+from schemas.book import BookResponse
+from utilities.serialization import serialize_response
+
+DECODERS = {
+    JSON_MEDIA_TYPE: json.loads,  # what httpx.Response.json() uses
+    MSGPACK_MEDIA_TYPE: msgpack.unpackb,
+}
+ENCODINGS = {
+    "identity": (lambda body: body, lambda body: body),
+    "gzip": (
+        lambda body: _compress(GZipCompressor(6), body),
+        gzip.decompress,
+    ),
+    "br": (
+        lambda body: _compress(BrotliCompressor(4), body),
+        brotli.decompress,
+    ),
+}
+
+
+def _compress(compressor: Compressor, body: bytes) -> bytes:
+    return compressor.compress(body) + compressor.finish()
+
+
+def timeit(func: Callable[[], object], seconds: float) -> float:
+    """Average seconds per call"""
+    func()
+    calls = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < seconds:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - started
+    return elapsed / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    page = make_page(args.rows)
+    print(  # noqa: T201
+        f"{'format':<22}{'encoding':<10}{'bytes':>10}"
+        f"{'server ms':>12}{'client ms':>12}"
+    )
+    for media_type, decode in DECODERS.items():
+        for encoding, (compress, decompress) in ENCODINGS.items():
+
+            def encode(
+                media_type: str = media_type,
+                compress: Callable = compress,
+            ) -> bytes:
+                response = serialize_response(
+                    page,
+                    BookResponse,
+                    paginated=True,
+                    validate=False,
+                    media_type=media_type,
+                )
+                return compress(response.body)
+
+            body = encode()
+
+            def parse(
+                body: bytes = body,
+                decompress: Callable = decompress,
+                decode: Callable = decode,
+            ) -> object:
+                return decode(decompress(body))
+
+            server = timeit(encode, args.seconds) * 1000
+            client = timeit(parse, args.seconds) * 1000
+            print(  # noqa: T201
+                f"{media_type:<22}{encoding:<10}{len(body):>10,}"
+                f"{server:>12.2f}{client:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
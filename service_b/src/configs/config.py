@@ -1,5 +1,7 @@
 from pathlib import Path
 
+from constants.server import ServerMode
+
 from .base import BaseSetting
 
 BASE_DIR = Path(__file__).parent.parent
@@ -18,6 +20,9 @@ class AppSettings(BaseSetting):
     EXTERNAL_SERVICE_PORT: int
     SENTRY_DSN: str = ""
     APP_RELEASE: str = ""
+    SKIP_RESPONSE_VALIDATION: bool = True
+    """Serialize ORM objects from our own queries without validating
+    them against response schemas"""
 
     @property
     def full_url(self) -> str:
@@ -41,6 +46,93 @@ class DBSettings(BaseSetting):
     POSTGRES_DB: str
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
+    SLOW_QUERY_THRESHOLD: float = 0.2
+    """Seconds, slower statements are logged with a warning"""
+    QUERY_LOG_SAMPLE_RATIO: float = 0.0
+    """Share of the other statements logged with info"""
+    QUERY_STATS_MAX_STATEMENTS: int = 500
+    DB_CONNECTION_BUDGET: int = 120
+    """Connections all server workers may open together, split evenly
+    into their pools"""
+    DB_POOL_OVERFLOW_SHARE: float = 0.2
+    """Share of a worker's connections opened only under load, over
+    pool_size"""
+    DB_POOL_TIMEOUT: float = 30.0
+    """Seconds to wait for a free connection when all are in use"""
+    DB_POOL_RECYCLE: int = -1
+    """Seconds after which connections are reopened, never if -1"""
+    DB_POOL_PRE_PING: bool = False
+    """Check connections with a round trip before each checkout"""
+    DB_ECHO: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    """Prepared statements asyncpg keeps per connection"""
+    DB_QUERY_CACHE_SIZE: int = 500
+    """Compiled SQL statements SQLAlchemy keeps per engine"""
+    DB_PGBOUNCER: bool = False
+    """POSTGRES_HOST is PgBouncer in transaction pooling mode: prepared
+    statements are not cached and get unique names"""
+
+    def get_pool_limits(self, workers: int) -> tuple[int, int]:
+        """pool_size and max_overflow of each of workers processes, so
+        that all of them together stay within DB_CONNECTION_BUDGET.
+        """
+        connections = max(self.DB_CONNECTION_BUDGET // max(workers, 1), 1)
+        max_overflow = int(connections * self.DB_POOL_OVERFLOW_SHARE)
+        return max(connections - max_overflow, 1), max_overflow
+
+
+class ServerSettings(BaseSetting):
+    SERVER_MODE: str = ServerMode.development
+    """development (one process reloading on changes) or production"""
+    SERVER_WORKERS: int = 1
+    """Worker processes in production mode"""
+    SERVER_LOOP: str = "uvloop"
+    SERVER_HTTP: str = "httptools"
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEP_ALIVE: int = 5
+    """Seconds to keep idle connections open"""
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    """Seconds to finish in-flight requests on shutdown"""
+    SERVER_ACCESS_LOG: bool = True
+
+    @property
+    def worker_count(self) -> int:
+        """Processes serving the app, each with its own pools"""
+        mode = ServerMode(self.SERVER_MODE)
+        return self.SERVER_WORKERS if mode == ServerMode.production else 1
+
+
+class WebhookSettings(BaseSetting):
+    WEBHOOK_URLS: list[str] = []  # noqa: RUF012
+    """URLs that receive change events, as a JSON list"""
+    WEBHOOK_SECRET: str = ""
+    """Key of HMAC-SHA256 signature of event batches"""
+    WEBHOOK_BATCH_SIZE: int = 100
+    WEBHOOK_FLUSH_INTERVAL: float = 0.5
+    WEBHOOK_MAX_RETRIES: int = 5
+    WEBHOOK_RETRY_BACKOFF: float = 0.5
+    WEBHOOK_TIMEOUT: float = 5.0
+
+
+class TracingSettings(BaseSetting):
+    TRACING_EXPORTER: str = "off"
+    """off, jsonl (TRACING_FILE_PATH) or otlp (OTLP/HTTP collector)"""
+    TRACING_FILE_PATH: str = "/tmp/service_b_spans.jsonl"  # noqa: S108
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318"
+    TRACING_SAMPLE_RATIO: float = 1.0
+    """Share of traces started here that are exported, traces started
+    by callers follow their sampled flag"""
+
+
+class ProfilerSettings(BaseSetting):
+    PROFILER_ENABLED: bool = False
+    """Add the profiler route and middleware, nothing runs if unset"""
+    PROFILER_TOKEN: str = ""
+    """Bearer token of /debug/profile/ and value of the X-Profile header,
+    profiling is refused if empty"""
+    PROFILER_INTERVAL: float = 0.005
+    """Seconds between stack samples"""
+    PROFILER_MAX_SECONDS: float = 60.0
 
 
 class MailSettings(BaseSetting):
@@ -57,4 +149,8 @@ class MailSettings(BaseSetting):
 
 app_settings = AppSettings()
 db_settings = DBSettings()
+server_settings = ServerSettings()
 mail_settings = MailSettings()
+webhook_settings = WebhookSettings()
+tracing_settings = TracingSettings()
+profiler_settings = ProfilerSettings()
@@ -0,0 +1,27 @@
+from enum import StrEnum
+
+BULK_MAX_ITEMS = 1000
+
+IMPORT_CHUNK_SIZE = 10_000
+IMPORT_REJECTED_LIMIT = 1000
+
+
+class BulkItemStatus(StrEnum):
+    created = "created"
+    updated = "updated"
+    unchanged = "unchanged"
+    deleted = "deleted"
+    not_found = "not_found"
+    rejected = "rejected"
+
+
+class ImportFormat(StrEnum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+IMPORT_CONTENT_TYPES = {
+    "text/csv": ImportFormat.csv,
+    "application/x-ndjson": ImportFormat.ndjson,
+    "application/jsonl": ImportFormat.ndjson,
+}
@@ -0,0 +1,2 @@
+CACHE_CONTROL = "no-cache"
+"""Clients may store responses but must revalidate them before reuse"""
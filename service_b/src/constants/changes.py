@@ -0,0 +1,9 @@
+from enum import StrEnum
+
+CHANGES_DEFAULT_LIMIT = 500
+CHANGES_MAX_LIMIT = 5000
+
+
+class ChangeOperation(StrEnum):
+    upsert = "upsert"
+    delete = "delete"
@@ -0,0 +1,5 @@
+PROFILE_HEADER = "x-profile"
+"""Request header with the profiler token to profile the request"""
+PROFILED_STATUS_HEADER = "x-profiled-status"
+"""Status of the profiled response, its body is replaced by stacks"""
+PROFILE_FILENAME = "profile.collapsed"
@@ -0,0 +1 @@
+STREAM_BATCH_SIZE = 1000
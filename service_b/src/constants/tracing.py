@@ -0,0 +1,11 @@
+from enum import StrEnum
+
+TRACEPARENT_HEADER = "traceparent"
+DB_STATEMENT_MAX_LENGTH = 1000
+"""SQL longer than this is truncated in span attributes"""
+
+
+class TracingExporterType(StrEnum):
+    off = "off"
+    jsonl = "jsonl"
+    otlp = "otlp"
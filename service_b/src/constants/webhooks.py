@@ -0,0 +1,12 @@
+from enum import StrEnum
+
+WEBHOOK_QUEUE_SIZE = 10_000
+WEBHOOK_SIGNATURE_HEADER = "X-Webhook-Signature"
+WEBHOOK_EVENTS_KEY = "webhook_events"
+"""Session.info key of events waiting for commit"""
+
+
+class WebhookEvent(StrEnum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
@@ -1,15 +1,23 @@
 from typing import Optional, Sequence, Union
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import insert, select, update, func
+from sqlalchemy import insert, select, update
 from pydantic import BaseModel
 
+from constants.webhooks import WebhookEvent
+from crud.base import CRUDBase
 from models import Author
-from schemas.author import AuthorCreateDB, AuthorUpdateDB
+from schemas.author import (
+    AuthorBulkUpdateDB,
+    AuthorCreateDB,
+    AuthorUpdateDB,
+)
 from api.filters.author import AuthorFilter
 
 
-class CRUDAuthor:
+class CRUDAuthor(CRUDBase[Author, AuthorCreateDB, AuthorBulkUpdateDB]):
+    field_columns = {"fullname": ("first_name", "last_name")}  # noqa: RUF012
+
     async def create(
         self,
         db: AsyncSession,
@@ -21,6 +29,7 @@ class CRUDAuthor:
         stmt = insert(Author).values(**data).returning(Author)
         res = await db.execute(stmt)
         obj = res.scalars().first()
+        self.record_change(db, WebhookEvent.created, [obj.id])
         if commit:
             await db.commit()
             await db.refresh(obj)
@@ -34,14 +43,23 @@ class CRUDAuthor:
             return None
 
         await db.delete(obj)
+        self.record_change(db, WebhookEvent.deleted, [obj_id])
         if commit:
             await db.commit()
         return obj
 
     async def get_by_id(
-        self, db: AsyncSession, *, obj_id: int
+        self,
+        db: AsyncSession,
+        *,
+        obj_id: int,
+        fields: Optional[Sequence[str]] = None,
     ) -> Optional[Author]:
-        statement = select(Author).where(Author.id == obj_id)
+        statement = (
+            select(Author)
+            .where(Author.id == obj_id)
+            .options(*self.get_load_options(fields))
+        )
         result = await db.execute(statement)
         return result.scalars().first()
 
@@ -58,19 +76,23 @@ class CRUDAuthor:
         skip: int = 0,
         limit: int = 100,
         filters: Optional[AuthorFilter] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> Sequence[Author]:
         statement = (
-            select(Author, func.count().over().label("total_count"))
+            select(Author, *self.get_list_version_columns())
+            .options(*self.get_load_options(fields))
             .offset(skip)
             .limit(limit)
         )
         if filters:
             statement = filters.sort(statement)
         result = await db.execute(statement)
-        rows = result.mappings().all()
+        rows = result.all()
         return {
-            "total_count": rows[0]["total_count"] if rows else 0,
-            "objects": [r["Author"] for r in rows],
+            "total_count": rows[0].total_count if rows else 0,
+            "objects": [row[0] for row in rows],
+            # None for pages past the end
+            "list_version": tuple(rows[0][1:]) if rows else None,
         }
 
     async def update(
@@ -91,10 +113,11 @@ class CRUDAuthor:
         )
         res = await db.execute(stmt)
         obj = res.scalars().first()
+        self.record_change(db, WebhookEvent.updated, [obj.id])
         if commit:
             await db.commit()
             await db.refresh(obj)
         return obj
 
 
-crud_author = CRUDAuthor()
+crud_author = CRUDAuthor(Author)
@@ -0,0 +1,412 @@
+import logging
+from typing import AsyncIterator, Generic, Optional, Sequence
+
+from fastapi_filter.contrib.sqlalchemy import Filter
+
+from sqlalchemy import (
+    delete,
+    func,
+    inspect,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.sql.base import ExecutableOption
+
+from constants.bulk import BulkItemStatus, IMPORT_REJECTED_LIMIT
+from constants.crud_types import CreateSchemaType, ModelType, UpdateSchemaType
+from constants.stream import STREAM_BATCH_SIZE
+from constants.webhooks import WebhookEvent
+from utilities.webhooks import record_event
+
+logger = logging.getLogger(__name__)
+
+
+class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """Set-based operations shared by all models. Every bulk method runs
+    in one transaction and reports a result for every item it was given.
+    """
+
+    field_columns: dict[str, tuple[str, ...]] = {}  # noqa: RUF012
+    """Response fields that aren't columns and columns they are made of"""
+
+    validator_columns: tuple[str, ...] = ("version", "updated_at")
+    """Columns loaded with any fields, response validators are made of"""
+
+    def __init__(self, model: type[ModelType]) -> None:
+        self.model = model
+
+    def record_change(
+        self,
+        db: AsyncSession,
+        event_type: WebhookEvent,
+        ids: Optional[Sequence[int]],
+    ) -> None:
+        """Publish a webhook event after db commits. Deletes also notify
+        about tables whose rows are removed by ON DELETE CASCADE.
+        """
+        record_event(db, self.model.__tablename__, event_type, ids)
+        if event_type != WebhookEvent.deleted or not ids:
+            return
+        for table in self.model.metadata.tables.values():
+            for fk in table.foreign_keys:
+                if (
+                    fk.column.table is self.model.__table__
+                    and (fk.ondelete or "").upper() == "CASCADE"
+                ):
+                    record_event(db, table.name, WebhookEvent.deleted, None)
+
+    def get_load_options(
+        self,
+        fields: Optional[Sequence[str]] = None,
+        expand: Optional[Sequence[str]] = None,
+    ) -> list[ExecutableOption]:
+        """Options to load only columns needed for requested fields and
+        to eager load expanded relationships with one query per statement.
+        """
+        expand = expand or []
+        options = [
+            selectinload(getattr(self.model, relation)) for relation in expand
+        ]
+        if not fields:
+            return options
+        mapper = inspect(self.model)
+        needed = set(self.validator_columns)
+        for field in [*fields, *expand]:
+            if field in mapper.relationships:
+                needed.update(
+                    column.key
+                    for column in mapper.relationships[field].local_columns
+                )
+            else:
+                needed.update(self.field_columns.get(field, (field,)))
+        columns = needed & set(mapper.column_attrs.keys())
+        options.append(
+            load_only(*(getattr(self.model, name) for name in columns))
+        )
+        return options
+
+    async def get_list_version(
+        self,
+        db: AsyncSession,
+        *,
+        filters: Optional[Filter] = None,
+        expand: Optional[Sequence[str]] = None,
+    ) -> tuple:
+        """Count, max(version) and max(updated_at) of filtered objects and
+        max(version) of every expanded relationship model. Inserts and
+        updates raise max(version), deletes lower the count, so the result
+        changes whenever the list could.
+        """
+        statement = select(
+            self.model.id, self.model.version, self.model.updated_at
+        )
+        if filters:
+            statement = filters.filter(statement)
+        subquery = statement.subquery()
+        columns = [
+            func.count(),
+            func.max(subquery.c.version),
+            func.max(subquery.c.updated_at),
+            *self.get_related_versions(expand),
+        ]
+        result = await db.execute(select(*columns).select_from(subquery))
+        return tuple(result.one())
+
+    def get_list_version_columns(
+        self, expand: Optional[Sequence[str]] = None
+    ) -> list:
+        """Window columns to select with every row of a page, which
+        together give get_list_version of all rows the page is cut from,
+        so unconditional list requests get validators without another
+        query. The count is labelled total_count.
+        """
+        return [
+            func.count().over().label("total_count"),
+            func.max(self.model.version).over(),
+            func.max(self.model.updated_at).over(),
+            *self.get_related_versions(expand),
+        ]
+
+    def get_related_versions(
+        self, expand: Optional[Sequence[str]] = None
+    ) -> list:
+        """max(version) of every expanded relationship model"""
+        mapper = inspect(self.model)
+        return [
+            select(
+                func.max(mapper.relationships[relation].mapper.class_.version)
+            ).scalar_subquery()
+            for relation in expand or []
+        ]
+
+    async def stream_multi(
+        self,
+        db: AsyncSession,
+        *,
+        filters: Optional[Filter] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[Sequence[ModelType]]:
+        """Iterate over all filtered objects with a server-side cursor,
+        batch_size objects at a time.
+        """
+        statement = select(self.model)
+        if filters:
+            statement = filters.sort(filters.filter(statement))
+        result = await db.stream(
+            statement.execution_options(yield_per=batch_size)
+        )
+        async for partition in result.scalars().partitions():
+            yield partition
+
+    async def create_bulk(
+        self,
+        db: AsyncSession,
+        *,
+        create_schemas: Sequence[CreateSchemaType],
+        commit: bool = True,
+    ) -> dict:
+        rows = [schema.model_dump() for schema in create_schemas]
+        rejected = await self._find_missing_references(db, rows)
+        results = [
+            {
+                "index": index,
+                "status": BulkItemStatus.rejected,
+                "detail": rejected[index],
+            }
+            for index in rejected
+        ]
+        valid = [
+            (index, row)
+            for index, row in enumerate(rows)
+            if index not in rejected
+        ]
+        objects = []
+        if valid:
+            stmt = insert(self.model).returning(
+                self.model, sort_by_parameter_order=True
+            )
+            res = await db.scalars(stmt, [row for _, row in valid])
+            objects = list(res.all())
+            results.extend(
+                {
+                    "index": index,
+                    "id": obj.id,
+                    "status": BulkItemStatus.created,
+                }
+                for (index, _), obj in zip(valid, objects, strict=True)
+            )
+            self.record_change(
+                db, WebhookEvent.created, [obj.id for obj in objects]
+            )
+            if commit:
+                await db.commit()
+        return {
+            "objects": objects,
+            "results": sorted(results, key=lambda x: x["index"]),
+        }
+
+    async def update_bulk(
+        self,
+        db: AsyncSession,
+        *,
+        update_schemas: Sequence[UpdateSchemaType],
+        commit: bool = True,
+    ) -> dict:
+        rows = [
+            schema.model_dump(exclude_unset=True) for schema in update_schemas
+        ]
+        existing = await self._get_existing_ids(
+            db, [row["id"] for row in rows]
+        )
+        rejected = await self._find_missing_references(db, rows)
+        results = []
+        to_update = []
+        for index, row in enumerate(rows):
+            result = {"index": index, "id": row["id"]}
+            if row["id"] not in existing:
+                result["status"] = BulkItemStatus.not_found
+            elif index in rejected:
+                result["status"] = BulkItemStatus.rejected
+                result["detail"] = rejected[index]
+            elif len(row) == 1:
+                # Only the id: an empty SET clause would fail the batch
+                result["status"] = BulkItemStatus.unchanged
+            else:
+                to_update.append(row)
+                result["status"] = BulkItemStatus.updated
+            results.append(result)
+        objects = []
+        if to_update:
+            await db.execute(update(self.model), to_update)
+            stmt = (
+                select(self.model)
+                .where(self.model.id.in_([row["id"] for row in to_update]))
+                .execution_options(populate_existing=True)
+            )
+            objects = list((await db.scalars(stmt)).all())
+            self.record_change(
+                db, WebhookEvent.updated, [obj.id for obj in objects]
+            )
+            if commit:
+                await db.commit()
+        return {"objects": objects, "results": results}
+
+    async def remove_bulk(
+        self, db: AsyncSession, *, obj_ids: Sequence[int], commit: bool = True
+    ) -> dict:
+        stmt = (
+            delete(self.model)
+            .where(self.model.id.in_(obj_ids))
+            .returning(self.model.id)
+        )
+        deleted = set((await db.scalars(stmt)).all())
+        self.record_change(db, WebhookEvent.deleted, sorted(deleted))
+        if commit:
+            await db.commit()
+        return {
+            "results": [
+                {
+                    "index": index,
+                    "id": obj_id,
+                    "status": BulkItemStatus.deleted
+                    if obj_id in deleted
+                    else BulkItemStatus.not_found,
+                }
+                for index, obj_id in enumerate(obj_ids)
+            ]
+        }
+
+    async def import_chunks(
+        self,
+        db: AsyncSession,
+        *,
+        chunks: AsyncIterator[tuple[list[tuple], list[dict]]],
+        columns: Sequence[str],
+        commit: bool = True,
+    ) -> dict:
+        """Load validated chunks with COPY into a temporary staging table
+        and move them to the model table with one INSERT ... SELECT.
+        Only the current chunk is held in memory.
+
+        Args:
+            - chunks: pairs of records (line number first, then values
+            in columns order) and rejected rows, see
+            utilities.importer.iter_validated_chunks
+            - columns (Sequence[str]): model table columns to fill
+
+        Returns:
+            - dict: counters and the first IMPORT_REJECTED_LIMIT
+            rejected rows
+        """
+        table = self.model.__table__.name
+        staging = f"{table}_import"
+        column_names = ", ".join(columns)
+        await db.execute(
+            text(
+                f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "  # noqa: S608
+                f"SELECT 0 AS line, {column_names} FROM {table} WITH NO DATA"
+            )
+        )
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        total_rows = 0
+        rejected_count = 0
+        rejected = []
+        async for records, chunk_rejected in chunks:
+            if records:
+                await driver_connection.copy_records_to_table(
+                    staging, records=records, columns=["line", *columns]
+                )
+            total_rows += len(records) + len(chunk_rejected)
+            rejected_count += len(chunk_rejected)
+            rejected.extend(
+                chunk_rejected[: IMPORT_REJECTED_LIMIT - len(rejected)]
+            )
+            logger.info(
+                "Import into %s: %s rows read, %s rejected",
+                table,
+                total_rows,
+                rejected_count,
+            )
+
+        for fk in self.model.__table__.foreign_keys:
+            column = fk.parent.name
+            if column not in columns:
+                continue
+            res = await db.execute(
+                text(
+                    f"WITH d AS (DELETE FROM {staging} s "  # noqa: S608
+                    f"WHERE s.{column} IS NOT NULL AND NOT EXISTS ("
+                    f"SELECT 1 FROM {fk.column.table.name} r "
+                    f"WHERE r.{fk.column.name} = s.{column}) "
+                    f"RETURNING s.line, s.{column}) "
+                    "SELECT count(*) OVER () AS total, line, "
+                    f"{column} AS value FROM d ORDER BY line LIMIT :limit"
+                ),
+                {"limit": IMPORT_REJECTED_LIMIT},
+            )
+            missing = res.mappings().all()
+            if missing:
+                rejected_count += missing[0]["total"]
+                rejected.extend(
+                    {
+                        "line": row["line"],
+                        "detail": f"{column}={row['value']} does not exist",
+                    }
+                    for row in missing
+                )
+
+        res = await db.execute(
+            text(
+                f"INSERT INTO {table} ({column_names}) "  # noqa: S608
+                f"SELECT {column_names} FROM {staging} ORDER BY line"
+            )
+        )
+        if res.rowcount:
+            self.record_change(db, WebhookEvent.created, None)
+        if commit:
+            await db.commit()
+        logger.info("Import into %s: %s rows inserted", table, res.rowcount)
+        rejected.sort(key=lambda x: x["line"])
+        return {
+            "total_rows": total_rows,
+            "imported": res.rowcount,
+            "rejected_count": rejected_count,
+            "rejected": rejected[:IMPORT_REJECTED_LIMIT],
+        }
+
+    async def _get_existing_ids(
+        self, db: AsyncSession, obj_ids: Sequence[int]
+    ) -> set[int]:
+        stmt = select(self.model.id).where(self.model.id.in_(obj_ids))
+        return set((await db.scalars(stmt)).all())
+
+    async def _find_missing_references(
+        self, db: AsyncSession, rows: Sequence[dict]
+    ) -> dict[int, str]:
+        """Check foreign keys of all rows with one query per key, so one
+        bad reference rejects its item instead of the whole batch.
+        """
+        rejected = {}
+        for fk in self.model.__table__.foreign_keys:
+            column = fk.parent.name
+            values = {
+                row[column] for row in rows if row.get(column) is not None
+            }
+            if not values:
+                continue
+            stmt = select(fk.column).where(fk.column.in_(values))
+            found = set((await db.scalars(stmt)).all())
+            for index, row in enumerate(rows):
+                value = row.get(column)
+                if value is not None and value not in found:
+                    rejected.setdefault(
+                        index, f"{column}={value} does not exist"
+                    )
+        return rejected
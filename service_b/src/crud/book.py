@@ -1,15 +1,21 @@
 from typing import Optional, Sequence, Union
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import insert, select, update, func
+from sqlalchemy import insert, select, update
 from pydantic import BaseModel
 
+from constants.webhooks import WebhookEvent
+from crud.base import CRUDBase
 from models import Book
-from schemas.book import BookCreateDB, BookUpdateDB
+from schemas.book import (
+    BookBulkUpdateDB,
+    BookCreateDB,
+    BookUpdateDB,
+)
 from api.filters.book import BookFilter
 
 
-class CRUDBook:
+class CRUDBook(CRUDBase[Book, BookCreateDB, BookBulkUpdateDB]):
     async def create(
         self,
         db: AsyncSession,
@@ -21,6 +27,7 @@ class CRUDBook:
         stmt = insert(Book).values(**data).returning(Book)
         res = await db.execute(stmt)
         obj = res.scalars().first()
+        self.record_change(db, WebhookEvent.created, [obj.id])
         if commit:
             await db.commit()
             await db.refresh(obj)
@@ -34,14 +41,24 @@ class CRUDBook:
             return None
 
         await db.delete(obj)
+        self.record_change(db, WebhookEvent.deleted, [obj_id])
         if commit:
             await db.commit()
         return obj
 
     async def get_by_id(
-        self, db: AsyncSession, *, obj_id: int
+        self,
+        db: AsyncSession,
+        *,
+        obj_id: int,
+        fields: Optional[Sequence[str]] = None,
+        expand: Optional[Sequence[str]] = None,
     ) -> Optional[Book]:
-        statement = select(Book).where(Book.id == obj_id)
+        statement = (
+            select(Book)
+            .where(Book.id == obj_id)
+            .options(*self.get_load_options(fields, expand))
+        )
         result = await db.execute(statement)
         return result.scalars().first()
 
@@ -58,19 +75,24 @@ class CRUDBook:
         skip: int = 0,
         limit: int = 100,
         filters: Optional[BookFilter] = None,
+        fields: Optional[Sequence[str]] = None,
+        expand: Optional[Sequence[str]] = None,
     ) -> Sequence[Book]:
         statement = (
-            select(Book, func.count().over().label("total_count"))
+            select(Book, *self.get_list_version_columns(expand))
+            .options(*self.get_load_options(fields, expand))
             .offset(skip)
             .limit(limit)
         )
         if filters:
             statement = filters.sort(statement)
         result = await db.execute(statement)
-        rows = result.mappings().all()
+        rows = result.all()
         return {
-            "total_count": rows[0]["total_count"] if rows else 0,
-            "objects": [r["Book"] for r in rows],
+            "total_count": rows[0].total_count if rows else 0,
+            "objects": [row[0] for row in rows],
+            # None for pages past the end
+            "list_version": tuple(rows[0][1:]) if rows else None,
         }
 
     async def update(
@@ -91,10 +113,11 @@ class CRUDBook:
         )
         res = await db.execute(stmt)
         obj = res.scalars().first()
+        self.record_change(db, WebhookEvent.updated, [obj.id])
         if commit:
             await db.commit()
             await db.refresh(obj)
         return obj
 
 
-crud_book = CRUDBook()
+crud_book = CRUDBook(Book)
@@ -0,0 +1,73 @@
+"""add_row_versions
+
+Revision ID: 3f1c9a7d2b64
+Revises: 85252c9de65f
+Create Date: 2026-10-19 09:30:12.418305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c9a7d2b64"
+down_revision: Union[str, None] = "85252c9de65f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("author", "book")
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE row_version_seq")
+    op.execute(
+        """
+        CREATE FUNCTION bump_row_version() RETURNS trigger AS $$
+        BEGIN
+            NEW.version := nextval('row_version_seq');
+            NEW.updated_at := now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "version",
+                sa.BigInteger(),
+                server_default=sa.text("nextval('row_version_seq')"),
+                nullable=False,
+            ),
+        )
+        op.add_column(
+            table,
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+        )
+        op.create_index(
+            op.f(f"ix_{table}_version"), table, ["version"], unique=False
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_row_version "
+            f"BEFORE UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION bump_row_version()"
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER {table}_bump_row_version ON {table}")
+        op.drop_index(op.f(f"ix_{table}_version"), table_name=table)
+        op.drop_column(table, "updated_at")
+        op.drop_column(table, "version")
+    op.execute("DROP FUNCTION bump_row_version()")
+    op.execute("DROP SEQUENCE row_version_seq")
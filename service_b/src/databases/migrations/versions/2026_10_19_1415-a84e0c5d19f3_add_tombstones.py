@@ -0,0 +1,66 @@
+"""add_tombstones
+
+Revision ID: a84e0c5d19f3
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-19 14:15:47.902114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a84e0c5d19f3"
+down_revision: Union[str, None] = "3f1c9a7d2b64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("author", "book")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tombstone",
+        sa.Column(
+            "version",
+            sa.BigInteger(),
+            server_default=sa.text("nextval('row_version_seq')"),
+            nullable=False,
+        ),
+        sa.Column("entity", sa.String(), nullable=False),
+        sa.Column("object_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("version"),
+    )
+    op.execute(
+        """
+        CREATE FUNCTION record_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO tombstone (entity, object_id)
+            VALUES (TG_TABLE_NAME, OLD.id);
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_record_tombstone "
+            f"AFTER DELETE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION record_tombstone()"
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER {table}_record_tombstone ON {table}")
+    op.execute("DROP FUNCTION record_tombstone()")
+    op.drop_table("tombstone")
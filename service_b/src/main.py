@@ -1,17 +1,43 @@
-import uvicorn
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from starlette.middleware.cors import CORSMiddleware
 
+from api.debug.profiler import router as profiler_router
+from api.debug.router import router as debug_router
 from api.v1.router import router as v1_router
-from configs.config import app_settings
+from middlewares.compression import CompressionMiddleware
+from middlewares.metrics import MetricsMiddleware
+from middlewares.profiler import ProfilerMiddleware
+from middlewares.timing import ServerTimingMiddleware
+from middlewares.tracing import TracingMiddleware
+from configs.config import app_settings, profiler_settings
+from databases.database import async_engine
 from schemas.service import ServiceInfo
+from utilities.metrics import CONTENT_TYPE, register_pool_metrics, registry
+from utilities.server import run_server
+from utilities.tracing import tracer
+from utilities.webhooks import webhook_dispatcher
 
 BACKEND_ENTRYPOINT = "service-b"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    await webhook_dispatcher.close()
+    await tracer.close()
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title="Service B",
     openapi_url=f"/{BACKEND_ENTRYPOINT}/openapi.json/",
     docs_url=f"/{BACKEND_ENTRYPOINT}/docs/",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -22,8 +48,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(CompressionMiddleware, minimum_size=1000)
+
+app.add_middleware(ServerTimingMiddleware)
+
+app.add_middleware(MetricsMiddleware)
+
+app.add_middleware(TracingMiddleware)
+
+if profiler_settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
+register_pool_metrics(async_engine.pool)
+
 app.include_router(v1_router, prefix=f"/{BACKEND_ENTRYPOINT}")
 
+if profiler_settings.PROFILER_ENABLED:
+    app.include_router(profiler_router, prefix=f"/{BACKEND_ENTRYPOINT}")
+
+if app_settings.DEBUG:
+    app.include_router(debug_router, prefix=f"/{BACKEND_ENTRYPOINT}")
+
 
 @app.get(f"/{BACKEND_ENTRYPOINT}/", response_model=ServiceInfo)
 async def root() -> ServiceInfo:
@@ -33,11 +78,10 @@ async def root() -> ServiceInfo:
     )
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",  # noqa: S104
-        port=app_settings.SERVICE_PORT,
-        reload=True,
-        forwarded_allow_ips="*",
-    )
+    run_server("main:app", port=app_settings.SERVICE_PORT)
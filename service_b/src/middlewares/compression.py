@@ -0,0 +1,164 @@
+import zlib
+from typing import Callable, Optional, Protocol
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utilities.negotiation import parse_quality_values
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class GZipCompressor:
+    def __init__(self, level: int) -> None:
+        # wbits=31 writes gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip, whichever the client
+    prefers in Accept-Encoding (brotli on a tie). Small responses are sent
+    as is, streaming responses are compressed chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1000,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self.negotiate(
+            Headers(scope=scope).get("Accept-Encoding", "")
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(
+            send, encoding, self.make_compressor, self.minimum_size
+        )
+        await self.app(scope, receive, responder.send)
+
+    def negotiate(self, accept_encoding: str) -> Optional[str]:
+        weights = parse_quality_values(accept_encoding)
+        candidates = [
+            (weights[name], name)
+            for name in ("br", "gzip")
+            if weights.get(name, 0) > 0
+        ]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda x: x[0])[1]
+
+    def make_compressor(self, encoding: str) -> Compressor:
+        if encoding == "br":
+            return BrotliCompressor(self.brotli_quality)
+        return GZipCompressor(self.gzip_level)
+
+
+class CompressionResponder:
+    def __init__(
+        self,
+        send: Send,
+        encoding: str,
+        make_compressor: Callable[[str], Compressor],
+        minimum_size: int,
+    ) -> None:
+        self._send = send
+        self.encoding = encoding
+        self.make_compressor = make_compressor
+        self.minimum_size = minimum_size
+        self.initial_message: Message = {}
+        self.compressor: Optional[Compressor] = None
+        self.started = False
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Headers can be changed only after the first body chunk
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.passthrough:
+            await self._start()
+            await self._send(message)
+            return
+        if not self.started:
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self._start()
+                await self._send(message)
+                return
+            self.compressor = self.make_compressor(self.encoding)
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            del headers["Content-Length"]
+            if not more_body:
+                body = (
+                    self.compressor.compress(body) + self.compressor.finish()
+                )
+                headers["Content-Length"] = str(len(body))
+                await self._start()
+                await self._send({**message, "body": body})
+                return
+            await self._start()
+
+        body = self.compressor.compress(body)
+        body += (
+            self.compressor.flush() if more_body else self.compressor.finish()
+        )
+        await self._send({**message, "body": body})
+
+    async def _start(self) -> None:
+        if not self.started:
+            self.started = True
+            await self._send(self.initial_message)
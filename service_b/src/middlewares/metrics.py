@@ -0,0 +1,80 @@
+import time
+from typing import Collection
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utilities.metrics import Histogram, registry
+
+request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the last body chunk",
+    ("method", "route", "identity", "status"),
+)
+
+OTHER_IDENTITY = "other"
+"""identity label of identity path parameters that aren't registered"""
+
+
+def get_route_name(scope: Scope) -> str:
+    """Route template of a routed request, so paths with different ids
+    share one series. Mounted Starlette apps (the admin) don't set the
+    route, their endpoint name is used instead.
+    """
+    if route := scope.get("route"):
+        return getattr(route, "path_format", route.path)
+    root_path = scope.get("root_path", "")
+    if endpoint := scope.get("endpoint"):
+        return f"{root_path}/{endpoint.__name__}"
+    return root_path or "unmatched"
+
+
+class MetricsMiddleware:
+    """Observe duration of every HTTP request by route, identity path
+    parameter (admin views) and response status.
+
+    Only identities of registered views are used as labels, any other
+    value is counted as OTHER_IDENTITY, so clients requesting arbitrary
+    paths can't create new series.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        histogram: Histogram = request_duration,
+        identities: Collection[str] = (),
+    ) -> None:
+        self.app = app
+        self.histogram = histogram
+        self.identities = frozenset(identities)
+
+    def get_identity(self, scope: Scope) -> str:
+        identity = scope.get("path_params", {}).get("identity", "")
+        if not identity or identity in self.identities:
+            return identity
+        return OTHER_IDENTITY
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.histogram.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                get_route_name(scope),
+                self.get_identity(scope),
+                str(status_code),
+            )
@@ -0,0 +1,51 @@
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from constants.tracing import TRACEPARENT_HEADER
+from middlewares.metrics import get_route_name
+from utilities.tracing import Tracer, current_span, tracer
+
+
+class TracingMiddleware:
+    """Run every HTTP request in a server span, continuing the trace of
+    the caller's traceparent header. The span is named after the route
+    once routing is done.
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer = tracer) -> None:
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http" or self.tracer.exporter is None:
+            await self.app(scope, receive, send)
+            return
+        span = self.tracer.start_span(
+            scope["method"],
+            kind="server",
+            attributes={
+                "http.method": scope["method"],
+                "http.target": scope["path"],
+            },
+            traceparent=Headers(scope=scope).get(TRACEPARENT_HEADER),
+        )
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                span.attributes["http.status_code"] = message["status"]
+            await send(message)
+
+        token = current_span.set(span)
+        try:
+            await self.app(scope, receive, send_with_status)
+        except BaseException as ex:
+            span.error = repr(ex)
+            raise
+        finally:
+            current_span.reset(token)
+            route = get_route_name(scope)
+            span.name = f"{scope['method']} {route}"
+            span.attributes["http.route"] = route
+            self.tracer.end_span(span)
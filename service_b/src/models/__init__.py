@@ -1,6 +1,7 @@
 from .author import Author
 from .base import Base
 from .book import Book
+from .tombstone import Tombstone
 
 
-__all__ = ["Author", "Base", "Book"]
+__all__ = ["Author", "Base", "Book", "Tombstone"]
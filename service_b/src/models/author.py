@@ -3,13 +3,13 @@ from typing import Optional, TYPE_CHECKING
 from sqlalchemy import Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from models.base import Base
+from models.base import Base, VersionedMixin
 
 if TYPE_CHECKING:
     from models import Book
 
 
-class Author(Base):
+class Author(VersionedMixin, Base):
     __tablename__ = "author"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -1,5 +1,7 @@
-from sqlalchemy import Integer
-from sqlalchemy.orm import DeclarativeBase
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, func, text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.sql.sqltypes import ARRAY, String
 
 
@@ -9,3 +11,20 @@ class Base(DeclarativeBase):
         list[str]: ARRAY(String),
         list[int]: ARRAY(Integer),
     }
+
+
+class VersionedMixin:
+    """Row validators. Both columns are set by the database: version is
+    drawn from the shared row_version_seq on insert and bumped by the
+    bump_row_version trigger on every update, so max(version) grows with
+    any insert or update in the table.
+    """
+
+    version: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default=text("nextval('row_version_seq')"),
+        index=True,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
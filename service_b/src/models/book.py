@@ -5,13 +5,13 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import ENUM
 
 from constants.book import BookGenre
-from models.base import Base
+from models.base import Base, VersionedMixin
 
 if TYPE_CHECKING:
     from models import Author
 
 
-class Book(Base):
+class Book(VersionedMixin, Base):
     __tablename__ = "book"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+
+class Tombstone(Base):
+    """Deleted rows of versioned tables, written by the record_tombstone
+    trigger. version is taken from row_version_seq, so deletes are
+    ordered with inserts and updates in the change feed.
+    """
+
+    __tablename__ = "tombstone"
+
+    version: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        server_default=text("nextval('row_version_seq')"),
+    )
+    entity: Mapped[str]
+    object_id: Mapped[int]
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 
+from schemas.bulk import BulkItemResult
+
 
 class AuthorBase(BaseModel):
     class Config:
@@ -16,6 +18,10 @@ class AuthorUpdateDB(AuthorBase):
     last_name: str
 
 
+class AuthorBulkUpdateDB(AuthorUpdateDB):
+    id: int
+
+
 class AuthorResponse(AuthorBase):
     id: int
     first_name: str
@@ -23,9 +29,19 @@ class AuthorResponse(AuthorBase):
     fullname: str
 
 
+class AuthorShortResponse(AuthorBase):
+    id: int
+    fullname: str
+
+
 class AuthorPaginatedResponse(BaseModel):
     objects: list[AuthorResponse]
     total_count: int
 
     class Config:
         arbitrary_types_allowed = True
+
+
+class AuthorBulkResponse(BaseModel):
+    objects: list[AuthorResponse]
+    results: list[BulkItemResult]
@@ -3,6 +3,8 @@ from typing import Optional
 from pydantic import BaseModel
 
 from constants.book import BookGenre
+from schemas.author import AuthorShortResponse
+from schemas.bulk import BulkItemResult
 
 
 class BookBase(BaseModel):
@@ -22,6 +24,10 @@ class BookUpdateDB(BookBase):
     pass
 
 
+class BookBulkUpdateDB(BookUpdateDB):
+    id: int
+
+
 class BookResponse(BookBase):
     id: int
     author_id: int
@@ -29,9 +35,18 @@ class BookResponse(BookBase):
     extra_genre: Optional[BookGenre] = None
 
 
+class BookExpandedResponse(BookResponse):
+    author: Optional[AuthorShortResponse] = None
+
+
 class BookPaginatedResponse(BaseModel):
     objects: list[BookResponse]
     total_count: int
 
     class Config:
         arbitrary_types_allowed = True
+
+
+class BookBulkResponse(BaseModel):
+    objects: list[BookResponse]
+    results: list[BulkItemResult]
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from constants.bulk import BulkItemStatus
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: BulkItemStatus
+    detail: Optional[str] = None
+
+
+class BulkDeleteResponse(BaseModel):
+    results: list[BulkItemResult]
+
+
+class ImportRejectedRow(BaseModel):
+    line: int
+    detail: str
+
+
+class ImportResponse(BaseModel):
+    total_rows: int
+    imported: int
+    rejected_count: int
+    rejected: list[ImportRejectedRow]
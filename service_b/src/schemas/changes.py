@@ -0,0 +1,20 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from constants.changes import ChangeOperation
+
+
+class Change(BaseModel):
+    seq: int
+    entity: str
+    op: ChangeOperation
+    id: int
+    data: Optional[dict] = None
+    """Object as returned by its detail endpoint, None for deletes"""
+
+
+class ChangesResponse(BaseModel):
+    changes: list[Change]
+    next_since: int
+    has_more: bool
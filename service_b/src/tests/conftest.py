@@ -0,0 +1,14 @@
+from pathlib import Path
+
+import pytest
+from dotenv import load_dotenv
+
+from tests.fakes import FakeSession
+
+# Settings are read on import, variables already set win
+load_dotenv(Path(__file__).parents[3] / ".env.template.b")
+
+
+@pytest.fixture()
+def fake_session() -> type[FakeSession]:
+    return FakeSession
@@ -0,0 +1,34 @@
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Iterable, Optional
+
+
+class FakeResult:
+    def __init__(self, values: Iterable[Any]) -> None:
+        self.values = list(values)
+
+    def all(self) -> list:
+        return self.values
+
+
+class FakeSession:
+    """Stand-in for AsyncSession that answers scalars() calls with the
+    queued results in order and records everything sent to it, so bulk
+    methods can be checked without a database.
+    """
+
+    def __init__(self, *scalars_results: Iterable[Any]) -> None:
+        self.scalars_results = deque(scalars_results)
+        self.executed: list[tuple[Any, Optional[list]]] = []
+        self.commits = 0
+        self.sync_session = SimpleNamespace(info={})
+
+    async def scalars(self, statement: Any, params: Any = None) -> FakeResult:
+        self.executed.append((statement, params))
+        return FakeResult(self.scalars_results.popleft())
+
+    async def execute(self, statement: Any, params: Any = None) -> None:
+        self.executed.append((statement, params))
+
+    async def commit(self) -> None:
+        self.commits += 1
@@ -0,0 +1,116 @@
+"""Every item of a bulk request gets its own result, and items that can't
+be written don't fail the others.
+
+Run from service_b/src:
+python -m pytest tests
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from constants.book import BookGenre
+from constants.bulk import BulkItemStatus
+from crud.book import crud_book
+from schemas.book import BookBulkUpdateDB, BookCreateDB
+from tests.fakes import FakeSession
+from utilities.webhooks import WEBHOOK_EVENTS_KEY
+
+GENRE = next(iter(BookGenre))
+
+
+def make_book(author_id: int) -> BookCreateDB:
+    return BookCreateDB(title="Title", genre=GENRE, author_id=author_id)
+
+
+def test_create_bulk_rejects_only_items_with_missing_references(
+    fake_session: type[FakeSession],
+):
+    db = fake_session([1], [SimpleNamespace(id=10), SimpleNamespace(id=11)])
+    result = asyncio.run(
+        crud_book.create_bulk(
+            db, create_schemas=[make_book(1), make_book(7), make_book(1)]
+        )
+    )
+    assert result["results"] == [
+        {"index": 0, "id": 10, "status": BulkItemStatus.created},
+        {
+            "index": 1,
+            "status": BulkItemStatus.rejected,
+            "detail": "author_id=7 does not exist",
+        },
+        {"index": 2, "id": 11, "status": BulkItemStatus.created},
+    ]
+    _, inserted = db.executed[-1]
+    assert [row["author_id"] for row in inserted] == [1, 1]
+    assert db.commits == 1
+
+
+def test_create_bulk_without_valid_items_inserts_nothing(
+    fake_session: type[FakeSession],
+):
+    db = fake_session([])
+    result = asyncio.run(
+        crud_book.create_bulk(db, create_schemas=[make_book(7)])
+    )
+    assert [item["status"] for item in result["results"]] == [
+        BulkItemStatus.rejected
+    ]
+    assert len(db.executed) == 1
+    assert db.commits == 0
+
+
+def test_update_bulk_reports_every_item(fake_session: type[FakeSession]):
+    db = fake_session({1, 2}, [SimpleNamespace(id=1)])
+    result = asyncio.run(
+        crud_book.update_bulk(
+            db,
+            update_schemas=[
+                BookBulkUpdateDB(id=1, title="New"),
+                BookBulkUpdateDB.model_construct(id=2),
+                BookBulkUpdateDB(id=3, title="New"),
+            ],
+        )
+    )
+    assert result["results"] == [
+        {"index": 0, "id": 1, "status": BulkItemStatus.updated},
+        {"index": 1, "id": 2, "status": BulkItemStatus.unchanged},
+        {"index": 2, "id": 3, "status": BulkItemStatus.not_found},
+    ]
+    updates = [params for _, params in db.executed if params is not None]
+    assert updates == [[{"id": 1, "title": "New"}]]
+    events = db.sync_session.info[WEBHOOK_EVENTS_KEY]
+    assert [event["ids"] for event in events] == [[1]]
+    assert db.commits == 1
+
+
+def test_update_bulk_with_only_ids_sends_no_update(
+    fake_session: type[FakeSession],
+):
+    db = fake_session({1, 2})
+    result = asyncio.run(
+        crud_book.update_bulk(
+            db,
+            update_schemas=[
+                BookBulkUpdateDB.model_construct(id=1),
+                BookBulkUpdateDB.model_construct(id=2),
+            ],
+        )
+    )
+    assert [item["status"] for item in result["results"]] == [
+        BulkItemStatus.unchanged,
+        BulkItemStatus.unchanged,
+    ]
+    assert result["objects"] == []
+    assert len(db.executed) == 1
+    assert db.commits == 0
+
+
+def test_remove_bulk_reports_missing_ids(fake_session: type[FakeSession]):
+    db = fake_session([1, 3])
+    result = asyncio.run(crud_book.remove_bulk(db, obj_ids=[1, 2, 3]))
+    assert result["results"] == [
+        {"index": 0, "id": 1, "status": BulkItemStatus.deleted},
+        {"index": 1, "id": 2, "status": BulkItemStatus.not_found},
+        {"index": 2, "id": 3, "status": BulkItemStatus.deleted},
+    ]
+    assert db.commits == 1
@@ -0,0 +1,96 @@
+import hashlib
+from datetime import UTC, datetime
+from email.utils import format_datetime
+from typing import Any, NamedTuple, Optional, Sequence
+
+from fastapi import Response, status
+
+from constants.caching import CACHE_CONTROL
+from utilities.metrics import registry
+
+conditional_requests = registry.counter(
+    "http_conditional_requests_total",
+    "GET requests with If-None-Match by result (hit: 304 sent)",
+    ("result",),
+)
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Accept",
+        }
+        if self.last_modified:
+            headers["Last-Modified"] = format_datetime(
+                self.last_modified.astimezone(UTC), usegmt=True
+            )
+        return headers
+
+
+def make_etag(*parts: Any, weak: bool = False) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def get_object_validators(
+    obj: Any, expand: Optional[Sequence[str]] = None, *variant: Any
+) -> Validators:
+    """Strong validators of one object representation: its version,
+    versions of expanded related objects and everything else the body
+    depends on (fields, media type) passed as variant.
+    """
+    parts = [obj.__tablename__, obj.id, obj.version]
+    for relation in expand or []:
+        related = getattr(obj, relation)
+        parts.append(related.version if related is not None else None)
+    return Validators(make_etag(*parts, *variant), obj.updated_at)
+
+
+def get_list_validators(list_version: tuple, *variant: Any) -> Validators:
+    """Weak validators of a list page from CRUDBase.get_list_version (or
+    the list_version of a page) and the query parameters (filters, page,
+    fields, media type) as variant.
+    """
+    _, _, last_modified, *_ = list_version
+    return Validators(
+        make_etag(*list_version, *variant, weak=True), last_modified
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as required for If-None-Match"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def get_not_modified_response(
+    if_none_match: Optional[str], validators: Validators
+) -> Optional[Response]:
+    if not if_none_match:
+        return None
+    if etag_matches(if_none_match, validators.etag):
+        conditional_requests.inc("hit")
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=validators.headers,
+        )
+    conditional_requests.inc("miss")
+    return None
+
+
+def add_validators(response: Response, validators: Validators) -> Response:
+    response.headers.update(validators.headers)
+    return response
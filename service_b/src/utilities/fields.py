@@ -0,0 +1,31 @@
+from functools import lru_cache
+from typing import Type
+
+from pydantic import BaseModel, ConfigDict, create_model
+
+
+@lru_cache
+def get_trimmed_schema(
+    schema: Type[BaseModel], fields: tuple[str, ...]
+) -> Type[BaseModel]:
+    """Copy of schema with only the given fields"""
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            field: (schema.model_fields[field].annotation, info)
+            for field, info in schema.model_fields.items()
+            if field in fields
+        },
+    )
+
+
+@lru_cache
+def get_trimmed_paginated_schema(
+    schema: Type[BaseModel], fields: tuple[str, ...]
+) -> Type[BaseModel]:
+    return create_model(
+        f"{schema.__name__}FieldsPaginated",
+        objects=(list[get_trimmed_schema(schema, fields)], ...),
+        total_count=(int, ...),
+    )
@@ -0,0 +1,134 @@
+import csv
+import json
+from typing import AsyncIterator, Iterator, Optional, Sequence, Type
+
+from pydantic import BaseModel, ValidationError
+
+from constants.bulk import IMPORT_CHUNK_SIZE, ImportFormat
+
+ParsedRow = tuple[int, Optional[dict], Optional[str]]
+"""(line number, parsed row or None, parse error or None)"""
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines without buffering more than one
+    network chunk plus one incomplete line.
+    """
+    tail = b""
+    async for chunk in stream:
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        for line in lines:
+            yield line
+    if tail:
+        yield tail
+
+
+def parse_csv_lines(
+    lines: Sequence[tuple[int, bytes]], header: list[str]
+) -> Iterator[ParsedRow]:
+    """CSV rows are expected one per line, quoted fields can't contain
+    line breaks. Empty values are treated as nulls. Lines that can't be
+    decoded or parsed are rejected one by one.
+    """
+    for number, line in lines:
+        try:
+            values = next(csv.reader([line.decode()], strict=True))
+        except (csv.Error, StopIteration, UnicodeDecodeError) as ex:
+            yield number, None, str(ex) or "Invalid CSV line"
+            continue
+        if len(values) != len(header):
+            yield number, None, f"Expected {len(header)} values"
+            continue
+        nullable = (value or None for value in values)
+        yield number, dict(zip(header, nullable, strict=True)), None
+
+
+def parse_ndjson_lines(
+    lines: Sequence[tuple[int, bytes]],
+) -> Iterator[ParsedRow]:
+    for number, line in lines:
+        try:
+            row = json.loads(line)
+        except ValueError as ex:
+            # JSONDecodeError or UnicodeDecodeError of invalid UTF-8
+            yield number, None, str(ex)
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Expected JSON object"
+            continue
+        yield number, row, None
+
+
+async def iter_validated_chunks(
+    stream: AsyncIterator[bytes],
+    import_format: ImportFormat,
+    schema: Type[BaseModel],
+    columns: Sequence[str],
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> AsyncIterator[tuple[list[tuple], list[dict]]]:
+    """Read rows from stream and validate them against schema in chunks.
+
+    Args:
+        - stream (AsyncIterator[bytes]): request body
+        - import_format (ImportFormat): csv or ndjson
+        - schema (Type[BaseModel]): schema for a single row
+        - columns (Sequence[str]): order of values in records
+        - chunk_size (int): number of lines in one chunk
+
+    Yields:
+        - tuple[list[tuple], list[dict]]: records ready for COPY
+        (the line number goes first) and rejected rows of the chunk
+    """
+    header = None
+    chunk = []
+    line_number = 0
+    async for line in iter_lines(stream):
+        line_number += 1
+        if not line.strip():
+            continue
+        if import_format == ImportFormat.csv and header is None:
+            header = next(csv.reader([line.decode()]))
+            continue
+        chunk.append((line_number, line))
+        if len(chunk) >= chunk_size:
+            yield _validate_chunk(
+                chunk, import_format, header, schema, columns
+            )
+            chunk = []
+    if chunk:
+        yield _validate_chunk(chunk, import_format, header, schema, columns)
+
+
+def _validate_chunk(
+    lines: list[tuple[int, bytes]],
+    import_format: ImportFormat,
+    header: Optional[list[str]],
+    schema: Type[BaseModel],
+    columns: Sequence[str],
+) -> tuple[list[tuple], list[dict]]:
+    if import_format == ImportFormat.csv:
+        rows = parse_csv_lines(lines, header)
+    else:
+        rows = parse_ndjson_lines(lines)
+    records = []
+    rejected = []
+    for number, row, error in rows:
+        if error:
+            rejected.append({"line": number, "detail": error})
+            continue
+        try:
+            obj = schema.model_validate(row)
+        except ValidationError as ex:
+            rejected.append({"line": number, "detail": _format_errors(ex)})
+            continue
+        data = obj.model_dump()
+        records.append((number, *(data[column] for column in columns)))
+    return records, rejected
+
+
+def _format_errors(ex: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(x) for x in error['loc'])}: {error['msg']}"
+        for error in ex.errors()
+    )
@@ -0,0 +1,40 @@
+from typing import AsyncIterator, Optional, Type
+
+import orjson
+from fastapi_filter.contrib.sqlalchemy import Filter
+from pydantic import BaseModel
+
+from configs.config import app_settings
+from crud.base import CRUDBase
+from databases.database import async_session
+from utilities.serialization import build_row, get_row_plan
+
+NEWLINE = orjson.OPT_APPEND_NEWLINE
+
+
+async def stream_ndjson(
+    crud: CRUDBase, schema: Type[BaseModel], filters: Optional[Filter] = None
+) -> AsyncIterator[bytes]:
+    """Encode all objects found by crud as NDJSON, one batch per chunk.
+
+    The session is opened here and not taken from a dependency, because
+    the response body is produced after the endpoint has returned.
+    Objects are expunged after every batch so memory doesn't grow with
+    the table size.
+    """
+    plan = get_row_plan(schema, tuple(schema.model_fields))
+    async with async_session() as db:
+        async for partition in crud.stream_multi(db, filters=filters):
+            if app_settings.SKIP_RESPONSE_VALIDATION:
+                lines = (
+                    orjson.dumps(build_row(obj, plan), option=NEWLINE)
+                    for obj in partition
+                )
+            else:
+                lines = (
+                    schema.model_validate(obj).model_dump_json().encode()
+                    + b"\n"
+                    for obj in partition
+                )
+            yield b"".join(lines)
+            db.expunge_all()
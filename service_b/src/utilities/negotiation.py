@@ -0,0 +1,16 @@
+def parse_quality_values(header: str) -> dict[str, float]:
+    """Parse Accept or Accept-Encoding header into {value: quality}"""
+    weights = {}
+    for item in header.split(","):
+        value, *params = item.strip().split(";")
+        quality = 1.0
+        for param in params:
+            name, _, number = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        if value:
+            weights[value.strip().lower()] = quality
+    return weights
@@ -0,0 +1,123 @@
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, NamedTuple, Optional, Sequence, Type
+from typing import get_args
+
+import msgpack
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel
+
+from configs.config import app_settings
+from constants.media_types import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE
+from utilities.fields import get_trimmed_paginated_schema, get_trimmed_schema
+
+
+class MsgPackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, default=_encode_default)
+
+
+def _encode_default(obj: Any) -> Any:
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    return str(obj)
+
+
+class RowPlan(NamedTuple):
+    names: tuple[str, ...]
+    getter: Callable[[Any], tuple]
+    nested: dict[str, "RowPlan"]
+
+
+@lru_cache
+def get_row_plan(schema: Type[BaseModel], fields: tuple[str, ...]) -> RowPlan:
+    """Attributes to read from ORM objects to build rows of schema"""
+    names = tuple(field for field in schema.model_fields if field in fields)
+    nested = {}
+    for name in names:
+        if nested_schema := _get_nested_schema(
+            schema.model_fields[name].annotation
+        ):
+            nested[name] = get_row_plan(
+                nested_schema, tuple(nested_schema.model_fields)
+            )
+    if len(names) == 1:
+        getter = attrgetter(names[0])
+        return RowPlan(names, lambda obj: (getter(obj),), nested)
+    return RowPlan(names, attrgetter(*names), nested)
+
+
+def _get_nested_schema(annotation: Any) -> Optional[Type[BaseModel]]:
+    for arg in (annotation, *get_args(annotation)):
+        if isinstance(arg, type) and issubclass(arg, BaseModel):
+            return arg
+    return None
+
+
+def build_row(obj: Any, plan: RowPlan) -> dict:
+    """Read ORM object attributes straight into a dict, without
+    validation. Only for objects that already match the schema.
+    """
+    row = dict(zip(plan.names, plan.getter(obj), strict=True))
+    for name, nested_plan in plan.nested.items():
+        if row[name] is not None:
+            row[name] = build_row(row[name], nested_plan)
+    return row
+
+
+def serialize_response(
+    data: Any,
+    schema: Type[BaseModel],
+    fields: Optional[Sequence[str]] = None,
+    paginated: bool = False,
+    validate: Optional[bool] = None,
+    media_type: str = JSON_MEDIA_TYPE,
+) -> Response:
+    """Serialize ORM objects (or {"objects": [...], "total_count": n}
+    if paginated) with schema trimmed to fields.
+
+    Args:
+        - data (Any): ORM object or paginated dict
+        - schema (Type[BaseModel]): response schema
+        - fields (Sequence[str], optional): fields to return.
+        Defaults to None (all schema fields).
+        - paginated (bool): data is a page of objects
+        - validate (bool, optional): validate data against schema.
+        Defaults to not app_settings.SKIP_RESPONSE_VALIDATION
+        - media_type (str): JSON or MessagePack media type
+
+    Returns:
+        - Response: JSON or MessagePack response
+    """
+    fields = tuple(fields or schema.model_fields)
+    if validate is None:
+        validate = not app_settings.SKIP_RESPONSE_VALIDATION
+    headers = {"Vary": "Accept"}
+    if validate:
+        if paginated:
+            trimmed = get_trimmed_paginated_schema(schema, fields)
+        else:
+            trimmed = get_trimmed_schema(schema, fields)
+        obj = trimmed.model_validate(data)
+        if media_type == MSGPACK_MEDIA_TYPE:
+            return MsgPackResponse(
+                obj.model_dump(mode="json"), headers=headers
+            )
+        return Response(
+            content=obj.model_dump_json(),
+            media_type=JSON_MEDIA_TYPE,
+            headers=headers,
+        )
+    plan = get_row_plan(schema, fields)
+    if paginated:
+        content = {
+            "objects": [build_row(obj, plan) for obj in data["objects"]],
+            "total_count": data["total_count"],
+        }
+    else:
+        content = build_row(data, plan)
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return MsgPackResponse(content, headers=headers)
+    return ORJSONResponse(content, headers=headers)
@@ -0,0 +1,41 @@
+import uvicorn
+
+from configs.config import server_settings
+from constants.server import ServerMode
+
+
+def run_server(app: str, port: int) -> None:
+    """Serve app with uvicorn: one process reloading on code changes in
+    development mode, SERVER_WORKERS processes in production mode.
+
+    In production mode a worker that gets SIGTERM stops accepting
+    connections and waits up to SERVER_GRACEFUL_TIMEOUT seconds for
+    in-flight requests before the lifespan shutdown closes its pools.
+
+    Args:
+        - app (str): import string of the application, like "main:app"
+        - port (int): port to listen on
+    """
+    mode = ServerMode(server_settings.SERVER_MODE)
+    if mode != ServerMode.production:
+        uvicorn.run(
+            app,
+            host="0.0.0.0",  # noqa: S104
+            port=port,
+            reload=True,
+            forwarded_allow_ips="*",
+        )
+        return
+    uvicorn.run(
+        app,
+        host="0.0.0.0",  # noqa: S104
+        port=port,
+        workers=server_settings.SERVER_WORKERS,
+        loop=server_settings.SERVER_LOOP,
+        http=server_settings.SERVER_HTTP,
+        backlog=server_settings.SERVER_BACKLOG,
+        timeout_keep_alive=server_settings.SERVER_KEEP_ALIVE,
+        timeout_graceful_shutdown=server_settings.SERVER_GRACEFUL_TIMEOUT,
+        access_log=server_settings.SERVER_ACCESS_LOG,
+        forwarded_allow_ips="*",
+    )
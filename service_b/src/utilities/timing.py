@@ -0,0 +1,68 @@
+import time
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class ServerTiming:
+    """Named spans of one request: total duration and count of each.
+    Spans with one name are summed, spans with different names may
+    overlap (for example upstream calls made inside related).
+    """
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.spans: dict[str, list[float]] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        span = self.spans.setdefault(name, [0.0, 0])
+        span[0] += seconds
+        span[1] += 1
+
+    @property
+    def header(self) -> str:
+        """Server-Timing header value with durations in milliseconds"""
+        metrics = [
+            f'{name};dur={seconds * 1000:.1f};desc="{count}x"'
+            for name, (seconds, count) in self.spans.items()
+        ]
+        total = time.perf_counter() - self.start
+        metrics.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+server_timing: ContextVar[Optional[ServerTiming]] = ContextVar(
+    "server_timing", default=None
+)
+
+
+def get_server_timing() -> Optional[ServerTiming]:
+    return server_timing.get()
+
+
+def add_span(name: str, seconds: float) -> None:
+    if timing := server_timing.get():
+        timing.add(name, seconds)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Add the duration of the block to span name of the current request"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_span(name, time.perf_counter() - start)
+
+
+def parse_server_timing(value: str) -> dict[str, float]:
+    """Durations in milliseconds by metric name of a Server-Timing header"""
+    durations = {}
+    for metric in value.split(","):
+        name, *params = metric.strip().split(";")
+        for param in params:
+            key, _, dur = param.strip().partition("=")
+            if key == "dur":
+                with suppress(ValueError):
+                    durations[name] = float(dur)
+    return durations
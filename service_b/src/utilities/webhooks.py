@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+from typing import Optional, Sequence
+
+import httpx
+import orjson
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from configs.config import webhook_settings
+from constants.media_types import JSON_MEDIA_TYPE
+from constants.webhooks import (
+    WEBHOOK_EVENTS_KEY,
+    WEBHOOK_QUEUE_SIZE,
+    WEBHOOK_SIGNATURE_HEADER,
+    WebhookEvent,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def sign_payload(body: bytes, secret: str) -> str:
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def coalesce_events(events: Sequence[dict]) -> list[dict]:
+    """Merge events of one entity and type into one event with all ids.
+    ids=None (any object of the entity) absorbs the others.
+    """
+    merged: dict[tuple[str, str], Optional[set[int]]] = {}
+    for item in events:
+        key = (item["entity"], item["event"])
+        if key in merged and merged[key] is None:
+            continue
+        if item["ids"] is None:
+            merged[key] = None
+        else:
+            merged.setdefault(key, set()).update(item["ids"])
+    return [
+        {
+            "entity": entity,
+            "event": event_type,
+            "ids": sorted(ids) if ids is not None else None,
+        }
+        for (entity, event_type), ids in merged.items()
+    ]
+
+
+class WebhookDispatcher:
+    """Deliver change events to webhook URLs from a background task.
+
+    publish() only puts events into a bounded queue, so writes never
+    wait for delivery. The task collects events for up to flush_interval
+    seconds (or batch_size events), merges them and POSTs one signed batch
+    to every URL, retrying connection errors and 5xx responses with
+    exponential backoff. Events are dropped with a warning when the
+    queue is full or all retries failed.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        secret: str = "",
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        max_retries: int = 5,
+        retry_backoff: float = 0.5,
+        timeout: float = 5.0,
+    ) -> None:
+        self.urls = list(urls)
+        self.secret = secret
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def publish(self, events: Sequence[dict]) -> None:
+        if not self.urls:
+            return
+        self._ensure_started()
+        for item in events:
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                logger.warning("Webhook queue is full, dropped %s", item)
+
+    async def close(self) -> None:
+        """Deliver queued events (waiting up to timeout) and stop"""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), self.timeout)
+        except TimeoutError:
+            logger.warning(
+                "Webhook events left undelivered: %s", self._queue.qsize()
+            )
+        self._task.cancel()
+        await self._client.aclose()
+        self._task = None
+
+    def _ensure_started(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=WEBHOOK_QUEUE_SIZE)
+        self._client = httpx.AsyncClient(timeout=self.timeout)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except TimeoutError:
+                    break
+            try:
+                await self._deliver(coalesce_events(batch))
+            except Exception:
+                logger.exception("Webhook delivery failed")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _deliver(self, events: list[dict]) -> None:
+        body = orjson.dumps({"events": events})
+        headers = {"Content-Type": JSON_MEDIA_TYPE}
+        if self.secret:
+            headers[WEBHOOK_SIGNATURE_HEADER] = sign_payload(body, self.secret)
+        await asyncio.gather(
+            *(self._post(url, body, headers) for url in self.urls)
+        )
+
+    async def _post(self, url: str, body: bytes, headers: dict) -> None:
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            try:
+                r = await self._client.post(url, content=body, headers=headers)
+            except httpx.HTTPError as ex:
+                logger.warning("Webhook %s: %r", url, ex)
+                continue
+            if r.status_code < httpx.codes.INTERNAL_SERVER_ERROR:
+                if r.is_error:
+                    logger.warning(
+                        "Webhook %s rejected events: %s", url, r.status_code
+                    )
+                return
+            logger.warning("Webhook %s: %s", url, r.status_code)
+        logger.error(
+            "Webhook %s: gave up after %s attempts", url, self.max_retries + 1
+        )
+
+
+webhook_dispatcher = WebhookDispatcher(
+    urls=webhook_settings.WEBHOOK_URLS,
+    secret=webhook_settings.WEBHOOK_SECRET,
+    batch_size=webhook_settings.WEBHOOK_BATCH_SIZE,
+    flush_interval=webhook_settings.WEBHOOK_FLUSH_INTERVAL,
+    max_retries=webhook_settings.WEBHOOK_MAX_RETRIES,
+    retry_backoff=webhook_settings.WEBHOOK_RETRY_BACKOFF,
+    timeout=webhook_settings.WEBHOOK_TIMEOUT,
+)
+
+
+def record_event(
+    db: AsyncSession,
+    entity: str,
+    event_type: WebhookEvent,
+    ids: Optional[Sequence[int]],
+) -> None:
+    """Remember an event until the session commits. ids=None means any
+    object of the entity may have changed.
+    """
+    if ids is not None and not ids:
+        return
+    db.sync_session.info.setdefault(WEBHOOK_EVENTS_KEY, []).append(
+        {
+            "entity": entity,
+            "event": event_type,
+            "ids": list(ids) if ids is not None else None,
+        }
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    if events := session.info.pop(WEBHOOK_EVENTS_KEY, None):
+        webhook_dispatcher.publish(events)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_uncommitted(
+    session: Session, transaction: SessionTransaction
+) -> None:
+    # Runs after after_commit, so only events of rolled back or closed
+    # transactions are left
+    if transaction.parent is None:
+        session.info.pop(WEBHOOK_EVENTS_KEY, None)